@@ -1,5 +1,12 @@
 """Pixel-Perfect Migration Agent Package."""
 
-from app.team import get_migration_team
-
 __all__ = ["get_migration_team"]
+
+
+def __getattr__(name):
+    # Imported lazily so lightweight entry points (e.g. the daemon client)
+    # don't pay for loading agno.
+    if name == "get_migration_team":
+        from app.team import get_migration_team
+        return get_migration_team
+    raise AttributeError(f"module 'app' has no attribute {name!r}")
@@ -1,17 +1,23 @@
 """Analyzer agent for inspecting Next.js project structure."""
 
+from typing import Optional
+
 from agno.agent import Agent
 from agno.tools.local_file_system import LocalFileSystemTools
 
 from app.config import get_model
+from app.file_reader import FileReadTools
+from app.search import CodeSearchTools
+from app.tool_cache import ToolCallCache
 from app.tools import run_shell_command
 
 
-def create_analyzer_agent(base_dir: str = ".") -> Agent:
+def create_analyzer_agent(base_dir: str = ".", tool_cache: Optional[ToolCallCache] = None) -> Agent:
     """Create an Analyzer agent for Next.js project analysis.
     
     Args:
         base_dir: Base directory for file system operations.
+        tool_cache: Optional session cache for memoizing read-only tool calls.
         
     Returns:
         Configured Analyzer agent.
@@ -23,13 +29,14 @@ def create_analyzer_agent(base_dir: str = ".") -> Agent:
         # Fallback for different library versions
         file_tools = LocalFileSystemTools()
 
-    model = get_model()
+    model = get_model(cache_key="analyzer")
 
     return Agent(
         name="Analyzer",
         role="Analyze Next.js project structure and dependencies",
         model=model,
-        tools=[file_tools, run_shell_command],
+        tools=[file_tools, FileReadTools(base_dir=base_dir), CodeSearchTools(base_dir=base_dir), run_shell_command],
+        tool_hooks=[tool_cache.for_directory(base_dir)] if tool_cache else None,
         instructions="""Analyze the source directory and provide a detailed structure.
 
 IMPORTANT: Pay special attention to styling and UI assets.
@@ -38,6 +45,10 @@ IMPORTANT: Pay special attention to styling and UI assets.
 3. List all UI component libraries used (Shadcn, Radix, Material UI).
 4. Identify public assets (images, fonts) and where they are used.
 
+Use `search_code` and `find_symbol` to locate components, hooks and config instead of
+listing and grepping directories file by file. Read files with `read_file`; for large ones
+(generated types, JSON data, bundles) use `file_outline` and read only the windows you need.
+
 Report this clearly so the Developer agent can recreate the pixel-perfect UI.
 """,
     )
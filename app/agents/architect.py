@@ -12,7 +12,7 @@ def create_architect_agent() -> Agent:
     Returns:
         Configured Architect agent with MigrationPlan output schema.
     """
-    model = get_model()
+    model = get_model(cache_key="architect")
 
     return Agent(
         name="Architect",
@@ -25,5 +25,7 @@ CRITICAL: You will receive a file list from the Analyzer. YOU MUST ONLY MIGRATE
 - Do NOT assume 'src/pages' exists if the analysis says 'src/app'.
 - Do NOT include 'src/pages/Home.jsx' or other generic examples unless they are explicitly in the analysis.
 - If the project uses Next.js App Router (src/app), your plan MUST target those specific files.
+- If the message includes a file mapping, keep its source paths, target paths and actions
+  unchanged and in order; your job is the description of each conversion.
 """,
     )
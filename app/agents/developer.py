@@ -1,5 +1,7 @@
 """Developer agent for executing the migration with Nuxt MCP support."""
 
+from typing import Optional
+
 from agno.agent import Agent
 from agno.tools.local_file_system import LocalFileSystemTools
 from agno.tools.mcp import MCPTools
@@ -7,13 +9,24 @@ from agno.tools.models.morph import MorphTools
 from agno.tools.shell import ShellTools
 
 from app.config import get_model, key_manager
+from app.edits import FileEditTools
+from app.file_reader import FileReadTools
+from app.search import CodeSearchTools
+from app.tool_cache import ToolCallCache
+
+EDIT_TOOLS_INSTRUCTIONS = """
+To change an existing file, use `replace_in_file` (search/replace one block) or `apply_patch`
+(unified diff) and send only the changed lines with a little context. Use `write_file` only to
+create new files or when most of a file changes.
+"""
 
 
-def create_developer_agent(base_dir: str = ".") -> Agent:
+def create_developer_agent(base_dir: str = ".", tool_cache: Optional[ToolCallCache] = None) -> Agent:
     """Create a Developer agent for executing migrations (sync version).
     
     Args:
         base_dir: Base directory for file system operations.
+        tool_cache: Optional session cache for memoizing read-only tool calls.
         
     Returns:
         Configured Developer agent.
@@ -25,15 +38,17 @@ def create_developer_agent(base_dir: str = ".") -> Agent:
         file_tools = LocalFileSystemTools()
     
     # Initialize tools with File system and Shell tools for scaffolding
-    tools = [file_tools, ShellTools()]
+    tools = [file_tools, FileReadTools(base_dir=base_dir), CodeSearchTools(base_dir=base_dir), ShellTools()]
 
-    # Add Morph Tools if API key is available
+    # Add Morph Tools if API key is available, local structured edits otherwise
     morph_key = key_manager.get_key("morph")
     if morph_key:
         morph_tools = MorphTools(api_key=morph_key)
         tools.append(morph_tools)
+    else:
+        tools.append(FileEditTools(base_dir=base_dir))
 
-    model = get_model()
+    model = get_model(cache_key="developer")
 
     instructions = """Implement the migration plan by converting files to Nuxt.js (Nuxt 4 target).
 
@@ -41,6 +56,8 @@ STEP 0: REALITY CHECK
 - The Architect might have hallucinated files.
 - Before converting ANY file, check if the source file actually exists in the file system.
 - If the plan says to convert 'src/pages/Home.jsx' but it doesn't exist, SKIP IT and log a warning.
+- Use `search_code` / `find_symbol` (with the source path) to find related components and usages.
+- Read files with `read_file`; large ones open with a summary, so page with `start_line` or use `file_outline`.
 
 STEP 1: SCAFFOLDING (If starting fresh)
 1. Check if the output directory exists and is empty.
@@ -60,31 +77,47 @@ STEP 3: VALIDATION (Self-Healing)
 """
     if morph_key:
         instructions += "\nUse MorphTools for fast, intelligent code editing and generation when appropriate."
+    else:
+        instructions += EDIT_TOOLS_INSTRUCTIONS
 
     return Agent(
         name="Developer",
         role="Execute the migration by writing Nuxt.js files",
         model=model,
         tools=tools,
+        tool_hooks=[tool_cache.for_directory(base_dir)] if tool_cache else None,
         instructions=instructions,
     )
 
 
-async def create_developer_agent_with_mcp(base_dir: str = ".") -> tuple[Agent, MCPTools]:
+def create_nuxt_mcp() -> MCPTools:
+    """Create an (unconnected) MCPTools client for the Nuxt MCP server."""
+    return MCPTools(
+        url="https://nuxt.com/mcp",
+        transport="streamable-http"
+    )
+
+
+async def create_developer_agent_with_mcp(
+    base_dir: str = ".",
+    tool_cache: Optional[ToolCallCache] = None,
+    nuxt_mcp: Optional[MCPTools] = None,
+) -> tuple[Agent, MCPTools]:
     """Create a Developer agent with Nuxt MCP for accurate code generation.
     
     Args:
         base_dir: Base directory for file system operations.
+        tool_cache: Optional session cache for memoizing read-only tool calls.
+        nuxt_mcp: Optional already-connected Nuxt MCP client to reuse.
         
     Returns:
-        Tuple of (Agent, MCPTools) - MCPTools must be closed when done.
+        Tuple of (Agent, MCPTools) - MCPTools must be closed when done
+        (unless it was passed in, in which case the caller owns it).
     """
     # Connect to Nuxt MCP server for up-to-date Nuxt.js knowledge
-    nuxt_mcp = MCPTools(
-        url="https://nuxt.com/mcp",
-        transport="streamable-http"
-    )
-    await nuxt_mcp.connect()
+    if nuxt_mcp is None:
+        nuxt_mcp = create_nuxt_mcp()
+        await nuxt_mcp.connect()
 
     # Set up file tools
     try:
@@ -93,7 +126,7 @@ async def create_developer_agent_with_mcp(base_dir: str = ".") -> tuple[Agent, M
         file_tools = LocalFileSystemTools()
 
     # Initialize tools with ShellTools for scaffolding
-    tools = [file_tools, nuxt_mcp, ShellTools()]
+    tools = [file_tools, FileReadTools(base_dir=base_dir), CodeSearchTools(base_dir=base_dir), nuxt_mcp, ShellTools()]
     
     instructions = """Implement the migration plan by converting files to Nuxt.js (Nuxt 4 target).
     
@@ -101,6 +134,8 @@ STEP 0: REALITY CHECK
 - The Architect might have hallucinated files.
 - Before converting ANY file, check if the source file actually exists in the file system.
 - If the plan says to convert 'src/pages/Home.jsx' but it doesn't exist, SKIP IT and log a warning.
+- Use `search_code` / `find_symbol` (with the source path) to find related components and usages.
+- Read files with `read_file`; large ones open with a summary, so page with `start_line` or use `file_outline`.
 
 STEP 1: SCAFFOLDING
 - If the output directory is empty or missing, SCALFFOLD IT FIRST.
@@ -131,20 +166,25 @@ Always generate idiomatic Nuxt.js 4 code with:
 - Correct file conventions (pages/, components/, composables/)
 """
 
-    # Add Morph Tools if API key is available
+    # Add Morph Tools if API key is available, local structured edits otherwise
     morph_key = key_manager.get_key("morph")
     if morph_key:
         morph_tools = MorphTools(api_key=morph_key)
         tools.append(morph_tools)
         instructions += "\nUse MorphTools ('edit_file') for fast, intelligent code generation and refactoring."
+    else:
+        tools.append(FileEditTools(base_dir=base_dir))
+        instructions += EDIT_TOOLS_INSTRUCTIONS
 
-    model = get_model()
+    model = get_model(cache_key="developer-mcp")
 
     agent = Agent(
         name="Developer",
         role="Execute the migration by writing Nuxt.js files",
         model=model,
         tools=tools,
+        # MCP tools are async, so the cache must hook in through the async chain
+        tool_hooks=[tool_cache.for_directory(base_dir, asynchronous=True)] if tool_cache else None,
         instructions=instructions,
     )
 
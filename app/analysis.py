@@ -0,0 +1,206 @@
+"""Sharded, concurrent project analysis.
+
+One Analyzer conversation for a whole repository reads files one tool call
+at a time, so analysis time grows with the size of the repo. `shard_project`
+splits the source files by area (routes, components, styles, lib, config),
+`analyze_project` runs one Analyzer per shard concurrently, and
+`merge_reports` combines the partial reports in a fixed area order, so the
+Architect receives the same structure regardless of which shard finished
+first.
+
+Areas are assigned by the first directory that names one (so monorepo
+packages like `apps/web/pages/` and `packages/ui/` land in routes and
+components); areas with more than `MAX_SHARD_FILES` files are split further.
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from agno.run.base import RunStatus
+
+from app.profiling import span
+from app.prompts import get_analysis_prompt, get_area_analysis_prompt
+from app.source_tree import CONFIG_NAMES, IGNORED_DIRS, SCRIPT_SUFFIXES, STYLE_SUFFIXES
+
+MAX_SHARD_FILES = 250
+
+
+class AnalysisError(Exception):
+    """Raised when no Analyzer run produced a usable report."""
+
+
+AREAS = {
+    "routes": "pages, layouts, App/Pages Router structure, dynamic segments, data fetching "
+    "(getServerSideProps, server components, fetch), API routes and middleware",
+    "components": "component hierarchy, props, state, client/server components and UI libraries (Shadcn, Radix, MUI)",
+    "styles": "styling framework (Tailwind, CSS Modules, styled-components), global CSS, design tokens and fonts",
+    "lib": "hooks, context providers, stores, utilities, API clients and shared types",
+    "config": "Next.js version, dependencies, next.config, Tailwind/PostCSS config, TypeScript and env usage",
+}
+
+_AREA_DIRS = {
+    "routes": {"pages", "app", "api", "routes"},
+    "components": {"components", "ui"},
+    "styles": {"styles", "style", "css", "theme"},
+    "lib": {"hooks", "lib", "utils", "helpers", "context", "contexts", "store", "stores", "services", "types"},
+}
+_HEADING_RE = re.compile(r"^(#{1,6})(?=\s)")
+
+
+@dataclass
+class Shard:
+    """A set of source files analyzed by one Analyzer."""
+
+    area: str
+    files: list[str]
+    part: int = 1
+    parts: int = 1
+
+    @property
+    def title(self) -> str:
+        title = self.area.capitalize()
+        return f"{title} ({self.part}/{self.parts})" if self.parts > 1 else title
+
+
+def classify(rel: str) -> Optional[str]:
+    """Area of a project-relative file path, or None if no Analyzer needs it."""
+    parts = rel.split("/")
+    name, suffix = parts[-1], Path(rel).suffix
+    if CONFIG_NAMES.search(name) or (len(parts) == 1 and suffix not in SCRIPT_SUFFIXES | STYLE_SUFFIXES):
+        return "config"
+    if suffix in STYLE_SUFFIXES:
+        return "styles"
+    if suffix not in SCRIPT_SUFFIXES:
+        return None
+    for directory in parts[:-1]:
+        for area, names in _AREA_DIRS.items():
+            if directory in names:
+                return area
+    if name.split(".")[0] == "middleware":
+        return "routes"
+    return "lib"
+
+
+def shard_project(root: str, max_files: int = MAX_SHARD_FILES) -> list[Shard]:
+    """Split a project's source files into analysis shards.
+
+    Args:
+        root: Path to the Next.js project.
+        max_files: Largest number of files per shard.
+
+    Returns:
+        Non-empty shards in `AREAS` order; empty if `root` does not exist.
+    """
+    areas: dict[str, list[str]] = {area: [] for area in AREAS}
+    root_path = Path(root)
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            rel = (Path(dirpath) / name).relative_to(root_path).as_posix()
+            area = classify(rel)
+            if area is not None:
+                areas[area].append(rel)
+
+    shards = []
+    for area, files in areas.items():
+        chunks = [files[i:i + max_files] for i in range(0, len(files), max_files)]
+        shards += [Shard(area, chunk, n, len(chunks)) for n, chunk in enumerate(chunks, 1)]
+    return shards
+
+
+def _demote(report: str, levels: int = 2) -> str:
+    """Push markdown headings down so they nest under the area heading."""
+    lines, fenced = [], False
+    for line in report.strip().splitlines():
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        elif not fenced:
+            line = _HEADING_RE.sub(lambda m: "#" * min(6, len(m.group(1)) + levels), line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def merge_reports(results: list[tuple[Shard, str]], failed: Optional[list[Shard]] = None) -> str:
+    """Combine partial reports into one analysis, ordered by area then part.
+
+    Args:
+        results: Each analyzed shard with its report.
+        failed: Shards whose Analyzer run failed; listed, not reported on.
+    """
+    order = list(AREAS)
+    results = sorted(results, key=lambda item: (order.index(item[0].area), item[0].part))
+    inventory = ", ".join(f"{shard.title.lower()}: {len(shard.files)} files" for shard, _ in results)
+    sections = [
+        "# Next.js Project Analysis",
+        f"Analyzed in {len(results)} shards ({inventory}).",
+    ]
+    if failed:
+        titles = ", ".join(shard.title for shard in failed)
+        sections.append(f"Not analyzed (the Analyzer run failed): {titles}. Inspect these files directly.")
+    for shard, report in results:
+        sections.append(f"## {shard.title}\n\n{_demote(report) or '_No findings._'}")
+    return "\n\n".join(sections) + "\n"
+
+
+async def analyze_project(
+    source_path: str,
+    create_analyzer: Callable[[], object],
+    concurrency: int = len(AREAS),
+    log: Callable[[str], None] = print,
+) -> tuple[str, list]:
+    """Analyze a project with one concurrent Analyzer per shard.
+
+    Args:
+        source_path: Path to the Next.js project.
+        create_analyzer: Returns a fresh Analyzer agent (one per shard).
+        concurrency: Maximum number of Analyzers running at once.
+        log: Progress callback.
+
+    Returns:
+        The merged report and the run responses (for usage). Failed shards are
+        logged with ✗ and left out of the report. Projects with no recognized
+        files get a single whole-repo analysis.
+
+    Raises:
+        AnalysisError: If no Analyzer run succeeded.
+    """
+    shards = await asyncio.to_thread(shard_project, source_path)
+    if not shards:
+        response = await create_analyzer().arun(get_analysis_prompt(source_path))
+        if _failed(response):
+            raise AnalysisError(f"Analysis failed: {getattr(response, 'content', None) or 'no response'}")
+        return str(response.content), [response]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(shard: Shard):
+        async with semaphore:
+            prompt = get_area_analysis_prompt(source_path, shard.title, AREAS[shard.area], shard.files)
+            with span(f"analyze {shard.title}", "analysis"):
+                try:
+                    response = await create_analyzer().arun(prompt)
+                except Exception as e:
+                    log(f"  ✗ {shard.title}: {e}")
+                    return None
+        if _failed(response):
+            log(f"  ✗ {shard.title}: {getattr(response, 'content', None) or 'no response'}")
+        else:
+            log(f"  ✓ {shard.title}: {len(shard.files)} files")
+        return response
+
+    responses = await asyncio.gather(*(run(shard) for shard in shards))
+    results = [(shard, str(r.content or "")) for shard, r in zip(shards, responses) if not _failed(r)]
+    failed = [shard for shard, r in zip(shards, responses) if _failed(r)]
+    if not results:
+        raise AnalysisError(f"Analysis failed for all {len(shards)} shards")
+    report = merge_reports(results, failed)
+    return report, [r for r in responses if r is not None]
+
+
+def _failed(response) -> bool:
+    """Whether an Analyzer run raised or ended in an error."""
+    return response is None or getattr(response, "status", None) == RunStatus.error
@@ -0,0 +1,413 @@
+"""Record/replay cassettes for model and MCP traffic.
+
+A `Cassette` intercepts traffic at two boundaries:
+
+- **model clients**: every provider SDK (OpenAI, Anthropic, Mistral, litellm
+  used by Scenario, ...) sends requests through `httpx.Client.send` /
+  `httpx.AsyncClient.send`, which are patched while the cassette is active
+- **MCP clients**: `MCPTools` sessions are wrapped so `initialize`,
+  `list_tools` and `call_tool` results are recorded; in replay mode no MCP
+  transport is opened at all
+- **agent tools**: results of synchronous tool calls (shell commands, file
+  reads, code search) are recorded; in replay mode they are served without
+  running, so no `npx`/`npm` process starts and later request bodies do not
+  depend on the machine. File writes always run, so replays still produce
+  the migrated files
+
+Interactions are keyed by a hash of the normalized request (method, URL
+without credentials, canonical JSON body with UUIDs and local paths
+masked) and stored as JSON, so cassettes can be committed. Modes:
+
+- `record`: always hit the network and (re)write the cassette
+- `replay`: strict; any request without a recorded response fails
+- `auto`: replay hits, record misses
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+MODES = (RECORD, REPLAY, AUTO)
+
+CASSETTE_VERSION = 1
+
+# Request body keys that vary between otherwise identical runs
+VOLATILE_KEYS = {"user", "metadata"}
+# Query parameters that carry credentials (e.g. Gemini's ?key=)
+SECRET_PARAMS = {"key", "api_key", "apikey"}
+# Response headers worth keeping; the body is stored already decoded
+KEPT_HEADERS = {"content-type"}
+
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
+
+class CassetteMiss(Exception):
+    """Raised in strict replay mode when a request has no recorded response."""
+
+
+def _mask(text: str) -> str:
+    """Mask values that differ between machines and runs."""
+    text = text.replace(os.getcwd(), "<cwd>").replace(str(Path.home()), "<home>")
+    return _UUID_RE.sub("<uuid>", text)
+
+
+def _strip_volatile(value):
+    """Drop volatile keys from a decoded JSON body, recursively."""
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def _normalize_body(body: bytes) -> str:
+    """Canonical text form of a request body."""
+    if not body:
+        return ""
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return hashlib.sha256(body).hexdigest()
+    return _mask(json.dumps(_strip_volatile(data), sort_keys=True, separators=(",", ":")))
+
+
+def request_key(method: str, url: str, body: bytes) -> str:
+    """Hash of a normalized HTTP request."""
+    parsed = httpx.URL(url)
+    params = sorted((k, v) for k, v in parsed.params.multi_items() if k.lower() not in SECRET_PARAMS)
+    canonical = json.dumps([method.upper(), f"{parsed.host}{parsed.path}", params, _normalize_body(body)])
+    return hashlib.sha256(canonical.encode()).hexdigest()[:24]
+
+
+def mcp_key(server: str, method: str, params: dict) -> str:
+    """Hash of a normalized MCP client call."""
+    canonical = json.dumps(["mcp", server, method, _mask(json.dumps(params, sort_keys=True, default=str))])
+    return hashlib.sha256(canonical.encode()).hexdigest()[:24]
+
+
+def tool_key(name: str, arguments: dict) -> str:
+    """Hash of a normalized agent tool call."""
+    canonical = json.dumps(["tool", name, _mask(json.dumps(arguments, sort_keys=True, default=str))])
+    return hashlib.sha256(canonical.encode()).hexdigest()[:24]
+
+
+def _is_mcp_transport(request: httpx.Request) -> bool:
+    """True for MCP streamable-HTTP/SSE transport traffic, which is recorded at the session level."""
+    headers = request.headers
+    if "mcp-session-id" in headers or "mcp-protocol-version" in headers:
+        return True
+    if "text/event-stream" not in headers.get("accept", ""):
+        return False
+    try:
+        return request.method == "GET" or b'"jsonrpc"' in request.content
+    except httpx.RequestNotRead:
+        return False
+
+
+class Cassette:
+    """A file of recorded interactions plus the patches that serve them."""
+
+    def __init__(self, path, mode: str = REPLAY):
+        """
+        Initialize a cassette.
+
+        Args:
+            path: JSON file holding the interactions.
+            mode: One of `record`, `replay` (strict) or `auto`.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {', '.join(MODES)})")
+        self.path = Path(path)
+        self.mode = mode
+        self.interactions: dict[str, list] = {}
+        self.misses: list[str] = []
+        self._cursor: dict[str, int] = {}
+        self._patches: list = []
+        self._dirty = False
+        if mode != RECORD and self.path.exists():
+            self.interactions = json.loads(self.path.read_text()).get("interactions", {})
+
+    # --- Storage ---
+
+    def _next(self, key: str) -> Optional[dict]:
+        """Return the next recorded response for `key` (repeating the last one)."""
+        recorded = self.interactions.get(key)
+        if not recorded:
+            return None
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        return recorded[min(index, len(recorded) - 1)]
+
+    def _lookup(self, key: str, description: str) -> Optional[dict]:
+        """Find a recorded entry, or record a miss (raising in strict replay)."""
+        if self.mode == RECORD:
+            return None
+        entry = self._next(key)
+        if entry is None and self.mode == REPLAY:
+            self.misses.append(description)
+            raise CassetteMiss(f"No recorded response in {self.path} for {description} (key {key})")
+        return entry
+
+    def _store(self, key: str, entry: dict):
+        self.interactions.setdefault(key, []).append(entry)
+        self._dirty = True
+
+    def save(self):
+        """Write the cassette if anything was recorded."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        self.path.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n")
+        self._dirty = False
+
+    # --- HTTP (model clients) ---
+
+    def _describe(self, request: httpx.Request) -> str:
+        return f"{request.method} {request.url.host}{request.url.path}"
+
+    @staticmethod
+    def _encode_response(response: httpx.Response) -> dict:
+        content = response.content
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode()}
+        headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS}
+        return {"status": response.status_code, "headers": headers, **body}
+
+    @staticmethod
+    def _decode_response(entry: dict, request: httpx.Request) -> httpx.Response:
+        content = base64.b64decode(entry["base64"]) if "base64" in entry else entry["text"].encode("utf-8")
+        return httpx.Response(entry["status"], headers=entry["headers"], content=content, request=request)
+
+    def _record(self, key: str, request: httpx.Request, response: httpx.Response):
+        """Store a live response (the URL is kept without its query, which may hold credentials)."""
+        self._store(
+            key,
+            {
+                "request": {"method": request.method, "url": _mask(str(request.url.copy_with(query=None)))},
+                "response": self._encode_response(response),
+            },
+        )
+
+    def _patch_httpx(self):
+        cassette = self
+        original_send = httpx.Client.send
+        original_asend = httpx.AsyncClient.send
+
+        def send(client, request, **kwargs):
+            if _is_mcp_transport(request):
+                return original_send(client, request, **kwargs)
+            key = request_key(request.method, str(request.url), request.read())
+            entry = cassette._lookup(key, cassette._describe(request))
+            if entry is not None:
+                return cassette._decode_response(entry["response"], request)
+            response = original_send(client, request, **kwargs)
+            response.read()
+            cassette._record(key, request, response)
+            return response
+
+        async def asend(client, request, **kwargs):
+            if _is_mcp_transport(request):
+                return await original_asend(client, request, **kwargs)
+            key = request_key(request.method, str(request.url), await request.aread())
+            entry = cassette._lookup(key, cassette._describe(request))
+            if entry is not None:
+                return cassette._decode_response(entry["response"], request)
+            response = await original_asend(client, request, **kwargs)
+            await response.aread()
+            cassette._record(key, request, response)
+            return response
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+        self._patches += [(httpx.Client, "send", original_send), (httpx.AsyncClient, "send", original_asend)]
+
+    # --- MCP ---
+
+    def _patch_mcp(self):
+        from agno.tools.mcp import MCPTools
+
+        cassette = self
+        original_connect = MCPTools._connect
+        original_initialize = MCPTools.initialize
+
+        async def _connect(tools):
+            # Strict replay never opens the transport
+            if cassette.mode == REPLAY and tools.session is None and not tools._initialized:
+                tools.session = CassetteSession(cassette, tools.url or str(tools.server_params), None)
+            return await original_connect(tools)
+
+        async def initialize(tools):
+            if tools.session is not None and not isinstance(tools.session, CassetteSession):
+                tools.session = CassetteSession(cassette, tools.url or str(tools.server_params), tools.session)
+            return await original_initialize(tools)
+
+        MCPTools._connect = _connect
+        MCPTools.initialize = initialize
+        self._patches += [(MCPTools, "_connect", original_connect), (MCPTools, "initialize", original_initialize)]
+
+    async def mcp_call(self, server: str, method: str, params: dict, result_type, live_call):
+        """Serve an MCP session call from the cassette or the live session."""
+        key = mcp_key(server, method, params)
+        entry = self._lookup(key, f"MCP {method} {params.get('name', '')}".strip())
+        if entry is not None:
+            return result_type.model_validate(entry["result"])
+        if live_call is None:
+            raise CassetteMiss(f"No live MCP session to record {method}")
+        result = await live_call()
+        self._store(key, {"request": {"mcp": method, **params}, "result": result.model_dump(mode="json")})
+        return result
+
+    # --- Agent tools ---
+
+    def tool_call(self, name: str, arguments: dict, live_call):
+        """Serve a tool result from the cassette or by running the tool."""
+        key = tool_key(name, arguments)
+        entry = self._lookup(key, f"tool {name}")
+        if entry is not None:
+            return entry["result"]
+        result = live_call()
+        if isinstance(result, str):
+            masked_arguments = json.loads(_mask(json.dumps(arguments, sort_keys=True, default=str)))
+            self._store(key, {"request": {"tool": name, "arguments": masked_arguments}, "result": _mask(result)})
+        return result
+
+    def _replayable(self, function_call):
+        """Route a sync, non-writing tool call through `tool_call` (on a copy of its Function)."""
+        from app.tool_cache import WRITE_TOOLS
+
+        function = function_call.function
+        entrypoint = function.entrypoint
+        if (
+            entrypoint is None
+            or function.name in WRITE_TOOLS
+            or iscoroutinefunction(entrypoint)
+            or isgeneratorfunction(entrypoint)
+            or isasyncgenfunction(entrypoint)
+        ):
+            return  # Writes must take effect; async (MCP) tools are recorded at the session
+        arguments = dict(function_call.arguments or {})
+
+        @functools.wraps(entrypoint)
+        def replayable(**kwargs):
+            return self.tool_call(function.name, arguments, lambda: entrypoint(**kwargs))
+
+        # Functions are shared by concurrent calls, so never patch them in place
+        copy = function.model_copy()
+        copy.entrypoint = replayable
+        function_call.function = copy
+
+    def _patch_tools(self):
+        from agno.tools.function import FunctionCall
+
+        cassette = self
+        original_execute = FunctionCall.execute
+        original_aexecute = FunctionCall.aexecute
+
+        def execute(function_call):
+            cassette._replayable(function_call)
+            return original_execute(function_call)
+
+        async def aexecute(function_call):
+            cassette._replayable(function_call)
+            return await original_aexecute(function_call)
+
+        FunctionCall.execute = execute
+        FunctionCall.aexecute = aexecute
+        self._patches += [(FunctionCall, "execute", original_execute), (FunctionCall, "aexecute", original_aexecute)]
+
+    # --- Activation ---
+
+    def install(self):
+        """Patch the model, MCP client and agent tool boundaries."""
+        self._patch_httpx()
+        self._patch_mcp()
+        self._patch_tools()
+
+    def uninstall(self):
+        """Restore the original client methods."""
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches.clear()
+
+
+class CassetteSession:
+    """Stands in for an MCP `ClientSession`, recording or replaying its results."""
+
+    def __init__(self, cassette: Cassette, server: str, session):
+        """
+        Initialize the session wrapper.
+
+        Args:
+            cassette: The active cassette.
+            server: MCP server URL (part of the request key).
+            session: The live ClientSession, or None when replaying.
+        """
+        self.cassette = cassette
+        self.server = server
+        self.session = session
+
+    def _live(self, method: str, *args):
+        if self.session is None:
+            return None
+        return lambda: getattr(self.session, method)(*args)
+
+    async def initialize(self):
+        from mcp.types import InitializeResult
+
+        return await self.cassette.mcp_call(self.server, "initialize", {}, InitializeResult, self._live("initialize"))
+
+    async def list_tools(self, *args):
+        from mcp.types import ListToolsResult
+
+        return await self.cassette.mcp_call(self.server, "list_tools", {}, ListToolsResult, self._live("list_tools"))
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None, *args):
+        from mcp.types import CallToolResult
+
+        params = {"name": name, "arguments": arguments or {}}
+        live = self._live("call_tool", name, arguments, *args)
+        return await self.cassette.mcp_call(self.server, "call_tool", params, CallToolResult, live)
+
+    async def send_ping(self):
+        if self.session is not None:
+            return await self.session.send_ping()
+
+    def __getattr__(self, name):
+        if self.session is None:
+            raise AttributeError(f"{name} is not available on a replayed MCP session")
+        return getattr(self.session, name)
+
+
+@contextmanager
+def use_cassette(path, mode: str = REPLAY):
+    """Activate a cassette for the enclosed block and save new recordings on exit.
+
+    Args:
+        path: Cassette JSON file.
+        mode: `record`, `replay` (strict) or `auto`.
+
+    Yields:
+        The active Cassette.
+    """
+    cassette = Cassette(path, mode)
+    cassette.install()
+    try:
+        yield cassette
+    finally:
+        cassette.uninstall()
+        cassette.save()
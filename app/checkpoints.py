@@ -0,0 +1,242 @@
+"""Per-session stage checkpoints for resumable migrations.
+
+Each session gets a directory under `~/.pixel-perfect/sessions/<session_id>/`:
+
+    manifest.json      stage, paths and the current artifact versions
+    analysis.v1.md     Analyzer report (a new version is written on re-analysis)
+    plan.v1.json       validated MigrationPlan
+    progress.json      per-file completion status, keyed by target path
+
+Resuming a session reloads the newest analysis and plan and restarts at the
+first file that is not marked done.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.cli_config import CONFIG_DIR
+from app.schemas import FileMigration, MigrationPlan
+
+SESSIONS_DIR = CONFIG_DIR / "sessions"
+ARTIFACT_VERSION = 1
+
+# Pipeline stages in execution order
+STAGES = ["analysis", "plan", "develop", "validate", "complete"]
+
+FILE_PENDING = "pending"
+FILE_DONE = "done"
+FILE_FAILED = "failed"
+
+
+def _write_json(path: Path, data: dict):
+    """Atomically write a JSON document."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class SessionCheckpoint:
+    """Versioned stage artifacts and per-file progress for one session."""
+
+    def __init__(self, session_id: str, root: Optional[Path] = None):
+        """
+        Initialize (or reopen) a session checkpoint.
+
+        Args:
+            session_id: The migration session ID.
+            root: Base directory for session artifacts (default: ~/.pixel-perfect/sessions).
+        """
+        self.session_id = session_id
+        self.dir = Path(root or SESSIONS_DIR) / session_id
+        self.manifest = self._read("manifest.json") or {
+            "artifact_version": ARTIFACT_VERSION,
+            "session_id": session_id,
+            "stage": STAGES[0],
+            "analysis_version": 0,
+            "plan_version": 0,
+        }
+        self.progress = (self._read("progress.json") or {}).get("files", {})
+
+    @classmethod
+    def exists(cls, session_id: str, root: Optional[Path] = None) -> bool:
+        """Return True if checkpoints were recorded for the session."""
+        return (Path(root or SESSIONS_DIR) / session_id / "manifest.json").exists()
+
+    def _read(self, name: str) -> Optional[dict]:
+        """Read a JSON artifact from the session directory."""
+        path = self.dir / name
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, **updates):
+        """Persist manifest updates."""
+        self.manifest.update(updates, updated_at=time.time())
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _write_json(self.dir / "manifest.json", self.manifest)
+
+    def _save_progress(self):
+        """Persist per-file progress."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _write_json(self.dir / "progress.json", {"artifact_version": ARTIFACT_VERSION, "files": self.progress})
+
+    @property
+    def stage(self) -> str:
+        """The first stage that has not completed yet."""
+        return self.manifest["stage"]
+
+    def set_stage(self, stage: str):
+        """Record that the pipeline has reached `stage`."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        self._save_manifest(stage=stage)
+
+    def set_paths(self, source_path: str, output_dir: str):
+        """Record the source and output locations for this session."""
+        self._save_manifest(source_path=source_path, output_dir=output_dir)
+
+    # --- Analysis ---
+
+    @property
+    def analysis(self) -> Optional[str]:
+        """The newest analysis report, if any."""
+        version = self.manifest["analysis_version"]
+        if not version:
+            return None
+        return (self.dir / f"analysis.v{version}.md").read_text()
+
+    def save_analysis(self, report: str) -> int:
+        """Store a new analysis version and advance to planning.
+
+        Returns:
+            The new analysis version number.
+        """
+        version = self.manifest["analysis_version"] + 1
+        self.dir.mkdir(parents=True, exist_ok=True)
+        (self.dir / f"analysis.v{version}.md").write_text(report)
+        self._save_manifest(analysis_version=version, stage="plan")
+        return version
+
+    # --- Plan ---
+
+    @property
+    def plan(self) -> Optional[MigrationPlan]:
+        """The newest validated migration plan, if any."""
+        version = self.manifest["plan_version"]
+        if not version:
+            return None
+        data = self._read(f"plan.v{version}.json")
+        return MigrationPlan.model_validate(data["plan"])
+
+    def save_plan(self, plan: MigrationPlan) -> int:
+        """Store a new plan version, reset file progress and advance to development.
+
+        Returns:
+            The new plan version number.
+        """
+        version = self.manifest["plan_version"] + 1
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _write_json(
+            self.dir / f"plan.v{version}.json",
+            {
+                "artifact_version": ARTIFACT_VERSION,
+                "analysis_version": self.manifest["analysis_version"],
+                "created_at": time.time(),
+                "plan": plan.model_dump(),
+            },
+        )
+        # Files finished while the plan was still streaming (or under an
+        # earlier plan with the same mapping) stay done.
+        previous = self.progress
+        self.progress = {}
+        for f in plan.files_to_migrate:
+            entry = previous.get(f.target_path)
+            if entry and entry["status"] == FILE_DONE and entry["source_path"] == f.source_path:
+                self.progress[f.target_path] = entry
+            else:
+                self.progress[f.target_path] = {"source_path": f.source_path, "status": FILE_PENDING}
+        self._save_progress()
+        self._save_manifest(plan_version=version, stage="develop", config_applied=False)
+        return version
+
+    @property
+    def scaffolded(self) -> bool:
+        """True once the output project has been scaffolded."""
+        return self.manifest.get("scaffolded", False)
+
+    def mark_scaffolded(self):
+        """Record that the output project has been scaffolded."""
+        self._save_manifest(scaffolded=True)
+
+    @property
+    def config_applied(self) -> bool:
+        """True once the current plan's config changes have been applied."""
+        return self.manifest.get("config_applied", False)
+
+    def mark_config_applied(self):
+        """Record that the plan's config changes have been applied."""
+        self._save_manifest(config_applied=True)
+
+    # --- Usage ---
+
+    @property
+    def usage(self) -> dict:
+        """Tokens and wall time spent on this session so far."""
+        usage = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+        usage["seconds"] = 0.0
+        usage.update(self.manifest.get("usage", {}))
+        return usage
+
+    def add_usage(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        seconds: float = 0.0,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ):
+        """Accumulate model usage and wall time (across resumes)."""
+        usage = self.usage
+        usage["input_tokens"] += input_tokens
+        usage["output_tokens"] += output_tokens
+        usage["cache_read_tokens"] += cache_read_tokens
+        usage["cache_write_tokens"] += cache_write_tokens
+        usage["seconds"] += seconds
+        self._save_manifest(usage=usage)
+
+    def set_estimate(self, estimate: dict):
+        """Record the pre-flight estimate, used to calibrate later estimates."""
+        self._save_manifest(estimate=estimate)
+
+    # --- Per-file progress ---
+
+    def file_status(self, file: FileMigration) -> str:
+        """Return the recorded status of a planned file."""
+        return self.progress.get(file.target_path, {}).get("status", FILE_PENDING)
+
+    def mark_file(self, file: FileMigration, status: str, error: Optional[str] = None):
+        """Record the outcome of migrating a single file."""
+        entry = {"source_path": file.source_path, "status": status, "updated_at": time.time()}
+        if error:
+            entry["error"] = error
+        self.progress[file.target_path] = entry
+        self._save_progress()
+
+    def pending_files(self) -> list[FileMigration]:
+        """Planned files that are not done yet, in plan order."""
+        plan = self.plan
+        if plan is None:
+            return []
+        return [f for f in plan.files_to_migrate if self.file_status(f) != FILE_DONE]
+
+    def summary(self) -> dict:
+        """Counts of files by status."""
+        counts = {FILE_PENDING: 0, FILE_DONE: 0, FILE_FAILED: 0}
+        for entry in self.progress.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
@@ -9,6 +9,11 @@ from typing import Optional
 CONFIG_DIR = Path.home() / ".pixel-perfect"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Endpoints of the `local` provider when none are configured (comma-separated URLs)
+LOCAL_ENDPOINTS_ENV = "LOCAL_BASE_URLS"
+DEFAULT_LOCAL_URL = "http://localhost:8000/v1"
+DEFAULT_LOCAL_CONCURRENCY = 8
+
 # Supported providers and their env var names
 SUPPORTED_PROVIDERS = {
     "mistral": {
@@ -41,6 +46,11 @@ SUPPORTED_PROVIDERS = {
         "model_class": "agno.models.deepseek.DeepSeek",
         "default_model": "deepseek-chat",
     },
+    "local": {
+        "env_var": "LOCAL_API_KEY",
+        "model_class": "app.local_provider.LocalOpenAI",
+        "default_model": "local-model",
+    },
     "morph": {
         "env_var": "MORPH_API_KEY",
         "model_class": "agno.tools.models.morph.MorphTools",
@@ -158,6 +168,31 @@ def set_model(model: str, provider: Optional[str] = None):
     _save_config(config)
 
 
+def get_endpoints() -> list[dict]:
+    """Get the `local` provider's endpoints (config, then env var, then localhost)."""
+    endpoints = _load_config().get("endpoints", [])
+    if not endpoints:
+        urls = [u.strip() for u in os.getenv(LOCAL_ENDPOINTS_ENV, "").split(",") if u.strip()]
+        endpoints = [{"url": url, "max_concurrency": DEFAULT_LOCAL_CONCURRENCY} for url in urls]
+    return endpoints or [{"url": DEFAULT_LOCAL_URL, "max_concurrency": DEFAULT_LOCAL_CONCURRENCY}]
+
+
+def add_endpoint(url: str, max_concurrency: int = DEFAULT_LOCAL_CONCURRENCY):
+    """Add a `local` provider endpoint, or update its concurrency limit."""
+    config = _load_config()
+    endpoints = [e for e in config.get("endpoints", []) if e["url"] != url]
+    endpoints.append({"url": url, "max_concurrency": max_concurrency})
+    config["endpoints"] = endpoints
+    _save_config(config)
+
+
+def clear_endpoints():
+    """Remove all configured `local` provider endpoints."""
+    config = _load_config()
+    if config.pop("endpoints", None) is not None:
+        _save_config(config)
+
+
 def show_config() -> dict:
     """Get the full configuration for display."""
     config = _load_config()
@@ -172,5 +207,6 @@ def show_config() -> dict:
         "provider": provider,
         "model": get_model(provider),
         "api_keys": masked_keys,
+        "endpoints": get_endpoints() if provider == "local" else [],
         "config_file": str(CONFIG_FILE),
     }
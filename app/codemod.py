@@ -0,0 +1,704 @@
+"""Deterministic JSX -> Vue SFC conversion for simple React components.
+
+Purely presentational components do not need a model round trip. This module
+converts a small, well-defined subset of React to a `<script setup>` Vue
+single-file component:
+
+- one default-exported function or arrow component with destructured props
+  (defaults supported; `children` becomes a `<slot />`)
+- `const [x, setX] = useState(initial)` state, updated only from event handlers
+- JSX elements, fragments, `className`/`htmlFor`, dynamic attributes and text
+- `{cond && <X />}` and `{cond ? <A /> : <B />}` -> `v-if` / `v-else`
+- `{items.map((item, i) => <li key={...} />)}` -> `v-for`
+- `next/link` -> `<NuxtLink to>` and `next/image` -> a plain `<img>`
+- relative imports of `components/` files: flat ones are left to Nuxt's
+  auto-imports, nested ones (which Nuxt prefixes with their directory)
+  become explicit `~/components/...` imports
+
+Anything outside the subset raises `UnsupportedComponent`, and the file is
+left for the Developer agent. `convert_file` is the process-pool entry point
+the pipeline uses to convert eligible files in parallel.
+"""
+
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from app.schemas import FileMigration
+
+SOURCE_SUFFIXES = (".js", ".jsx")
+
+_IDENT = r"[A-Za-z_$][\w$]*"
+_IMPORT_RE = re.compile(r"""import\s+([^;]*?)\s+from\s+['"]([^'"]+)['"]\s*;?""", re.S)
+_DIRECTIVE_RE = re.compile(r"""^\s*['"]use client['"]\s*;?""")
+_STATE_RE = re.compile(
+    rf"const\s*\[\s*({_IDENT})\s*,\s*({_IDENT})\s*\]\s*=\s*(?:React\.)?useState\s*\("
+)
+_JSX_PRECEDERS = set("(,?:&|>{[!=") | {None}
+_HANDLER_RE = re.compile(rf"^\(?\s*({_IDENT})?\s*\)?\s*=>\s*")
+
+
+class UnsupportedComponent(Exception):
+    """Raised when a file uses React features outside the supported subset."""
+
+
+@dataclass
+class Element:
+    """A JSX element; `tag` is None for fragments."""
+
+    tag: Optional[str]
+    attrs: list = field(default_factory=list)  # (name, kind, value) with kind in string/expr/bool
+    children: list = field(default_factory=list)
+    directives: list = field(default_factory=list)  # (name, expression) Vue directives, e.g. ("v-if", "open")
+
+
+@dataclass
+class Text:
+    """Literal JSX text."""
+
+    value: str
+
+
+@dataclass
+class Expr:
+    """A `{expression}` child rendered as interpolation."""
+
+    code: str
+
+
+@dataclass
+class Comment:
+    """A `{/* comment */}` child."""
+
+    value: str
+
+
+Node = Union[Element, Text, Expr, Comment]
+
+
+def is_eligible(file: FileMigration) -> bool:
+    """Return True if a planned file is worth trying with the codemod."""
+    return (
+        file.action == "convert"
+        and file.source_path.endswith(SOURCE_SUFFIXES)
+        and file.target_path.endswith(".vue")
+    )
+
+
+class _Parser:
+    """Hand-written scanner for the supported module shape."""
+
+    def __init__(self, source: str):
+        self.src = source
+        self.i = 0
+
+    # --- Low-level scanning ---
+
+    def error(self, message: str):
+        line = self.src.count("\n", 0, self.i) + 1
+        raise UnsupportedComponent(f"line {line}: {message}")
+
+    def skip_ws(self):
+        """Skip whitespace and JS comments."""
+        src = self.src
+        while self.i < len(src):
+            if src[self.i].isspace():
+                self.i += 1
+            elif src.startswith("//", self.i):
+                end = src.find("\n", self.i)
+                self.i = len(src) if end == -1 else end
+            elif src.startswith("/*", self.i):
+                end = src.find("*/", self.i)
+                if end == -1:
+                    self.error("unterminated comment")
+                self.i = end + 2
+            else:
+                return
+
+    def expect(self, token: str):
+        self.skip_ws()
+        if not self.src.startswith(token, self.i):
+            self.error(f"expected '{token}'")
+        self.i += len(token)
+
+    def accept(self, token: str) -> bool:
+        self.skip_ws()
+        if self.src.startswith(token, self.i):
+            self.i += len(token)
+            return True
+        return False
+
+    def skip_string(self):
+        """Skip a quoted string or template literal starting at self.i."""
+        src, quote = self.src, self.src[self.i]
+        self.i += 1
+        while self.i < len(src):
+            char = src[self.i]
+            if char == "\\":
+                self.i += 2
+                continue
+            if char == quote:
+                self.i += 1
+                return
+            if quote == "`" and src.startswith("${", self.i):
+                self.i += 2
+                self.scan_js("}")
+                self.i += 1
+                continue
+            if char == "\n" and quote != "`":
+                break
+            self.i += 1
+        self.error("unterminated string")
+
+    def scan_js(self, stop: str) -> list:
+        """Scan a JS expression up to a top-level character in `stop`.
+
+        Returns:
+            Segments: code strings interleaved with parsed JSX `Element` nodes.
+        """
+        src = self.src
+        segments, start, depth, prev = [], self.i, 0, None
+        while self.i < len(src):
+            char = src[self.i]
+            if depth == 0 and char in stop:
+                break
+            if char in "'\"`":
+                self.skip_string()
+                prev = "a"
+                continue
+            if src.startswith("//", self.i) or src.startswith("/*", self.i):
+                self.skip_ws()
+                continue
+            if (
+                char == "<"
+                and (prev in _JSX_PRECEDERS or re.search(r"\breturn\s*$", src[start:self.i]))
+                and re.match(r"<\s*[A-Za-z>]", src[self.i:self.i + 64])
+            ):
+                segments.append(src[start:self.i])
+                segments.append(self.parse_element())
+                start, prev = self.i, "a"
+                continue
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+                if depth < 0:
+                    self.error("unbalanced expression")
+            if not char.isspace():
+                prev = char
+            self.i += 1
+        else:
+            self.error("unexpected end of file")
+        segments.append(src[start:self.i])
+        return segments
+
+    def scan_code(self, stop: str) -> str:
+        """Scan a JS expression that must not contain JSX."""
+        segments = self.scan_js(stop)
+        if len(segments) > 1:
+            self.error("JSX is only supported in the returned markup")
+        return segments[0].strip()
+
+    # --- JSX ---
+
+    def parse_element(self) -> Element:
+        self.expect("<")
+        self.skip_ws()
+        if self.accept(">"):
+            node = Element(tag=None)
+            node.children = self.parse_children(None)
+            return node
+
+        match = re.compile(r"[A-Za-z][\w.:-]*").match(self.src, self.i)
+        if not match:
+            self.error("expected a tag name")
+        node = Element(tag=match.group())
+        self.i = match.end()
+        if node.tag in ("Fragment", "React.Fragment"):
+            node.tag = None
+
+        while True:
+            self.skip_ws()
+            if self.accept("/>"):
+                return node
+            if self.accept(">"):
+                node.children = self.parse_children(node.tag)
+                return node
+            if self.src.startswith("{", self.i):
+                self.error("spread attributes are not supported")
+            match = re.compile(r"[A-Za-z_][\w:-]*").match(self.src, self.i)
+            if not match:
+                self.error("malformed attribute")
+            name = match.group()
+            self.i = match.end()
+            if not self.accept("="):
+                node.attrs.append((name, "bool", None))
+                continue
+            self.skip_ws()
+            char = self.src[self.i:self.i + 1]
+            if char in ("'", '"'):
+                end = self.src.find(char, self.i + 1)
+                if end == -1:
+                    self.error("unterminated attribute")
+                node.attrs.append((name, "string", self.src[self.i + 1:end]))
+                self.i = end + 1
+            elif char == "{":
+                self.i += 1
+                node.attrs.append((name, "expr", self.scan_code("}")))
+                self.expect("}")
+            else:
+                self.error(f"unsupported value for attribute '{name}'")
+
+    def parse_children(self, tag: Optional[str]) -> list:
+        src, children = self.src, []
+        while True:
+            if self.i >= len(src):
+                self.error(f"unclosed <{tag or ''}>")
+            if src.startswith("</", self.i):
+                self.i += 2
+                self.skip_ws()
+                match = re.compile(r"[\w.:-]*").match(src, self.i)
+                closing = match.group() or None
+                if closing in ("Fragment", "React.Fragment"):
+                    closing = None
+                if closing != tag:
+                    self.error(f"mismatched closing tag </{closing or ''}>")
+                self.i = match.end()
+                self.expect(">")
+                return children
+            if src[self.i] == "<":
+                children.append(self.parse_element())
+            elif src[self.i] == "{":
+                self.i += 1
+                children.extend(self.parse_container())
+                self.expect("}")
+            else:
+                end = min(p for p in (src.find("<", self.i), src.find("{", self.i), len(src)) if p != -1)
+                text = _jsx_text(src[self.i:end])
+                if text:
+                    children.append(Text(text))
+                self.i = end
+
+    def parse_container(self) -> list:
+        """Parse the inside of a `{...}` child into template nodes."""
+        while self.src[self.i:self.i + 1].isspace():
+            self.i += 1
+        start = self.i
+        if self.src.startswith("}", self.i):
+            return []
+        comment = re.compile(r"/\*(.*?)\*/\s*(?=})", re.S).match(self.src, start)
+        if comment:
+            self.i = comment.end()
+            return [Comment(comment.group(1).strip())]
+        return _container_nodes(self.scan_js("}"), self)
+
+
+def _jsx_text(raw: str) -> str:
+    """Apply JSX whitespace rules to a text run."""
+    if "\n" not in raw:
+        return raw
+    lines = [line.strip() for line in raw.split("\n")]
+    return " ".join(line for line in lines if line)
+
+
+def _container_nodes(segments: list, parser: _Parser) -> list:
+    """Map the supported expression shapes to nodes with Vue directives."""
+    if len(segments) == 1:
+        return [Expr(segments[0].strip())]
+
+    code = [segments[i].strip() for i in range(0, len(segments), 2)]
+    elements = [segments[i] for i in range(1, len(segments), 2)]
+
+    if len(elements) == 1:
+        head, tail = code
+        match = re.fullmatch(r"(.+?)&&\s*\(?", head, re.S)
+        if match and re.fullmatch(r"\)?", tail):
+            return [_with_directive(elements[0], "v-if", match.group(1).strip())]
+        match = re.fullmatch(r"(.+)\?\s*\(?", head, re.S)
+        if match and re.fullmatch(r"\)?\s*:\s*(null|undefined|''|\"\")", tail):
+            return [_with_directive(elements[0], "v-if", match.group(1).strip())]
+        match = re.fullmatch(
+            rf"(.+)\.map\(\s*\(?\s*({_IDENT})\s*(?:,\s*({_IDENT})\s*)?\)?\s*=>\s*\(?", head, re.S
+        )
+        if match and re.fullmatch(r"\)?\s*\)", tail):
+            items, item, index = match.group(1).strip(), match.group(2), match.group(3)
+            alias = f"({item}, {index})" if index else item
+            return [_with_directive(elements[0], "v-for", f"{alias} in {items}")]
+
+    if len(elements) == 2:
+        head, middle, tail = code
+        match = re.fullmatch(r"(.+)\?\s*\(?", head, re.S)
+        if match and re.fullmatch(r"\)?\s*:\s*\(?", middle) and re.fullmatch(r"\)?", tail):
+            return [
+                _with_directive(elements[0], "v-if", match.group(1).strip()),
+                _with_directive(elements[1], "v-else", None),
+            ]
+
+    parser.error("unsupported JSX expression")
+
+
+def _with_directive(node: Element, name: str, value: Optional[str]) -> Element:
+    """Attach a structural directive, wrapping fragments in <template>."""
+    if node.tag is None:
+        node.tag = "template"
+    node.directives.append((name, value))
+    return node
+
+
+@dataclass
+class Component:
+    """The parsed pieces of a supported React component."""
+
+    props: list  # (name, default expression or None)
+    state: list  # (name, setter, initial expression)
+    root: Element
+    link_names: set
+    image_names: set
+    imports: list = field(default_factory=list)  # (name, Nuxt module path) of nested components
+
+
+def _component_path(name: str, module: str) -> Optional[str]:
+    """Nuxt import path for a relative component import, or None if Nuxt auto-imports it as `name`.
+
+    Nuxt registers `components/layout/Header.vue` as `LayoutHeader`, so only a
+    flat `components/<name>` file keeps working without an import.
+
+    Raises:
+        UnsupportedComponent: If the import does not point into a `components/` directory.
+    """
+    parts = [part for part in posixpath.normpath(module).split("/") if part not in ("", ".", "..")]
+    directories = [i for i, part in enumerate(parts[:-1]) if part == "components"]
+    if not directories:
+        raise UnsupportedComponent(f"cannot locate component import: {module}")
+    nested = parts[directories[-1] + 1:]
+    stem, suffix = os.path.splitext(nested[-1])
+    if suffix in (".js", ".jsx", ".ts", ".tsx"):
+        nested[-1] = stem
+    if nested == [name]:
+        return None
+    return "~/components/" + "/".join(nested) + ".vue"
+
+
+def parse_component(source: str) -> Component:
+    """Parse a module into a Component.
+
+    Raises:
+        UnsupportedComponent: If the module is outside the supported subset.
+    """
+    link_names, image_names, imports = set(), set(), []
+    source = _DIRECTIVE_RE.sub("", source, count=1)
+
+    def strip_import(match):
+        clause, module = match.group(1).strip(), match.group(2)
+        if module == "react":
+            named = re.fullmatch(r"(?:React\s*,?\s*)?(?:\{([^}]*)\})?|React", clause)
+            if not named or not {n.strip() for n in (named.group(1) or "").split(",") if n.strip()} <= {"useState"}:
+                raise UnsupportedComponent(f"unsupported React import: {clause}")
+        elif module in ("next/link", "next/image"):
+            if not re.fullmatch(_IDENT, clause):
+                raise UnsupportedComponent(f"unsupported import from {module}")
+            (link_names if module == "next/link" else image_names).add(clause)
+        elif module.startswith(".") and re.fullmatch(r"[A-Z][\w$]*", clause):
+            path = _component_path(clause, module)
+            if path:
+                imports.append((clause, path))
+        else:
+            raise UnsupportedComponent(f"unsupported import: {module}")
+        return ""
+
+    source = _IMPORT_RE.sub(strip_import, source)
+
+    parser = _Parser(source)
+    export_name = None
+    match = re.search(rf"export\s+default\s+function\s+({_IDENT})?\s*\(", source)
+    if match:
+        parser.i = match.end()
+        start = match.start()
+    else:
+        export = re.search(rf"export\s+default\s+({_IDENT})\s*;?", source)
+        if not export:
+            raise UnsupportedComponent("no default-exported component")
+        export_name = export.group(1)
+        match = re.search(
+            rf"(?:function\s+{re.escape(export_name)}\s*\(|const\s+{re.escape(export_name)}\s*=\s*\()", source
+        )
+        if not match:
+            raise UnsupportedComponent(f"'{export_name}' is not a function component")
+        parser.i = match.end()
+        start = match.start()
+    arrow = match.group().startswith("const")
+
+    props = _parse_props(parser)
+    state = []
+    if arrow:
+        parser.expect("=>")
+        parser.skip_ws()
+        if not parser.src.startswith("{", parser.i):
+            root = _parse_return_value(parser)
+            parser.accept(";")
+        else:
+            parser.i += 1
+            state, root = _parse_body(parser)
+            parser.accept(";")
+    else:
+        parser.expect("{")
+        state, root = _parse_body(parser)
+    end = parser.i
+
+    rest = source[:start] + source[end:]
+    if export_name:
+        rest = re.sub(rf"export\s+default\s+{re.escape(export_name)}\s*;?", "", rest, count=1)
+    leftover = _Parser(rest)
+    leftover.skip_ws()
+    if leftover.i < len(rest):
+        raise UnsupportedComponent("module has code besides the component")
+
+    return Component(props, state, root, link_names, image_names, imports)
+
+
+def _parse_props(parser: _Parser) -> list:
+    """Parse `()` or `({ a, b = 1 })`, leaving the parser after `)`."""
+    props = []
+    parser.skip_ws()
+    if parser.accept(")"):
+        return props
+    parser.expect("{")
+    while not parser.accept("}"):
+        parser.skip_ws()
+        match = re.compile(_IDENT).match(parser.src, parser.i)
+        if not match:
+            parser.error("only destructured props are supported")
+        parser.i = match.end()
+        default = None
+        if parser.accept("="):
+            default = parser.scan_code(",}")
+        props.append((match.group(), default))
+        if not parser.accept(","):
+            parser.expect("}")
+            break
+    parser.expect(")")
+    return props
+
+
+def _parse_body(parser: _Parser):
+    """Parse `useState` declarations followed by `return <jsx>;` and the closing brace."""
+    state = []
+    while True:
+        parser.skip_ws()
+        match = _STATE_RE.match(parser.src, parser.i)
+        if not match:
+            break
+        parser.i = match.end()
+        initial = parser.scan_code(")")
+        parser.expect(")")
+        parser.accept(";")
+        state.append((match.group(1), match.group(2), initial))
+    parser.skip_ws()
+    if not re.compile(r"return\b").match(parser.src, parser.i):
+        parser.error("only useState declarations may precede the return")
+    parser.i += len("return")
+    root = _parse_return_value(parser)
+    parser.accept(";")
+    parser.expect("}")
+    return state, root
+
+
+def _parse_return_value(parser: _Parser) -> Element:
+    """Parse `(<jsx>)` or `<jsx>`."""
+    wrapped = parser.accept("(")
+    parser.skip_ws()
+    if not parser.src.startswith("<", parser.i):
+        parser.error("component must return JSX")
+    root = parser.parse_element()
+    if wrapped:
+        parser.expect(")")
+    return root
+
+
+# --- Rendering ---
+
+
+class _Renderer:
+    """Render a parsed Component as a Vue SFC."""
+
+    INLINE_WIDTH = 100
+
+    def __init__(self, component: Component):
+        self.component = component
+        self.setters = {setter: name for name, setter, _ in component.state}
+        self.prop_names = {name for name, _ in component.props}
+
+    def expr(self, code: str, attribute: bool = True) -> str:
+        """Validate a template expression and make it safe to embed."""
+        if any(re.search(rf"\b{re.escape(setter)}\b", code) for setter in self.setters):
+            raise UnsupportedComponent("state setters are only supported in event handlers")
+        if re.search(r"\bprops\b|\buse[A-Z]", code):
+            raise UnsupportedComponent(f"unsupported expression: {code}")
+        if attribute and '"' in code:
+            if "'" in code:
+                raise UnsupportedComponent(f"cannot quote expression: {code}")
+            code = code.replace('"', "'")
+        if "}}" in code:
+            raise UnsupportedComponent(f"cannot interpolate expression: {code}")
+        return code
+
+    def handler(self, code: str) -> str:
+        """Translate an event handler expression."""
+        if re.fullmatch(_IDENT, code) and code in self.prop_names:
+            return code
+        match = _HANDLER_RE.match(code)
+        if not match:
+            raise UnsupportedComponent(f"unsupported event handler: {code}")
+        param, body = match.group(1), code[match.end():].strip()
+        block = re.fullmatch(r"\{\s*(.*?);?\s*\}", body, re.S)
+        if block:
+            body = block.group(1).strip()
+        call = re.fullmatch(rf"({_IDENT})\((.*)\)", body, re.S)
+        if not call or call.group(1) not in self.setters:
+            raise UnsupportedComponent(f"unsupported event handler: {code}")
+        value = call.group(2).strip()
+        if re.match(rf"\(?\s*{_IDENT}\s*\)?\s*=>", value):
+            raise UnsupportedComponent("functional state updates are not supported")
+        if param:
+            value = re.sub(rf"(?<![\w$.]){re.escape(param)}\b", "$event", value)
+        return self.expr(f"{self.setters[call.group(1)]} = {value}")
+
+    def attributes(self, node: Element) -> list[str]:
+        rendered = []
+        for name, value in node.directives:
+            rendered.append(name if value is None else f'{name}="{self.expr(value)}"')
+
+        is_link = node.tag in self.component.link_names
+        is_image = node.tag in self.component.image_names
+        for name, kind, value in node.attrs:
+            if name == "dangerouslySetInnerHTML" or name == "ref":
+                raise UnsupportedComponent(f"unsupported attribute: {name}")
+            if is_link and name in ("passHref", "prefetch"):
+                continue
+            if is_link and name == "legacyBehavior":
+                raise UnsupportedComponent("legacyBehavior links are not supported")
+            if is_image and name in ("fill", "layout", "loader", "placeholder", "blurDataURL", "quality"):
+                raise UnsupportedComponent(f"unsupported next/image prop: {name}")
+            if is_image and name == "priority":
+                name, kind, value = "fetchpriority", "string", "high"
+            name = {"className": "class", "htmlFor": "for"}.get(name, name)
+            if is_link and name == "href":
+                name = "to"
+
+            if re.fullmatch(r"on[A-Z]\w*", name):
+                if kind != "expr":
+                    raise UnsupportedComponent(f"unsupported event handler on {name}")
+                event = name[2:].lower()
+                if event == "change" and node.tag in ("input", "textarea"):
+                    event = "input"  # React's onChange fires on every keystroke
+                rendered.append(f'@{event}="{self.handler(value)}"')
+            elif kind == "bool":
+                rendered.append(name)
+            elif kind == "string":
+                if '"' in value:
+                    raise UnsupportedComponent(f"cannot quote attribute: {name}")
+                rendered.append(f'{name}="{value}"')
+            else:
+                rendered.append(f':{name}="{self.expr(value)}"')
+        return rendered
+
+    def tag(self, node: Element) -> str:
+        if node.tag in self.component.link_names:
+            return "NuxtLink"
+        if node.tag in self.component.image_names:
+            return "img"
+        return node.tag
+
+    def inline(self, node: Node) -> Optional[str]:
+        """Render a node on one line, or None if it needs its own lines."""
+        if isinstance(node, Text):
+            return node.value
+        if isinstance(node, Expr):
+            if node.code == "children" and "children" in self.prop_names:
+                return "<slot />"
+            return "{{ " + self.expr(node.code, attribute=False) + " }}"
+        return None
+
+    def render(self, node: Node, indent: int) -> list[str]:
+        pad = "  " * indent
+        text = self.inline(node)
+        if text is not None:
+            return [pad + text]
+        if isinstance(node, Comment):
+            return [f"{pad}<!-- {node.value} -->"]
+        if node.tag is None:
+            return [line for child in node.children for line in self.render(child, indent)]
+
+        tag = self.tag(node)
+        opening = " ".join([tag] + self.attributes(node))
+        if not node.children:
+            return [f"{pad}<{opening} />"]
+        parts = [self.inline(child) for child in node.children]
+        if None not in parts:
+            line = f"{pad}<{opening}>{''.join(parts)}</{tag}>"
+            if len(line) <= self.INLINE_WIDTH:
+                return [line]
+        lines = [f"{pad}<{opening}>"]
+        for child in node.children:
+            lines.extend(self.render(child, indent + 1))
+        lines.append(f"{pad}</{tag}>")
+        return lines
+
+    def script(self) -> list[str]:
+        component = self.component
+        props = [(name, default) for name, default in component.props if name != "children"]
+        uses_props = any(
+            re.search(rf"(?<![\w$.]){re.escape(name)}\b", initial) for name, _ in props for _, _, initial in component.state
+        )
+        lines = [f"import {name} from '{path}'" for name, path in component.imports]
+        if props:
+            declaration = "const props = defineProps({" if uses_props else "defineProps({"
+            lines.append(declaration)
+            for name, default in props:
+                if default is None:
+                    lines.append(f"  {name}: null,")
+                elif default[:1] in ("[", "{"):
+                    lines.append(f"  {name}: {{ default: () => ({default}) }},")
+                else:
+                    lines.append(f"  {name}: {{ default: {default} }},")
+            lines.append("})")
+        for name, _, initial in component.state:
+            for prop, _ in props:
+                initial = re.sub(rf"(?<![\w$.]){re.escape(prop)}\b", f"props.{prop}", initial)
+            lines.append(f"const {name} = ref({initial})")
+        if not lines:
+            return []
+        return ["<script setup>", *lines, "</script>", ""]
+
+    def sfc(self) -> str:
+        template = self.render(self.component.root, 1)
+        return "\n".join(self.script() + ["<template>", *template, "</template>", ""])
+
+
+def convert_component(source: str) -> str:
+    """Convert React component source to a Vue single-file component.
+
+    Raises:
+        UnsupportedComponent: If the source is outside the supported subset.
+    """
+    return _Renderer(parse_component(source)).sfc()
+
+
+def convert_file(source_file: str, target_file: str) -> Optional[str]:
+    """Convert one file on disk; the process-pool entry point.
+
+    Returns:
+        None on success, otherwise the reason the file was left for the Developer.
+    """
+    try:
+        with open(source_file, encoding="utf-8") as f:
+            vue = convert_component(f.read())
+    except (OSError, UnicodeDecodeError, UnsupportedComponent) as e:
+        return str(e)
+    os.makedirs(os.path.dirname(target_file) or ".", exist_ok=True)
+    with open(target_file, "w", encoding="utf-8") as f:
+        f.write(vue)
+    return None
+
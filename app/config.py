@@ -57,10 +57,17 @@ class APIKeyManager:
         return temp_manager.get_next_key()
 
 
-def get_model():
-    """Get the configured model instance based on CLI config."""
+def get_model(cache_key: Optional[str] = None):
+    """Get the configured model instance based on CLI config.
+
+    Args:
+        cache_key: Stable identifier of the caller's prompt prefix (e.g. the
+            agent role), used to route requests to the provider's prompt cache.
+    """
     from app import cli_config
-    
+    from app.http_clients import share_clients
+    from app.prompt_cache import apply_cache_hints
+
     provider = cli_config.get_provider()
     model_id = cli_config.get_model(provider)
     key_manager = APIKeyManager(provider)
@@ -68,34 +75,46 @@ def get_model():
     
     if provider == "mistral":
         from agno.models.mistral import MistralChat
-        return MistralChat(id=model_id, api_key=api_key)
+        model = MistralChat(id=model_id, api_key=api_key)
     elif provider == "openai":
         from agno.models.openai import OpenAIResponses
-        return OpenAIResponses(id=model_id, api_key=api_key)
+        model = OpenAIResponses(id=model_id, api_key=api_key)
     elif provider == "anthropic":
         from agno.models.anthropic import Claude
-        return Claude(id=model_id, api_key=api_key)
+        model = Claude(id=model_id, api_key=api_key)
     elif provider == "google":
         from agno.models.google import Gemini
-        return Gemini(id=model_id, api_key=api_key)
+        model = Gemini(id=model_id, api_key=api_key)
     elif provider == "groq":
         from agno.models.groq import Groq
-        return Groq(id=model_id, api_key=api_key)
+        model = Groq(id=model_id, api_key=api_key)
     elif provider == "deepseek":
-        from agno.models.deepseek import DeepSeek
-        return DeepSeek(id=model_id, api_key=api_key)
+        from app.prompt_cache import CachedDeepSeek
+        model = CachedDeepSeek(id=model_id, api_key=api_key)
+    elif provider == "local":
+        from app.local_provider import LocalOpenAI
+        model = LocalOpenAI(id=model_id, api_key=api_key or "not-provided")
     else:
         # Default fallback to Mistral
         from agno.models.mistral import MistralChat
-        return MistralChat(id="mistral-large-latest", api_key=api_key)
+        model = MistralChat(id="mistral-large-latest", api_key=api_key)
+    return share_clients(apply_cache_hints(model, provider, cache_key), provider)
 
 
 # Legacy support - create key manager for default provider
 key_manager = APIKeyManager()
 
 
+# Shared database instance (one SQLite engine per process)
+_database: Optional[SqliteDb] = None
+
+
 def get_database() -> SqliteDb:
-    """Get the database instance for agent storage."""
-    from app.cli_config import CONFIG_DIR
-    db_file = CONFIG_DIR / "storage.db"
-    return SqliteDb(db_file=str(db_file))
+    """Get the database instance for agent storage (large run payloads are stored as compressed blobs)."""
+    global _database
+    if _database is None:
+        from app.cli_config import CONFIG_DIR
+        from app.storage import BlobSqliteDb
+        db_file = CONFIG_DIR / "storage.db"
+        _database = BlobSqliteDb(db_file=str(db_file))
+    return _database
@@ -0,0 +1,254 @@
+"""Long-lived daemon that keeps agno, MCP and storage warm between jobs.
+
+`pixel-perfect serve` starts an asyncio server on a local Unix socket.
+Clients (`migrate ... daemon` / `analyze ... daemon`) send one JSON job per
+connection and receive newline-delimited JSON events back:
+
+    -> {"command": "analyze", "args": {"repo": "/abs/path"}}
+    <- {"type": "progress", "text": "  ✓ Components (1/2): 250 files"}
+    <- {"type": "output", "text": "..."}
+    <- {"type": "done", "ok": true}
+
+A failed job ends with `{"type": "done", "ok": false, "error": "..."}`.
+
+The client half of this module only uses the standard library so that
+submitting a job does not import agno.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.cli_config import CONFIG_DIR
+
+SOCKET_PATH = CONFIG_DIR / "daemon.sock"
+DEFAULT_MAX_JOBS = 4
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot be reached or a job fails."""
+
+
+# --- Client ---
+
+def is_running(socket_path: Path = SOCKET_PATH) -> bool:
+    """Return True if a daemon is accepting connections on the socket."""
+    try:
+        return request({"command": "ping"}, socket_path=socket_path) is not None
+    except DaemonError:
+        return False
+
+
+def request(job: dict, on_event: Optional[Callable[[dict], None]] = None, socket_path: Path = SOCKET_PATH) -> dict:
+    """Send a job to the daemon and stream its events.
+
+    Args:
+        job: Job payload with `command` and optional `args`.
+        on_event: Called for every non-terminal event.
+        socket_path: Socket the daemon listens on.
+
+    Returns:
+        The final `done` event.
+
+    Raises:
+        DaemonError: If the daemon is unreachable or the connection drops.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonError("Unix sockets are not supported on this platform")
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(str(socket_path))
+    except OSError as e:
+        raise DaemonError(f"Cannot connect to daemon at {socket_path}: {e}")
+
+    with conn, conn.makefile("rwb") as stream:
+        stream.write(json.dumps(job).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            event = json.loads(line)
+            if event.get("type") == "done":
+                return event
+            if on_event:
+                on_event(event)
+    raise DaemonError("Daemon closed the connection before the job finished")
+
+
+def print_event(event: dict):
+    """Default client renderer for streamed events."""
+    if event.get("type") == "output":
+        sys.stdout.write(event.get("text", ""))
+    elif event.get("type") == "progress":
+        sys.stdout.write(f"\n  → {event.get('text', '')}\n")
+    sys.stdout.flush()
+
+
+# --- Server ---
+
+class MigrationDaemon:
+    """Serves analyze/migrate jobs with warm imports, MCP connection and DB."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH, max_jobs: int = DEFAULT_MAX_JOBS, mcp: bool = True):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on.
+            max_jobs: Maximum number of jobs running concurrently.
+            mcp: Keep a Nuxt MCP connection open for migrate jobs.
+        """
+        self.socket_path = Path(socket_path)
+        self.max_jobs = max_jobs
+        self.use_mcp = mcp
+        self.nuxt_mcp = None
+        self._job_slots: Optional[asyncio.Semaphore] = None
+        self._mcp_lock: Optional[asyncio.Lock] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def warm_up(self):
+        """Import agno, open storage and connect MCP ahead of the first job."""
+        from app.config import get_database
+        import app.team  # noqa: F401  (pulls in agno, models and toolkits)
+
+        get_database()
+        if self.use_mcp:
+            await self._get_nuxt_mcp()
+
+    async def _get_nuxt_mcp(self):
+        """Return a live Nuxt MCP client, reconnecting if the session died."""
+        from app.agents.developer import create_nuxt_mcp
+
+        async with self._mcp_lock:
+            if self.nuxt_mcp is None:
+                self.nuxt_mcp = create_nuxt_mcp()
+                await self.nuxt_mcp.connect()
+            elif not await self.nuxt_mcp.is_alive():
+                await self.nuxt_mcp.connect(force=True)
+            return self.nuxt_mcp
+
+    async def _run_analyze(self, args: dict, writer: asyncio.StreamWriter):
+        """Run the sharded Analyzers on a repository and save the merged report."""
+        from app.agents import create_analyzer_agent
+        from app.analysis import analyze_project
+        from app.tool_cache import ToolCallCache
+
+        source_path = args["repo"]
+        tool_cache = ToolCallCache()
+
+        async with self._progress(writer) as log:
+            report, _ = await analyze_project(
+                source_path,
+                lambda: create_analyzer_agent(base_dir=source_path, tool_cache=tool_cache),
+                args.get("concurrency", 5),
+                log,
+            )
+        await self._send(writer, {"type": "output", "text": report})
+        if args.get("report"):
+            Path(args["report"]).write_text(report)
+            await self._send(writer, {"type": "progress", "text": f"report saved to {args['report']}"})
+
+    async def _run_migrate(self, args: dict, writer: asyncio.StreamWriter):
+        """Run the checkpointed migration pipeline (non-interactive)."""
+        import uuid
+        from app.pipeline import run_staged_migration
+
+        use_mcp = args.get("mcp", True) and self.use_mcp
+        nuxt_mcp = await self._get_nuxt_mcp() if use_mcp else None
+        session_id = args.get("session_id") or str(uuid.uuid4())
+        analysis = Path(args["analysis"]).read_text() if args.get("analysis") else None
+
+        async with self._progress(writer) as log:
+            log(f"Session ID: {session_id}")
+            await run_staged_migration(
+                args["repo"],
+                args["output"],
+                session_id,
+                use_mcp=use_mcp,
+                analysis=analysis,
+                nuxt_mcp=nuxt_mcp,
+                concurrency=args.get("concurrency", 4),
+                codemod=args.get("codemod", True),
+                log=log,
+            )
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, event: dict):
+        """Write one JSON event line."""
+        writer.write(json.dumps(event).encode() + b"\n")
+        await writer.drain()
+
+    @contextlib.asynccontextmanager
+    async def _progress(self, writer: asyncio.StreamWriter):
+        """Yield a synchronous log callback that sends progress events.
+
+        Lines are queued and sent in order through `_send`, so every write is
+        drained. Every queued line is sent before the context exits.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            while (text := await queue.get()) is not None:
+                await self._send(writer, {"type": "progress", "text": text})
+
+        task = asyncio.create_task(pump())
+        try:
+            yield queue.put_nowait
+        finally:
+            queue.put_nowait(None)
+            await task
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle a single client connection (one job)."""
+        try:
+            line = await reader.readline()
+            job = json.loads(line) if line else {}
+            command = job.get("command")
+            args = job.get("args", {})
+
+            if command == "ping":
+                await self._send(writer, {"type": "done", "ok": True, "pid": os.getpid()})
+            elif command == "shutdown":
+                await self._send(writer, {"type": "done", "ok": True})
+                self._server.close()
+            elif command in ("analyze", "migrate"):
+                async with self._job_slots:
+                    handler = self._run_analyze if command == "analyze" else self._run_migrate
+                    await handler(args, writer)
+                await self._send(writer, {"type": "done", "ok": True})
+            else:
+                await self._send(writer, {"type": "done", "ok": False, "error": f"Unknown command: {command}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away; nothing to report to
+        except Exception as e:
+            try:
+                await self._send(writer, {"type": "done", "ok": False, "error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Warm up and serve jobs until a shutdown request arrives."""
+        self._job_slots = asyncio.Semaphore(self.max_jobs)
+        self._mcp_lock = asyncio.Lock()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if is_running(self.socket_path):
+                raise DaemonError(f"A daemon is already running on {self.socket_path}")
+            self.socket_path.unlink()
+
+        await self.warm_up()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        try:
+            async with self._server:
+                await self._server.wait_closed()
+        finally:
+            if self.nuxt_mcp is not None:
+                await self.nuxt_mcp.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
@@ -0,0 +1,164 @@
+"""Structured typecheck diagnostics for the validation stage.
+
+`run_typecheck` runs `npx nuxi typecheck` (vue-tsc) in the output project and
+`parse_diagnostics` turns its output into per-error records, so validation can
+hand each broken file to its own Developer run with just that file's errors
+and the surrounding source lines, instead of one agent working through the
+whole log sequentially.
+
+Both TypeScript output styles are understood:
+
+- plain: `app/pages/index.vue(12,5): error TS2322: Type ...`
+- pretty: `app/pages/index.vue:12:5 - error TS2322: Type ...` (ANSI colors allowed)
+
+Indented lines after a header continue its message chain; code frames and
+summary lines are ignored.
+"""
+
+import asyncio
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from typing import Optional
+
+TYPECHECK_COMMAND = ["npx", "nuxi", "typecheck"]
+TYPECHECK_TIMEOUT = 600
+# Generated or third-party code: errors there are fixed in the project's own files
+IGNORED_PREFIXES = ("node_modules/", ".nuxt/", ".output/")
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+_TAIL = r"(?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$"
+_PLAIN_RE = re.compile(r"^(?P<file>[^\s(][^(]*)\((?P<line>\d+),(?P<column>\d+)\): " + _TAIL)
+_PRETTY_RE = re.compile(r"^(?P<file>[^\s:][^:]*):(?P<line>\d+):(?P<column>\d+) - " + _TAIL)
+
+
+@dataclass
+class Diagnostic:
+    """One compiler error or warning."""
+
+    file: str  # Relative to the project root
+    line: int
+    column: int
+    code: str
+    message: str
+    severity: str = "error"
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}:{self.column} {self.code}: {self.message}"
+
+
+@dataclass
+class TypecheckResult:
+    """Exit status and parsed output of one typecheck run."""
+
+    returncode: int
+    output: str
+    diagnostics: list[Diagnostic]
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def errors(self) -> list[Diagnostic]:
+        return [d for d in self.diagnostics if d.severity == "error"]
+
+
+def _relative(path: str, root: str) -> str:
+    """Project-relative POSIX form of a path printed by the compiler."""
+    absolute = os.path.normpath(os.path.join(root, path))
+    return os.path.relpath(absolute, root).replace(os.sep, "/")
+
+
+def parse_diagnostics(output: str, root: str = ".") -> list[Diagnostic]:
+    """Parse vue-tsc / tsc output into diagnostics.
+
+    Args:
+        output: Combined stdout and stderr of the typecheck.
+        root: Directory the compiler ran in; paths are made relative to it.
+
+    Returns:
+        Diagnostics in output order, without duplicates.
+    """
+    diagnostics: list[Diagnostic] = []
+    seen = set()
+    current: Optional[Diagnostic] = None
+    for raw in _ANSI_RE.sub("", output).splitlines():
+        match = _PLAIN_RE.match(raw) or _PRETTY_RE.match(raw)
+        if match:
+            current = Diagnostic(
+                file=_relative(match["file"].strip(), root),
+                line=int(match["line"]),
+                column=int(match["column"]),
+                code=match["code"],
+                message=match["message"].strip(),
+                severity=match["severity"],
+            )
+            key = (current.file, current.line, current.column, current.code)
+            if key not in seen:
+                seen.add(key)
+                diagnostics.append(current)
+            continue
+        if current is not None and raw[:1].isspace() and raw.strip():
+            current.message += " " + raw.strip()
+        else:
+            current = None  # A blank line, code frame or summary ends the message chain
+    return diagnostics
+
+
+def group_by_file(diagnostics: list[Diagnostic]) -> dict[str, list[Diagnostic]]:
+    """Group errors by file, skipping generated and third-party code.
+
+    Returns:
+        File path to its errors sorted by line, files ordered by error count (most first).
+    """
+    groups: dict[str, list[Diagnostic]] = {}
+    for diagnostic in diagnostics:
+        if diagnostic.severity != "error" or diagnostic.file.startswith(IGNORED_PREFIXES + ("../",)):
+            continue
+        groups.setdefault(diagnostic.file, []).append(diagnostic)
+    ordered = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))
+    return {path: sorted(errors, key=lambda d: (d.line, d.column)) for path, errors in ordered}
+
+
+def excerpt(text: str, diagnostics: list[Diagnostic], context: int = 3) -> str:
+    """Numbered source lines around each diagnostic, merging overlapping ranges."""
+    lines = text.splitlines()
+    ranges: list[list[int]] = []
+    for diagnostic in sorted(diagnostics, key=lambda d: d.line):
+        start, end = max(1, diagnostic.line - context), min(len(lines), diagnostic.line + context)
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    blocks = ["\n".join(f"{n:>5}: {lines[n - 1]}" for n in range(start, end + 1)) for start, end in ranges]
+    return "\n  ...\n".join(blocks)
+
+
+async def run_typecheck(root: str, timeout: float = TYPECHECK_TIMEOUT) -> Optional[TypecheckResult]:
+    """Run `nuxi typecheck` in a project.
+
+    Returns:
+        The result, or None if the typecheck could not be run (no `npx`, no
+        project directory, or it timed out).
+    """
+    if not shutil.which(TYPECHECK_COMMAND[0]) or not os.path.isdir(root):
+        return None
+    env = {**os.environ, "CI": "1", "NO_COLOR": "1", "FORCE_COLOR": "0"}
+    process = await asyncio.create_subprocess_exec(
+        *TYPECHECK_COMMAND,
+        cwd=root,
+        env=env,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    output = stdout.decode("utf-8", errors="replace")
+    return TypecheckResult(process.returncode, output, parse_diagnostics(output, root))
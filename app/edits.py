@@ -0,0 +1,364 @@
+"""Local structured edits for the Developer.
+
+Without a Morph key the Developer could only fix a typecheck error by
+rewriting the whole file through `write_file`, which costs thousands of output
+tokens for a one-line change. `FileEditTools` lets it send just the change,
+either as a search/replace block or as a unified diff, and applies it offline.
+
+Edits are anchored in three passes: an exact match, a match that ignores
+indentation and trailing whitespace (the replacement is re-indented to fit),
+and a fuzzy line-window match above `FUZZY_THRESHOLD` similarity. Ambiguous or
+unmatched edits are rejected with a message that tells the model what to send
+instead, and a patch is only written if every hunk applies.
+"""
+
+import difflib
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from agno.tools import Toolkit
+
+FUZZY_THRESHOLD = 0.9
+# The best fuzzy window must beat the runner-up by this much to be unambiguous
+FUZZY_MARGIN = 0.05
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class EditError(Exception):
+    """Raised when an edit cannot be applied unambiguously."""
+
+
+@dataclass
+class Hunk:
+    """One change: the lines to find and the lines to put in their place."""
+
+    old: list[str]
+    new: list[str]
+    line: Optional[int] = None  # 1-based position hint from a diff header
+
+
+@dataclass
+class FilePatch:
+    """All hunks of a unified diff that target one file."""
+
+    old_path: Optional[str]
+    new_path: Optional[str]
+    hunks: list[Hunk] = field(default_factory=list)
+
+
+def _indent(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _numbered(lines: list[str], start: int, end: int) -> str:
+    return "\n".join(f"{n + 1:>5}: {lines[n]}" for n in range(max(0, start), min(len(lines), end)))
+
+
+def _trim_blank(lines: list[str]) -> list[str]:
+    """Drop leading and trailing blank lines of a search block."""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+
+def _reindent(new: list[str], old: list[str], found: list[str]) -> list[str]:
+    """Shift replacement lines by the indentation difference between the search block and the file."""
+    pairs = [(o, f) for o, f in zip(old, found) if o.strip()]
+    if not pairs:
+        return new
+    search_indent, file_indent = _indent(pairs[0][0]), _indent(pairs[0][1])
+    if search_indent == file_indent:
+        return new
+    shifted = []
+    for line in new:
+        if line.strip() and line.startswith(search_indent):
+            line = file_indent + line[len(search_indent):]
+        elif line.strip() and not search_indent:
+            line = file_indent + line
+        shifted.append(line)
+    return shifted
+
+
+def _pick(starts: list[int], hint: Optional[int], size: int, lines: list[str], what: str) -> int:
+    """Choose one match; several are only accepted when a diff line hint singles one out."""
+    if len(starts) == 1:
+        return starts[0]
+    if hint is not None:
+        ranked = sorted(starts, key=lambda s: abs(s + 1 - hint))
+        if abs(ranked[0] + 1 - hint) < abs(ranked[1] + 1 - hint):
+            return ranked[0]
+    locations = ", ".join(f"{s + 1}-{s + size}" for s in starts[:5])
+    raise EditError(
+        f"{what} matches {len(starts)} places (lines {locations}). "
+        "Include more surrounding lines so it matches exactly once."
+    )
+
+
+def locate(lines: list[str], old: list[str], hint: Optional[int] = None) -> tuple[int, int, list[str]]:
+    """Find where a block of lines sits in a file.
+
+    Args:
+        lines: File content split into lines.
+        old: Lines to find.
+        hint: Optional 1-based line number the block is expected near.
+
+    Returns:
+        (start, end, old) with `lines[start:end]` the matched region and `old`
+        the (blank-trimmed) block that was matched.
+
+    Raises:
+        EditError: If the block is missing or ambiguous.
+    """
+    old = _trim_blank(old)
+    if not old:
+        raise EditError("The search text is empty. Quote the lines to replace.")
+    size = len(old)
+    windows = range(len(lines) - size + 1)
+
+    exact = [s for s in windows if lines[s:s + size] == old]
+    if exact:
+        start = _pick(exact, hint, size, lines, "The search text")
+        return start, start + size, old
+
+    stripped = [line.strip() for line in old]
+    loose = [s for s in windows if [line.strip() for line in lines[s:s + size]] == stripped]
+    if loose:
+        start = _pick(loose, hint, size, lines, "Ignoring indentation, the search text")
+        return start, start + size, old
+
+    target = "\n".join(stripped)
+    scored = sorted(
+        (
+            (difflib.SequenceMatcher(None, target, "\n".join(line.strip() for line in lines[s:s + size])).ratio(), s)
+            for s in windows
+        ),
+        reverse=True,
+    )
+    if not scored:
+        raise EditError(f"The search text ({size} lines) is longer than the file ({len(lines)} lines).")
+    best, start = scored[0]
+    runner_up = scored[1][0] if len(scored) > 1 else 0.0
+    if best >= FUZZY_THRESHOLD and best - runner_up >= FUZZY_MARGIN:
+        return start, start + size, old
+    raise EditError(
+        f"The search text was not found. Closest match ({best:.0%} similar) at lines {start + 1}-{start + size}:\n"
+        f"{_numbered(lines, start, start + size)}\n"
+        "Copy the current lines exactly (read the file again if it changed) and retry."
+    )
+
+
+def apply_hunks(text: str, hunks: list[Hunk]) -> str:
+    """Apply hunks to file content; all of them must apply.
+
+    Hunks are located against the original content, so their order and line
+    hints refer to the file as it was before the edit.
+
+    Raises:
+        EditError: If any hunk is missing, ambiguous or overlaps another.
+    """
+    lines = text.split("\n")
+    regions = []
+    for number, hunk in enumerate(hunks, start=1):
+        if not any(line.strip() for line in hunk.old) and hunk.line is not None:
+            # A pure insertion from a zero-context diff goes after line `hunk.line`
+            regions.append((hunk.line, hunk.line, hunk.new, number))
+            continue
+        try:
+            start, end, old = locate(lines, hunk.old, hunk.line)
+        except EditError as e:
+            raise EditError(f"Hunk {number}: {e}" if len(hunks) > 1 else str(e)) from None
+        # Blank lines trimmed off the search block are dropped from the replacement too
+        lead = next(i for i, line in enumerate(hunk.old) if line.strip())
+        trail = len(hunk.old) - lead - len(old)
+        new = hunk.new
+        while lead and new and not new[0].strip():
+            new, lead = new[1:], lead - 1
+        while trail and new and not new[-1].strip():
+            new, trail = new[:-1], trail - 1
+        regions.append((start, end, _reindent(new, old, lines[start:end]), number))
+
+    regions.sort()
+    for (_, prev_end, _, prev), (start, _, _, number) in zip(regions, regions[1:]):
+        if start < prev_end:
+            raise EditError(f"Hunks {prev} and {number} overlap. Merge them into one hunk.")
+    for start, end, new, _ in reversed(regions):
+        lines[start:end] = new
+    return "\n".join(lines)
+
+
+def _check_deletion(current: str, hunks: list[Hunk]):
+    """Make sure a `+++ /dev/null` patch removes exactly the file's current content.
+
+    Raises:
+        EditError: If the patch is stale or does not delete the whole file.
+    """
+    removed = [line for hunk in hunks for line in hunk.old]
+    if any(hunk.new for hunk in hunks) or removed != current.splitlines():
+        raise EditError(
+            "The deletion patch does not match the file's current content. "
+            "Diff against the current content, removing every line."
+        )
+
+
+def _diff_path(header: str) -> Optional[str]:
+    """Path from a `---`/`+++` header line, without the a/ b/ prefix or timestamp."""
+    path = header[4:].split("\t")[0].strip()
+    if path == "/dev/null":
+        return None
+    if path[:2] in ("a/", "b/"):
+        path = path[2:]
+    return path
+
+
+def _is_file_header(lines: list[str], i: int) -> bool:
+    return lines[i].startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ ")
+
+
+def parse_unified_diff(patch: str) -> list[FilePatch]:
+    """Parse a unified diff (as produced by `diff -u` or `git diff`).
+
+    Raises:
+        EditError: If the text contains no file headers or hunks.
+    """
+    files: list[FilePatch] = []
+    lines = patch.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if _is_file_header(lines, i):
+            files.append(FilePatch(_diff_path(line), _diff_path(lines[i + 1])))
+            i += 2
+            continue
+        match = _HUNK_RE.match(line)
+        if match:
+            if not files:
+                raise EditError("The patch has a hunk before any '--- a/file' / '+++ b/file' header.")
+            hunk = Hunk([], [], int(match.group(1)))
+            i += 1
+            while i < len(lines) and not _HUNK_RE.match(lines[i]) and not _is_file_header(lines, i):
+                body = lines[i]
+                marker, content = (body[:1], body[1:]) if body else (" ", "")
+                if marker in (" ", "-"):
+                    hunk.old.append(content)
+                if marker in (" ", "+"):
+                    hunk.new.append(content)
+                i += 1  # Other lines ("\ No newline at end of file", git metadata) are ignored
+            files[-1].hunks.append(hunk)
+            continue
+        i += 1
+
+    if not files or not any(f.hunks for f in files):
+        raise EditError("No unified diff found. Send '--- a/path', '+++ b/path' headers followed by '@@' hunks.")
+    return files
+
+
+class FileEditTools(Toolkit):
+    """Agent toolkit for small, offline edits of existing files."""
+
+    def __init__(self, base_dir: str = ".", **kwargs):
+        """
+        Initialize the toolkit.
+
+        Args:
+            base_dir: Directory relative paths are resolved against.
+        """
+        self.base_dir = Path(base_dir)
+        super().__init__(name="file_edits", tools=[self.replace_in_file, self.apply_patch], **kwargs)
+
+    def _resolve(self, path: str) -> Path:
+        """Resolve a path argument, refusing anything outside `base_dir`.
+
+        Raises:
+            EditError: If the path escapes the project directory.
+        """
+        root = self.base_dir.resolve()
+        resolved = (root / os.path.expanduser(path)).resolve()
+        if not resolved.is_relative_to(root):
+            raise EditError(f"{path} is outside the project directory; only files under {root} can be edited.")
+        return resolved
+
+    def replace_in_file(self, file_path: str, search: str, replace: str) -> str:
+        """Replace one block of lines in an existing file.
+
+        Prefer this over rewriting a whole file to fix an error. Quote only the
+        lines to change plus enough context to make them unique.
+
+        Args:
+            file_path: File to edit (absolute, or relative to the project directory).
+            search: The exact current lines to replace. Indentation differences are tolerated.
+            replace: The new lines. Use an empty string to delete the search lines.
+
+        Returns:
+            A confirmation, or why the edit was rejected.
+        """
+        try:
+            path = self._resolve(file_path)
+            text = path.read_text(encoding="utf-8")
+        except EditError as e:
+            return f"Rejected: {e}"
+        except (OSError, UnicodeDecodeError) as e:
+            return f"Error: cannot read {file_path}: {e}"
+        hunk = Hunk(search.split("\n"), replace.split("\n") if replace else [])
+        try:
+            updated = apply_hunks(text, [hunk])
+        except EditError as e:
+            return f"Rejected: {e}"
+        path.write_text(updated, encoding="utf-8")
+        return f"Edited {file_path} ({len(_trim_blank(hunk.old))} lines replaced with {len(hunk.new)})."
+
+    def apply_patch(self, patch: str) -> str:
+        """Apply a unified diff to one or more files.
+
+        Use `--- a/path` / `+++ b/path` headers and `@@` hunks with a few lines
+        of context. Use `/dev/null` as the old path to create a file. Nothing is
+        written unless every hunk applies.
+
+        Args:
+            patch: The unified diff text.
+
+        Returns:
+            The files changed, or why the patch was rejected.
+        """
+        try:
+            file_patches = parse_unified_diff(patch)
+        except EditError as e:
+            return f"Rejected: {e}"
+
+        results: list[tuple[Path, Optional[str]]] = []
+        for file_patch in file_patches:
+            name = file_patch.new_path or file_patch.old_path
+            if name is None:
+                return "Error: a file header has /dev/null as both the old and the new path; name the file."
+            try:
+                path = self._resolve(name)
+                if file_patch.old_path is None:
+                    if path.exists():
+                        return f"Rejected: {name} already exists; diff against its current content instead."
+                    text = "\n".join(line for hunk in file_patch.hunks for line in hunk.new) + "\n"
+                else:
+                    current = path.read_text(encoding="utf-8")
+                    if file_patch.new_path is None:
+                        _check_deletion(current, file_patch.hunks)
+                        text = None
+                    else:
+                        text = apply_hunks(current, file_patch.hunks)
+            except (OSError, UnicodeDecodeError) as e:
+                return f"Rejected: cannot read {name}: {e}"
+            except EditError as e:
+                return f"Rejected: {name}: {e}"
+            results.append((path, text))
+
+        for path, text in results:
+            if text is None:
+                path.unlink()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(text, encoding="utf-8")
+        return "Patched " + ", ".join(str(p) for p, _ in results) + "."
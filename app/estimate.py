@@ -0,0 +1,330 @@
+"""Pre-flight token, cost and duration estimates for a migration.
+
+`scan_project` statically walks a Next.js source tree (file kinds, sizes,
+component complexity, routes, codemod eligibility) and `estimate_migration`
+turns the scan into expected tokens, dollars and wall time for `migrate`
+using a per-provider price/latency profile and a work model of the staged
+pipeline. Completed sessions record their estimate and actual usage in the
+session manifest; `calibration` derives correction factors from them so
+estimates track what past runs really cost.
+"""
+
+import json
+import os
+import re
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from app import checkpoints
+from app.source_tree import CONFIG_NAMES, IGNORED_DIRS, SCRIPT_SUFFIXES, STYLE_SUFFIXES
+
+CHARS_PER_TOKEN = 4
+
+_HOOK_RE = re.compile(r"\buse[A-Z]\w*\s*\(")
+_JSX_TAG_RE = re.compile(r"<[A-Za-z]")
+_IMPORT_RE = re.compile(r"^\s*import\s", re.M)
+_BRANCH_RE = re.compile(r"&&|\?\s|\bif\s*\(")
+_DATA_RE = re.compile(r"\b(getServerSideProps|getStaticProps|getStaticPaths|getInitialProps|fetch)\b")
+
+
+@dataclass
+class SourceFile:
+    """One scanned file."""
+
+    path: str
+    kind: str  # page, api, component, style, config, other
+    size: int
+    complexity: int = 0
+    codemod: bool = False
+
+    @property
+    def tokens(self) -> int:
+        return max(1, self.size // CHARS_PER_TOKEN)
+
+
+@dataclass
+class ProjectScan:
+    """Static facts about a source tree."""
+
+    root: str
+    files: list[SourceFile] = field(default_factory=list)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for f in self.files if f.kind == kind)
+
+    @property
+    def routes(self) -> int:
+        return self.count("page")
+
+    @property
+    def size(self) -> int:
+        return sum(f.size for f in self.files)
+
+    @property
+    def tokens(self) -> int:
+        return sum(f.tokens for f in self.files)
+
+
+@dataclass
+class ProviderProfile:
+    """List prices (USD per million tokens) and observed speed of a provider's default model."""
+
+    input_per_mtok: float
+    output_per_mtok: float
+    output_tokens_per_second: float
+    request_latency: float  # Seconds to first token
+
+
+PROVIDER_PROFILES = {
+    "mistral": ProviderProfile(2.0, 6.0, 60, 1.0),
+    "openai": ProviderProfile(2.5, 10.0, 80, 0.8),
+    "anthropic": ProviderProfile(3.0, 15.0, 60, 1.2),
+    "google": ProviderProfile(0.1, 0.4, 150, 0.6),
+    "groq": ProviderProfile(0.59, 0.79, 275, 0.3),
+    "deepseek": ProviderProfile(0.27, 1.1, 30, 1.5),
+    "local": ProviderProfile(0.0, 0.0, 40, 0.5),  # Self-hosted: throughput depends on the hardware
+}
+
+# Work model of the staged pipeline, in tokens per agent turn
+AGENT_CONTEXT_TOKENS = 3000  # System prompt, instructions and tool schemas
+TOOL_SECONDS_PER_TURN = 1.0
+ANALYSIS_READ_CAP = 60_000
+ANALYSIS_REPORT_TOKENS = 3000
+PLAN_TOKENS_PER_FILE = 120
+VALIDATION_TOKENS_PER_TURN = 2000
+
+
+@dataclass
+class StageEstimate:
+    """Expected work for one pipeline stage (or one file)."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "StageEstimate") -> "StageEstimate":
+        return StageEstimate(
+            self.requests + other.requests,
+            self.input_tokens + other.input_tokens,
+            self.output_tokens + other.output_tokens,
+            self.seconds + other.seconds,
+        )
+
+
+@dataclass
+class Estimate:
+    """Expected cost of a full `migrate` run."""
+
+    provider: str
+    concurrency: int
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    cost: float
+    seconds: float
+    calibration_runs: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "provider": self.provider,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": round(self.cost, 4),
+            "seconds": round(self.seconds, 1),
+        }
+
+
+def _classify(rel_path: str) -> str:
+    """Map a source path to the kind of migration work it needs."""
+    parts = rel_path.split("/")
+    name, suffix = parts[-1], os.path.splitext(rel_path)[1]
+    if CONFIG_NAMES.match(name):
+        return "config"
+    if suffix in STYLE_SUFFIXES:
+        return "style"
+    if suffix not in SCRIPT_SUFFIXES:
+        return "other"
+    root = parts[1] if parts[0] == "src" and len(parts) > 1 else parts[0]
+    if root == "pages":
+        if "api" in parts:
+            return "api"
+        return "other" if name.startswith("_") else "page"
+    if root == "app":
+        stem = os.path.splitext(name)[0]
+        if stem == "route":
+            return "api"
+        if stem == "page":
+            return "page"
+    return "component"
+
+
+def _complexity(text: str) -> int:
+    """Rough count of the constructs that make a component take more model turns."""
+    return (
+        3 * len(_HOOK_RE.findall(text))
+        + 5 * len(_DATA_RE.findall(text))
+        + len(_IMPORT_RE.findall(text))
+        + len(_JSX_TAG_RE.findall(text)) // 5
+        + len(_BRANCH_RE.findall(text)) // 3
+    )
+
+
+def scan_project(root: str, inspect: bool = True) -> ProjectScan:
+    """Statically scan a Next.js source tree.
+
+    Args:
+        root: Path to the Next.js project.
+        inspect: Read script files to rate their complexity and try the
+            codemod on them. Without it only file kinds and sizes are
+            collected, from `stat`, and every script counts as a Developer run.
+
+    Returns:
+        A ProjectScan; empty if `root` does not exist.
+    """
+    from app.codemod import UnsupportedComponent, convert_component
+
+    scan = ProjectScan(root=str(root))
+    root_path = Path(root)
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            rel_path = path.relative_to(root_path).as_posix()
+            kind = _classify(rel_path)
+            if not inspect:
+                try:
+                    scan.files.append(SourceFile(rel_path, kind, path.stat().st_size))
+                except OSError:
+                    pass
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue  # Binary assets are copied, not converted
+            entry = SourceFile(rel_path, kind, len(text.encode("utf-8")))
+            if kind in ("page", "component", "api"):
+                entry.complexity = _complexity(text)
+                if path.suffix in (".js", ".jsx"):
+                    try:
+                        convert_component(text)
+                        entry.codemod = True
+                    except UnsupportedComponent:
+                        pass
+            scan.files.append(entry)
+    return scan
+
+
+def _agent_run(turns: int, context: int, output: int, profile: ProviderProfile) -> StageEstimate:
+    """Estimate one agent run: every turn resends the system context plus the growing history."""
+    input_tokens = turns * AGENT_CONTEXT_TOKENS + turns * context + (turns - 1) * output // 2
+    seconds = turns * (profile.request_latency + TOOL_SECONDS_PER_TURN) + output / profile.output_tokens_per_second
+    return StageEstimate(turns, input_tokens, output, seconds)
+
+
+def estimate_migration(
+    scan: ProjectScan, provider: str, concurrency: int = 4, calibrate: bool = True
+) -> Estimate:
+    """Estimate tokens, dollars and wall time of migrating a scanned project.
+
+    Args:
+        scan: Result of `scan_project`.
+        provider: Provider key from `SUPPORTED_PROVIDERS`.
+        concurrency: Developer workers, as passed to `migrate`.
+        calibrate: Apply correction factors learned from completed sessions.
+
+    Returns:
+        The Estimate.
+    """
+    profile = PROVIDER_PROFILES.get(provider, PROVIDER_PROFILES["mistral"])
+    convertible = [f for f in scan.files if f.kind in ("page", "component", "api", "style", "config")]
+    llm_files = [f for f in convertible if not f.codemod]
+
+    # Analysis reads the routes, configs and a sample of components
+    analysis = _agent_run(
+        5 + scan.routes // 5, min(scan.tokens, ANALYSIS_READ_CAP) // 2, ANALYSIS_REPORT_TOKENS, profile
+    )
+    plan = _agent_run(1, ANALYSIS_REPORT_TOKENS, 200 + PLAN_TOKENS_PER_FILE * len(convertible), profile)
+    setup = _agent_run(4, 500, 500, profile).add(_agent_run(3, 1000, 800, profile))
+
+    develop, longest = StageEstimate(), 0.0
+    for f in llm_files:
+        turns = min(3 + f.complexity // 5, 12)
+        run = _agent_run(turns, f.tokens, int(f.tokens * 1.2) + 150 * turns, profile)
+        develop = develop.add(run)
+        longest = max(longest, run.seconds)
+
+    validation = _agent_run(4 + len(convertible) // 10, VALIDATION_TOKENS_PER_TURN, 300 * 4, profile)
+
+    total = analysis.add(plan).add(setup).add(develop).add(validation)
+    # Files are converted in parallel while the plan streams in
+    workers = max(1, concurrency)
+    develop_wall = max(develop.seconds / workers, longest) if llm_files else 0.0
+    seconds = analysis.seconds + max(plan.seconds, setup.seconds) + develop_wall + validation.seconds
+
+    input_tokens, output_tokens = total.input_tokens, total.output_tokens
+    runs = 0
+    if calibrate:
+        token_factor, time_factor, runs = calibration(provider)
+        input_tokens, output_tokens = int(input_tokens * token_factor), int(output_tokens * token_factor)
+        seconds *= time_factor
+
+    cost = input_tokens / 1e6 * profile.input_per_mtok + output_tokens / 1e6 * profile.output_per_mtok
+    return Estimate(provider, workers, total.requests, input_tokens, output_tokens, cost, seconds, runs)
+
+
+def calibration(provider: str, sessions_dir: Optional[Path] = None) -> tuple[float, float, int]:
+    """Derive correction factors from completed sessions of a provider.
+
+    Returns:
+        (token factor, time factor, number of sessions used); (1.0, 1.0, 0) without history.
+    """
+    root = Path(sessions_dir or checkpoints.SESSIONS_DIR)
+    token_ratios, time_ratios = [], []
+    for manifest_path in root.glob("*/manifest.json"):
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        estimate, usage = manifest.get("estimate"), manifest.get("usage")
+        if manifest.get("stage") != "complete" or not estimate or not usage:
+            continue
+        if estimate.get("provider") != provider:
+            continue
+        estimated_tokens = estimate["input_tokens"] + estimate["output_tokens"]
+        actual_tokens = usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+        if estimated_tokens and actual_tokens:
+            token_ratios.append(actual_tokens / estimated_tokens)
+        if estimate.get("seconds") and usage.get("seconds"):
+            time_ratios.append(usage["seconds"] / estimate["seconds"])
+
+    if not token_ratios:
+        return 1.0, 1.0, 0
+    time_factor = statistics.median(time_ratios) if time_ratios else 1.0
+    return statistics.median(token_ratios), time_factor, len(token_ratios)
+
+
+def format_tokens(count: int) -> str:
+    """Human-readable token count."""
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M"
+    if count >= 1_000:
+        return f"{count / 1_000:.0f}k"
+    return str(count)
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration."""
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} h"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds:.0f} s"
@@ -0,0 +1,371 @@
+"""Bounded reads of large source files for the agents.
+
+Generated GraphQL types, JSON fixtures, minified bundles and data modules can
+be megabytes long; reading one whole puts all of it into memory and into the
+prompt. `FileReadTools` serves files through `mmap` instead, so only the
+requested part is ever copied out of the page cache:
+
+- `read_file`: numbered line windows; files over `PAGE_THRESHOLD_BYTES`
+  open with a summary instead of their first lines
+- `read_bytes`: byte windows, for minified files with very long lines
+- `file_summary`: size, line count, head and tail
+- `file_outline`: top-level declarations of JS/TS files, or the key/array
+  structure of JSON files (scanned without parsing the whole document)
+
+Every response is capped at `MAX_WINDOW_BYTES` and long lines are cut at
+`MAX_LINE_CHARS`, so context use is bounded however large a file is.
+"""
+
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from agno.tools import Toolkit
+
+from app.search import extract_symbols
+
+PAGE_THRESHOLD_BYTES = 256 * 1024
+MAX_WINDOW_BYTES = 48 * 1024
+DEFAULT_WINDOW_LINES = 200
+MAX_WINDOW_LINES = 1000
+MAX_LINE_CHARS = 1000
+MAX_OUTLINE_ENTRIES = 200
+OUTLINE_DEPTH = 3
+OUTLINE_SCAN_BYTES = 64 * 1024 * 1024
+LINE_INDEX_STEP = 1024  # Remember the offset of every Nth line between calls
+
+_COUNT_CHUNK = 1024 * 1024
+_SCRIPT_SUFFIXES = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".mts", ".cts", ".vue"}
+_JSON_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:,]|-?\d[\d.eE+-]*|true|false|null')
+
+
+def format_size(size: float) -> str:
+    """Human-readable byte count."""
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _numbered(start: int, lines: list[str]) -> str:
+    return "\n".join(f"{n:>6}: {line}" for n, line in enumerate(lines, start))
+
+
+class MappedFile:
+    """Read-only memory map of one file with a sparse line index."""
+
+    def __init__(self, path: Path, line_offsets: Optional[list[int]] = None):
+        """
+        Map a file.
+
+        Args:
+            path: The file.
+            line_offsets: Known offsets of lines 1, 1 + LINE_INDEX_STEP, ... (extended in place).
+        """
+        self.size = path.stat().st_size
+        self.line_offsets = line_offsets or [0]
+        self._lines: Optional[int] = None
+        with open(path, "rb") as f:
+            # Empty files cannot be mapped; the map stays valid after the file is closed
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def is_binary(self) -> bool:
+        return b"\0" in self.data[:8192]
+
+    def count_lines(self) -> int:
+        """Number of lines, counted in fixed-size chunks."""
+        if self._lines is None:
+            newlines = sum(self.data[i:i + _COUNT_CHUNK].count(b"\n") for i in range(0, self.size, _COUNT_CHUNK))
+            open_end = self.size > 0 and self.data[self.size - 1:] != b"\n"
+            self._lines = newlines + open_end
+        return self._lines
+
+    def line_offset(self, line: int) -> Optional[int]:
+        """Byte offset where a 1-based line starts, or None past the end."""
+        slot = min((line - 1) // LINE_INDEX_STEP, len(self.line_offsets) - 1)
+        offset, current = self.line_offsets[slot], slot * LINE_INDEX_STEP + 1
+        while current < line:
+            newline = self.data.find(b"\n", offset)
+            if newline == -1:
+                return None
+            offset, current = newline + 1, current + 1
+            index, remainder = divmod(current - 1, LINE_INDEX_STEP)
+            if remainder == 0 and index == len(self.line_offsets):
+                self.line_offsets.append(offset)
+        return offset if offset < self.size else None
+
+    def lines_from(self, offset: int, limit: int, budget: int) -> tuple[list[str], int]:
+        """Up to `limit` lines from `offset`, stopping before `budget` characters of output.
+
+        Lines longer than `MAX_LINE_CHARS` are cut, and no more than a few times
+        that is ever copied out of the map.
+
+        Returns:
+            The lines and the offset after the last one.
+        """
+        lines, used = [], 0
+        while len(lines) < limit and offset < self.size:
+            newline = self.data.find(b"\n", offset)
+            end = self.size if newline == -1 else newline
+            raw = self.data[offset:min(end, offset + 4 * MAX_LINE_CHARS)]
+            text = _decode(raw).rstrip("\r")
+            if end - offset > len(raw) or len(text) > MAX_LINE_CHARS:
+                text = f"{text[:MAX_LINE_CHARS]} … [line is {end - offset} bytes; use read_bytes offset={offset}]"
+            if lines and used + len(text) > budget:
+                break
+            lines.append(text)
+            used += len(text) + 1
+            offset = end + 1
+        return lines, offset
+
+    def tail(self, count: int) -> tuple[int, list[str]]:
+        """The last `count` lines and the line number of the first of them."""
+        end = self.size - 1 if self.data[self.size - 1:] == b"\n" else self.size
+        position = end
+        for _ in range(count):
+            position = self.data.rfind(b"\n", 0, position)
+            if position == -1:
+                break
+        lines, _ = self.lines_from(position + 1, count, MAX_WINDOW_BYTES // 2)
+        first = 1 if position == -1 else self.count_lines() - count + 1
+        return first, lines
+
+
+def outline_script(mapped: MappedFile) -> list[str]:
+    """Top-level declarations of a JS/TS/Vue file as `line: kind name` entries."""
+    entries, offset, line = [], 0, 1
+    while offset < mapped.size and len(entries) <= MAX_OUTLINE_ENTRIES:
+        newline = mapped.data.find(b"\n", offset)
+        end = mapped.size if newline == -1 else newline
+        # Indented lines are nested; very long lines are minified code
+        if end - offset <= MAX_LINE_CHARS and mapped.data[offset:offset + 1] not in (b" ", b"\t"):
+            for name, kind, _ in extract_symbols(_decode(mapped.data[offset:end])):
+                entries.append(f"{line}: {kind} {name}")
+        offset, line = end + 1, line + 1
+    return entries
+
+
+def outline_json(mapped: MappedFile) -> list[str]:
+    """Nested keys, value kinds and sizes of a JSON document as `line: ...` entries.
+
+    Tokens are scanned without building the document, down to
+    `OUTLINE_DEPTH` levels and over at most `OUTLINE_SCAN_BYTES`.
+    """
+    entries: list[list] = []  # [depth, label, kind, size, line]
+    stack: list[dict] = []
+    key: Optional[str] = None
+    last_string = b'""'
+    line, counted_to = 1, 0
+    limit = min(mapped.size, OUTLINE_SCAN_BYTES)
+    for match in _JSON_TOKEN_RE.finditer(mapped.data, 0, limit):
+        token = match.group()
+        if token in (b"{", b"["):
+            parent = stack[-1] if stack else None
+            # Only the first item of an array is outlined; the rest share its shape
+            shown = parent is None or (parent["shown"] and (parent["object"] or parent["commas"] == 0))
+            if parent:
+                parent["empty"] = False
+            entry = None
+            if shown and len(stack) < OUTLINE_DEPTH and len(entries) < MAX_OUTLINE_ENTRIES:
+                line += mapped.data[counted_to:match.start()].count(b"\n")
+                counted_to = match.start()
+                label = key if key is not None else ("(root)" if not stack else "[item]")
+                entry = [len(stack), label, "object" if token == b"{" else "array", 0, line]
+                entries.append(entry)
+            stack.append({"entry": entry, "object": token == b"{", "shown": shown, "commas": 0, "empty": True})
+            key = None
+        elif token in (b"}", b"]"):
+            if stack:
+                closed = stack.pop()
+                if closed["entry"] is not None:
+                    closed["entry"][3] = 0 if closed["empty"] else closed["commas"] + 1
+        elif token == b":":
+            key = _decode(last_string[1:-1])
+        elif token == b",":
+            if stack:
+                stack[-1]["commas"] += 1
+            key = None
+        else:
+            last_string = token
+            if stack:
+                stack[-1]["empty"] = False
+
+    lines = []
+    for depth, label, kind, size, at in entries:
+        unit = "keys" if kind == "object" else "items"
+        lines.append(f"{at}: {'  ' * depth}{label}: {kind} ({size} {unit})")
+    if limit < mapped.size:
+        lines.append(f"(outline covers the first {format_size(limit)})")
+    return lines
+
+
+class FileReadTools(Toolkit):
+    """Agent toolkit for bounded, memory-mapped reads of source files of any size."""
+
+    def __init__(self, base_dir: str = ".", page_threshold: int = PAGE_THRESHOLD_BYTES, **kwargs):
+        """
+        Initialize the toolkit.
+
+        Args:
+            base_dir: Directory relative paths are resolved against.
+            page_threshold: Files larger than this open with a summary instead of their first lines.
+        """
+        self.base_dir = Path(base_dir)
+        self.page_threshold = page_threshold
+        self._line_indexes: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+        super().__init__(
+            name="file_reader",
+            tools=[self.read_file, self.read_bytes, self.file_summary, self.file_outline],
+            **kwargs,
+        )
+
+    @contextmanager
+    def _mapped(self, file_path: str):
+        """Yield the mapped file, or an error message if it cannot be read."""
+        path = self.base_dir / os.path.expanduser(file_path)
+        try:
+            stat = path.stat()
+            if not path.is_file():
+                raise IsADirectoryError(f"{file_path} is not a file")
+            # Line offsets found by earlier calls stay valid while the file is unchanged
+            key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                known = list(self._line_indexes.get(key, [0]))
+            mapped = MappedFile(path, known)
+        except (OSError, ValueError) as e:
+            yield f"Error: cannot read {file_path}: {e}"
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+            with self._lock:
+                if len(mapped.line_offsets) > len(self._line_indexes.get(key, [])):
+                    self._line_indexes[key] = mapped.line_offsets
+
+    def _summary(self, file_path: str, mapped: MappedFile, lines: int) -> str:
+        lines = max(1, min(lines, 50))
+        total = mapped.count_lines()
+        head, _ = mapped.lines_from(0, lines, MAX_WINDOW_BYTES // 2)
+        parts = [f"{file_path}: {format_size(mapped.size)}, {total} lines", "Head:", _numbered(1, head)]
+        if total > len(head):
+            first, tail = mapped.tail(min(lines, total - len(head)))
+            parts += ["Tail:", _numbered(first, tail)]
+        return "\n".join(parts)
+
+    def read_file(
+        self, file_path: str, start_line: Optional[int] = None, num_lines: int = DEFAULT_WINDOW_LINES
+    ) -> str:
+        """Read a window of lines from a file, with line numbers.
+
+        Large files (generated types, fixtures, bundles) open with a summary;
+        page through them with `start_line`, or find the part you need with
+        `file_outline` first.
+
+        Args:
+            file_path: File to read (absolute, or relative to the project directory).
+            start_line: First line to return (1-based). Defaults to the start of the file.
+            num_lines: Number of lines to return (default 200, at most 1000).
+
+        Returns:
+            The numbered lines and where to continue, or a summary for large files.
+        """
+        with self._mapped(file_path) as mapped:
+            if isinstance(mapped, str):
+                return mapped
+            if mapped.size == 0:
+                return f"{file_path} is empty."
+            if mapped.is_binary():
+                return f"{file_path} is binary ({format_size(mapped.size)}); use read_bytes to inspect it."
+            if start_line is None and mapped.size > self.page_threshold:
+                summary = self._summary(file_path, mapped, 10)
+                return f"{summary}\n\nThis file is large: page through it with start_line, or use file_outline."
+            start = max(1, start_line or 1)
+            offset = mapped.line_offset(start)
+            if offset is None:
+                return f"{file_path} has {mapped.count_lines()} lines; start_line {start} is past the end."
+            lines, end = mapped.lines_from(offset, max(1, min(num_lines, MAX_WINDOW_LINES)), MAX_WINDOW_BYTES)
+            last = start + len(lines) - 1
+            header = f"{file_path}: lines {start}-{last} of {mapped.count_lines()} ({format_size(mapped.size)})"
+            footer = f"\n… continue with start_line={last + 1}" if end < mapped.size else ""
+            return f"{header}\n{_numbered(start, lines)}{footer}"
+
+    def read_bytes(self, file_path: str, offset: int = 0, length: int = 4096) -> str:
+        """Read a byte range of a file, e.g. part of a minified bundle with very long lines.
+
+        Args:
+            file_path: File to read (absolute, or relative to the project directory).
+            offset: Byte offset to start at.
+            length: Number of bytes (default 4096, at most 49152).
+
+        Returns:
+            The bytes decoded as UTF-8 (invalid sequences replaced) and where to continue.
+        """
+        with self._mapped(file_path) as mapped:
+            if isinstance(mapped, str):
+                return mapped
+            start = max(0, min(offset, mapped.size))
+            end = min(mapped.size, start + max(1, min(length, MAX_WINDOW_BYTES)))
+            footer = f"\n… continue with offset={end}" if end < mapped.size else ""
+            return f"{file_path}: bytes {start}-{end} of {mapped.size}\n{_decode(mapped.data[start:end])}{footer}"
+
+    def file_summary(self, file_path: str, lines: int = 10) -> str:
+        """Show a file's size and line count with its first and last lines.
+
+        Args:
+            file_path: File to summarize (absolute, or relative to the project directory).
+            lines: Number of lines to show from each end (default 10, at most 50).
+
+        Returns:
+            Size, line count, head and tail.
+        """
+        with self._mapped(file_path) as mapped:
+            if isinstance(mapped, str):
+                return mapped
+            if mapped.size == 0:
+                return f"{file_path} is empty."
+            if mapped.is_binary():
+                return f"{file_path} is binary ({format_size(mapped.size)})."
+            return self._summary(file_path, mapped, lines)
+
+    def file_outline(self, file_path: str) -> str:
+        """List the structure of a file with line numbers, without reading it whole.
+
+        JS/TS/Vue files list their top-level declarations; JSON files list
+        their nested keys with value kinds and array lengths.
+
+        Args:
+            file_path: File to outline (absolute, or relative to the project directory).
+
+        Returns:
+            One `line: ...` entry per declaration or key.
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix != ".json" and suffix not in _SCRIPT_SUFFIXES:
+            return f"No outline for {suffix or 'extensionless'} files; use file_summary or read_file."
+        with self._mapped(file_path) as mapped:
+            if isinstance(mapped, str):
+                return mapped
+            entries = outline_json(mapped) if suffix == ".json" else outline_script(mapped)
+            if not entries:
+                return f"{file_path}: no top-level structure found ({format_size(mapped.size)})."
+            more = ""
+            if len(entries) > MAX_OUTLINE_ENTRIES:
+                entries = entries[:MAX_OUTLINE_ENTRIES]
+                more = "\n… more entries omitted; page with read_file"
+            return f"{file_path} ({format_size(mapped.size)}):\n" + "\n".join(entries) + more
@@ -0,0 +1,108 @@
+"""Process-wide, pooled HTTP clients for model providers.
+
+`get_model` builds a fresh model for every agent, worker and Team, and each
+model lazily creates its own provider SDK client on first use; Mistral and
+Gemini clients also open their own connection pools. A migration therefore
+repeats TLS handshakes and leaves idle sockets behind per agent.
+
+`share_clients` gives every model built for the same provider and API key
+the same SDK clients, and all of them send over one bounded pair of httpx
+clients (keep-alive, HTTP/2 for async requests when `h2` is installed). The
+pair is also installed as agno's default clients, so models that agno
+copies internally (which drops their SDK clients) reconnect through the
+same pool.
+"""
+
+import hashlib
+import importlib.util
+import threading
+from typing import Optional
+
+import httpx
+from agno.utils.http import set_default_async_client, set_default_sync_client
+
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_SECONDS = 120.0
+# HTTP/2 multiplexes concurrent requests over one connection; httpx needs `h2` for it.
+# Sync clients stay on HTTP/1.1: they are used from worker threads.
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Model attributes agno caches provider SDK clients in
+_CLIENT_ATTRS = ("client", "async_client", "mistral_client")
+
+_lock = threading.Lock()
+_http: Optional[tuple[httpx.Client, httpx.AsyncClient]] = None
+_sdk_clients: dict[tuple, dict] = {}
+
+
+def pool_limits() -> httpx.Limits:
+    """Connection pool bounds shared by every model HTTP client."""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_SECONDS,
+    )
+
+
+def http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the shared sync and async httpx clients, creating them on first use."""
+    global _http
+    with _lock:
+        if _http is None or _http[0].is_closed or _http[1].is_closed:
+            _http = (
+                httpx.Client(limits=pool_limits(), http2=False),
+                httpx.AsyncClient(limits=pool_limits(), http2=HTTP2),
+            )
+            set_default_sync_client(_http[0])
+            set_default_async_client(_http[1])
+        return _http
+
+
+def _transport_params(provider: str) -> dict:
+    """SDK client arguments that route a provider through the shared httpx clients.
+
+    OpenAI, Anthropic, Groq and DeepSeek models use agno's default clients,
+    which `http_clients` replaces; Mistral and Gemini take them explicitly.
+    """
+    sync_client, async_client = http_clients()
+    if provider == "mistral":
+        return {"client": sync_client, "async_client": async_client}
+    if provider == "google":
+        from google.genai.types import HttpOptions
+
+        return {"http_options": HttpOptions(httpx_client=sync_client, httpx_async_client=async_client)}
+    return {}
+
+
+def share_clients(model, provider: str):
+    """Give a model the SDK clients shared by all models of its provider and key.
+
+    Args:
+        model: A freshly built agno model.
+        provider: Provider key from `SUPPORTED_PROVIDERS`.
+
+    Returns:
+        The same model. Models whose client cannot be built yet (e.g. no API
+        key) are left to create theirs on first use.
+    """
+    if provider == "local":
+        return model  # Already pooled per endpoint set by `app.local_provider`
+    model.client_params = {**_transport_params(provider), **(model.client_params or {})}
+    fingerprint = hashlib.sha256((getattr(model, "api_key", None) or "").encode()).hexdigest()[:16]
+    key = (provider, type(model).__name__, fingerprint, str(getattr(model, "base_url", None) or ""))
+    with _lock:
+        shared = _sdk_clients.get(key)
+    if shared is None:
+        try:
+            model.get_client()
+            if hasattr(model, "get_async_client"):
+                model.get_async_client()
+        except Exception:
+            return model
+        shared = {attr: getattr(model, attr) for attr in _CLIENT_ATTRS if getattr(model, attr, None) is not None}
+        with _lock:
+            shared = _sdk_clients.setdefault(key, shared)
+    for attr, client in shared.items():
+        setattr(model, attr, client)
+    return model
@@ -0,0 +1,330 @@
+"""Self-hosted OpenAI-compatible inference servers (vLLM, llama.cpp, ...).
+
+The `local` provider talks to one or more endpoints that serve the OpenAI
+chat completions API. Requests go through an `EndpointPool`, plugged into
+the OpenAI client as an httpx transport, which:
+
+- **balances load**: each request goes to the healthy endpoint with the
+  lowest share of its capacity in use (ties go round-robin)
+- **limits concurrency**: an endpoint never has more than its
+  `max_concurrency` requests in flight; further requests wait for a slot
+- **checks health**: connection failures and 502/503/504 responses take an
+  endpoint out of rotation for `HEALTH_RETRY_SECONDS`, after which it gets
+  traffic again; a request that cannot connect is retried on the next
+  endpoint. `check_health` probes `GET <url>/models` on demand.
+
+Pools are shared process-wide per endpoint configuration, so every agent
+and worker counts against the same limits.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from agno.models.openai.like import OpenAILike
+from openai import AsyncOpenAI as AsyncOpenAIClient
+from openai import OpenAI as OpenAIClient
+
+from app.http_clients import HTTP2, pool_limits
+
+DEFAULT_MAX_CONCURRENCY = 8
+HEALTH_RETRY_SECONDS = 15.0
+HEALTH_TIMEOUT = 3.0
+# Placeholder origin of the OpenAI client; the pool rewrites it per request
+POOL_BASE_URL = "http://pixel-perfect-local-pool/v1"
+
+_UNHEALTHY_STATUS = {502, 503, 504}
+_WAIT_INTERVAL = 0.02
+
+
+@dataclass
+class Endpoint:
+    """One inference server and its live state."""
+
+    url: str
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    in_flight: int = 0
+    healthy: bool = True
+    retry_at: float = 0.0
+    failures: int = 0
+
+    @property
+    def load(self) -> float:
+        return self.in_flight / self.max_concurrency
+
+    def available(self, now: float) -> bool:
+        return self.healthy or now >= self.retry_at
+
+
+class NoEndpointError(httpx.ConnectError):
+    """Raised when no endpoint could take a request."""
+
+
+class EndpointPool:
+    """Load-balanced, concurrency-limited set of endpoints."""
+
+    def __init__(self, endpoints: list[Endpoint]):
+        """
+        Initialize the pool.
+
+        Args:
+            endpoints: The endpoints to balance over (at least one).
+        """
+        if not endpoints:
+            raise ValueError("A local endpoint pool needs at least one endpoint")
+        self.endpoints = endpoints
+        self._lock = threading.Condition()
+        self._turn = itertools.count()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _pick(self, exclude: set[str]) -> tuple[Optional[Endpoint], bool]:
+        """Reserve a slot on the best endpoint.
+
+        Returns:
+            The endpoint (or None if all usable ones are busy) and whether any
+            endpoint outside `exclude` is usable at all.
+        """
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.url not in exclude]
+        # With every endpoint marked down, keep trying them rather than failing outright
+        usable = [e for e in candidates if e.available(now)] or candidates
+        free = [e for e in usable if e.in_flight < e.max_concurrency]
+        if not free:
+            return None, bool(usable)
+        turn = next(self._turn)
+        best = min(free, key=lambda e: (e.load, (self.endpoints.index(e) - turn) % len(self.endpoints)))
+        best.in_flight += 1
+        return best, True
+
+    def acquire(self, exclude: set[str] = frozenset()) -> Endpoint:
+        """Reserve a slot, blocking until one is free."""
+        with self._lock:
+            while True:
+                endpoint, usable = self._pick(exclude)
+                if endpoint is not None:
+                    return endpoint
+                if not usable:
+                    raise NoEndpointError("No local endpoint could take the request")
+                self._lock.wait()
+
+    async def acquire_async(self, exclude: set[str] = frozenset()) -> Endpoint:
+        """Reserve a slot without blocking the event loop."""
+        while True:
+            with self._lock:
+                endpoint, usable = self._pick(exclude)
+            if endpoint is not None:
+                return endpoint
+            if not usable:
+                raise NoEndpointError("No local endpoint could take the request")
+            await asyncio.sleep(_WAIT_INTERVAL)
+
+    def release(self, endpoint: Endpoint, ok: bool = True):
+        """Free a slot and record whether the endpoint answered properly."""
+        with self._lock:
+            endpoint.in_flight -= 1
+            self._mark(endpoint, ok)
+            self._lock.notify_all()
+
+    def _mark(self, endpoint: Endpoint, ok: bool):
+        if ok:
+            endpoint.healthy, endpoint.failures = True, 0
+        else:
+            endpoint.healthy = False
+            endpoint.failures += 1
+            endpoint.retry_at = time.monotonic() + HEALTH_RETRY_SECONDS
+
+    def check_health(self, timeout: float = HEALTH_TIMEOUT) -> dict[str, bool]:
+        """Probe every endpoint's `/models` route concurrently and update its state.
+
+        Returns:
+            Endpoint URL to whether it answered.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+            results = list(executor.map(lambda e: probe(e.url, timeout), self.endpoints))
+        with self._lock:
+            for endpoint, ok in zip(self.endpoints, results):
+                self._mark(endpoint, ok)
+            self._lock.notify_all()
+        return {endpoint.url: ok for endpoint, ok in zip(self.endpoints, results)}
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None or self._sync_client.is_closed:
+            self._sync_client = httpx.Client(transport=PoolTransport(self), timeout=None)
+        return self._sync_client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(transport=AsyncPoolTransport(self), timeout=None)
+        return self._async_client
+
+
+def probe(url: str, timeout: float = HEALTH_TIMEOUT) -> bool:
+    """Return True if an OpenAI-compatible server answers `GET <url>/models`."""
+    try:
+        return httpx.get(url.rstrip("/") + "/models", timeout=timeout).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+def _pool_path(request: httpx.Request) -> str:
+    """Path of a request relative to `POOL_BASE_URL` (e.g. `/chat/completions`)."""
+    return request.url.path[len(httpx.URL(POOL_BASE_URL).path.rstrip("/")):]
+
+
+def _route(request: httpx.Request, endpoint: Endpoint, path: str):
+    """Point a request at an endpoint."""
+    target = httpx.URL(endpoint.url.rstrip("/"))
+    request.url = target.copy_with(path=target.path.rstrip("/") + path, query=request.url.query or None)
+    request.headers["Host"] = target.netloc.decode("ascii")
+
+
+class _ReleasingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body that frees the endpoint slot once it is consumed or closed."""
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def _done(self):
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._done()
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+def _wrap(response: httpx.Response, release) -> httpx.Response:
+    return httpx.Response(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=_ReleasingStream(response.stream, release),
+        extensions=response.extensions,
+    )
+
+
+class PoolTransport(httpx.BaseTransport):
+    """Sync httpx transport that sends each request to an endpoint of the pool."""
+
+    def __init__(self, pool: EndpointPool):
+        self.pool = pool
+        self.inner = httpx.HTTPTransport(limits=pool_limits())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        tried: set[str] = set()
+        path = _pool_path(request)
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            _route(request, endpoint, path)
+            try:
+                response = self.inner.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                self.pool.release(endpoint, ok=False)
+                tried.add(endpoint.url)
+                continue  # `acquire` raises once every endpoint has been tried
+            except BaseException:
+                self.pool.release(endpoint)  # Timed out or interrupted: not a health signal
+                raise
+            ok = response.status_code not in _UNHEALTHY_STATUS
+            return _wrap(response, lambda: self.pool.release(endpoint, ok))
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncPoolTransport(httpx.AsyncBaseTransport):
+    """Async httpx transport that sends each request to an endpoint of the pool."""
+
+    def __init__(self, pool: EndpointPool):
+        self.pool = pool
+        self.inner = httpx.AsyncHTTPTransport(limits=pool_limits(), http2=HTTP2)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tried: set[str] = set()
+        path = _pool_path(request)
+        while True:
+            endpoint = await self.pool.acquire_async(exclude=tried)
+            _route(request, endpoint, path)
+            try:
+                response = await self.inner.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                self.pool.release(endpoint, ok=False)
+                tried.add(endpoint.url)
+                continue
+            except BaseException:
+                self.pool.release(endpoint)
+                raise
+            ok = response.status_code not in _UNHEALTHY_STATUS
+            return _wrap(response, lambda: self.pool.release(endpoint, ok))
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+_pools: dict[tuple, EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(endpoints: Optional[list[dict]] = None) -> EndpointPool:
+    """Return the process-wide pool for an endpoint configuration.
+
+    Args:
+        endpoints: `{"url", "max_concurrency"}` dicts; defaults to the CLI config.
+    """
+    if endpoints is None:
+        from app.cli_config import get_endpoints
+
+        endpoints = get_endpoints()
+    key = tuple((e["url"], e.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)) for e in endpoints)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = EndpointPool([Endpoint(url, max_concurrency) for url, max_concurrency in key])
+        return _pools[key]
+
+
+@dataclass
+class LocalOpenAI(OpenAILike):
+    """OpenAI-compatible model served by the local endpoint pool."""
+
+    id: str = "local-model"
+    name: str = "Local"
+    provider: str = "Local"
+    base_url: Optional[str] = POOL_BASE_URL
+    # `None` uses the configured endpoints
+    endpoints: Optional[list[dict]] = None
+
+    def get_client(self) -> OpenAIClient:
+        if self.client is None or self.client.is_closed():
+            params = self._get_client_params()
+            self.client = OpenAIClient(**params, http_client=get_pool(self.endpoints).sync_client)
+        return self.client
+
+    def get_async_client(self) -> AsyncOpenAIClient:
+        if self.async_client is None or self.async_client.is_closed():
+            params = self._get_client_params()
+            self.async_client = AsyncOpenAIClient(**params, http_client=get_pool(self.endpoints).async_client)
+        return self.async_client
@@ -13,9 +13,8 @@ import cli2
 # Ensure app package is importable when run directly
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.team import get_migration_team, get_migration_team_with_mcp
 from app.tools import run_shell_command
-from app import cli_config
+from app import cli_config, profiling
 
 
 # Create CLI group
@@ -28,10 +27,17 @@ analysis, planning, and code generation.
 Commands:
   migrate        - Migrate a Next.js app to Nuxt.js
   analyze        - Analyze a Next.js project
+  estimate       - Estimate tokens, cost and time of a migration
+  index          - Build the local code search index
+  session-vacuum - Shrink the session database (retention + compaction)
+  serve          - Run the background daemon (keeps agents warm)
+  serve-stop     - Stop the background daemon
   config-show    - Show current configuration
   config-provider - Set AI provider
   config-key     - Add API key
   config-model   - Set model
+  config-endpoint - Add a local OpenAI-compatible endpoint
+  config-endpoints - Check (or clear) local endpoints
   version        - Show version info
 """)
 
@@ -52,6 +58,11 @@ def config_show():
             print(f"  {provider}: {', '.join(keys)}")
     if not any(cfg['api_keys'].values()):
         print("  (none configured)")
+    if cfg['endpoints']:
+        print()
+        print("Local endpoints:")
+        for endpoint in cfg['endpoints']:
+            print(f"  {endpoint['url']} (max {endpoint['max_concurrency']} concurrent)")
     print()
     print("Supported providers:", ", ".join(cli_config.SUPPORTED_PROVIDERS.keys()))
 
@@ -61,7 +72,7 @@ def config_provider(provider: str):
     """
     Set the AI provider to use.
 
-    :param provider: Provider name (mistral, openai, anthropic, google, groq, deepseek)
+    :param provider: Provider name (mistral, openai, anthropic, google, groq, deepseek, local)
     """
     if cli_config.set_provider(provider):
         print(f"✓ Provider set to: {provider}")
@@ -116,6 +127,40 @@ def config_model(model: str, provider: str = None):
     print(f"✓ Model for {provider} set to: {model}")
 
 
+@cli.cmd(name="config-endpoint")
+def config_endpoint(url: str, max_concurrency: int = 8):
+    """
+    Add an OpenAI-compatible endpoint (vLLM, llama.cpp, ...) for the local provider.
+
+    Requests are balanced across all endpoints.
+
+    :param url: Base URL of the OpenAI API, e.g. http://gpu-1:8000/v1
+    :param max_concurrency: Maximum requests in flight on this endpoint (default: 8)
+    """
+    cli_config.add_endpoint(url, max_concurrency)
+    print(f"✓ Endpoint added: {url} (max {max_concurrency} concurrent)")
+    if cli_config.get_provider() != "local":
+        print("  Use it with: pixel-perfect config-provider local")
+
+
+@cli.cmd(name="config-endpoints")
+def config_endpoints(clear: bool = False):
+    """
+    Check the health of the local provider's endpoints.
+
+    :param clear: Remove all configured endpoints instead
+    """
+    if clear:
+        cli_config.clear_endpoints()
+        print("✓ Cleared all local endpoints")
+        return
+
+    from app.local_provider import get_pool
+
+    for url, ok in get_pool().check_health().items():
+        print(f"  {'✓' if ok else '✗'} {url}")
+
+
 # --- Session Commands ---
 
 @cli.cmd(name="session-list")
@@ -169,10 +214,38 @@ def session_list():
         print("Note: If this is a new installation, no sessions may exist yet.")
 
 
+@cli.cmd(name="session-vacuum")
+def session_vacuum(days: float = None):
+    """
+    Shrink the session database.
+
+    Moves large inline payloads of older sessions into the compressed blob
+    store, deletes blobs no session references and compacts storage.db.
+
+    :param days: Also delete sessions not updated for this many days
+    """
+    from app.cli_config import CONFIG_DIR
+    from app.config import get_database
+    from app.storage import vacuum
+
+    if not (CONFIG_DIR / "storage.db").exists():
+        print("No sessions found (database does not exist).")
+        return
+
+    stats = vacuum(get_database(), older_than_days=days)
+    if days is not None:
+        print(f"✓ Deleted {stats['sessions_deleted']} sessions older than {days:g} days")
+    print(f"✓ Compacted {stats['sessions_compacted']} sessions, removed {stats['blobs_deleted']} unused blobs")
+    print(f"  storage.db: {stats['bytes_before'] / 1e6:.1f} MB → {stats['bytes_after'] / 1e6:.1f} MB")
+
+
 @cli.cmd(name="session-resume")
 def session_resume(session_id: str, repo: str, output: str):
     """
     Resume a specific session. Requires repo and output paths context.
+
+    Completed stages (analysis, plan, finished files) are loaded from the
+    session checkpoints; work restarts at the first unfinished file.
     
     :param session_id: The Session ID to resume
     :param repo: Original repo path/URL
@@ -183,48 +256,102 @@ def session_resume(session_id: str, repo: str, output: str):
 
 # --- Migration Commands ---
 
-async def _migrate_with_mcp(source_path: str, output_dir: str, session_id: str = None):
-    """Run migration with Nuxt MCP for accurate code generation."""
-    team, nuxt_mcp = await get_migration_team_with_mcp(base_dir=os.getcwd(), session_id=session_id)
+async def _team_chat(session_id: str, use_mcp: bool = True):
+    """Open the interactive team chat for a session."""
+    from app.team import get_migration_team, get_migration_team_with_mcp
 
-    prompt = f"""
-    I want to migrate the Next.js application located at '{source_path}' to a Nuxt.js application at '{output_dir}'.
-    
-    Please follow this process:
-    1. Analyzer: List and analyze the files in '{source_path}'.
-    2. Architect: Create a MigrationPlan for converting to Nuxt.js in '{output_dir}'.
-    3. Developer: Execute the plan and write the new files.
-       Use the Nuxt MCP tools to look up correct patterns and best practices.
-    """
-    
-    # If resuming, we might want to skip the prompt or change it?
-    # For now, if session_id is present, we still send the prompt but valid session context will be there.
-    # Actually, if resuming, user might just want to continue.
-    
-    input_text = prompt if not session_id else None
+    nuxt_mcp = None
+    if use_mcp:
+        team, nuxt_mcp = await get_migration_team_with_mcp(base_dir=os.getcwd(), session_id=session_id)
+    else:
+        team = get_migration_team(base_dir=os.getcwd(), session_id=session_id)
 
+    print(f"Resuming session: {session_id}")
     try:
-        # Use interactive CLI app for multi-turn conversation
-        if session_id:
-            print(f"Resuming session: {session_id}")
-            # When resuming, typically we don't send a massive prompt again, 
-            # we just enter the loop. But we need to connect first.
-            await team.acli_app(input=input_text, stream=True)
-        else:
-            await team.acli_app(input=prompt, stream=True)
+        await team.acli_app(input=None, stream=True)
     finally:
-        await nuxt_mcp.close()
+        if nuxt_mcp is not None:
+            await nuxt_mcp.close()
+
+
+async def _migrate(
+    source_path: str,
+    output_dir: str,
+    session_id: str,
+    use_mcp: bool,
+    analysis: str,
+    chat: bool,
+    concurrency: int,
+    codemod: bool,
+    resume_hint: str,
+):
+    """Run the staged pipeline and (optionally) the follow-up chat on one event loop."""
+    import uuid
+    from app.checkpoints import SessionCheckpoint
+    from app.pipeline import PipelineError, run_staged_migration
+
+    # Sessions created before checkpoints existed can only be resumed as a chat
+    if session_id and not SessionCheckpoint.exists(session_id):
+        await _team_chat(session_id, use_mcp)
+        return
+
+    session_id = session_id or str(uuid.uuid4())
+    print(f"Session ID: {session_id}")
+    if use_mcp:
+        print("Using Nuxt MCP for accurate code generation...")
+    try:
+        checkpoint = await run_staged_migration(
+            source_path,
+            output_dir,
+            session_id,
+            use_mcp=use_mcp,
+            analysis=analysis,
+            concurrency=concurrency,
+            codemod=codemod,
+        )
+    except PipelineError as e:
+        print(f"✗ {e}")
+        print(f"  Resume with: {resume_hint.format(session_id=session_id)}")
+        return
+    if checkpoint.stage != "complete":
+        print(f"  Resume with: {resume_hint.format(session_id=session_id)}")
+        return
+    if chat:
+        print("Opening team chat for follow-up changes...")
+        await _team_chat(session_id, use_mcp)
 
 
 @cli.cmd
-def migrate(repo: str, output: str, mcp: bool = True, session_id: str = None):
+def migrate(
+    repo: str,
+    output: str,
+    mcp: bool = True,
+    session_id: str = None,
+    analysis: str = None,
+    chat: bool = True,
+    concurrency: int = 4,
+    codemod: bool = True,
+    daemon: bool = False,
+    profile: str = None,
+    cprofile: bool = False,
+):
     """
     Migrate a Next.js application to Nuxt.js.
 
+    Runs the checkpointed Analyzer -> Architect -> Developer pipeline, then
+    opens the team chat for follow-up changes.
+
     :param repo: GitHub repository URL or local path to the Next.js app
     :param output: Output directory for the generated Nuxt.js app
     :param mcp: Use Nuxt MCP for accurate code generation (default: True)
     :param session_id: Resume a previous session by ID
+    :param analysis: Reuse an analysis report written by `analyze` instead of re-analyzing
+    :param chat: Open the interactive team chat once the pipeline completes (default: True)
+    :param concurrency: Number of files the Developer converts in parallel (default: 4)
+    :param codemod: Convert simple React components without model calls (default: True)
+    :param daemon: Run the job on a running `pixel-perfect serve` daemon (non-interactive)
+    :param profile: Write a Chrome trace of the run to this path (view in Perfetto)
+    :param cprofile: With profile, also write a cProfile dump next to the trace
     """
     # Ensure output directory exists
     output_dir = os.path.abspath(output)
@@ -254,50 +381,221 @@ def migrate(repo: str, output: str, mcp: bool = True, session_id: str = None):
     print(f"Starting migration from {source_path} to {output_dir}...")
     print(f"Using provider: {cli_config.get_provider()}")
 
-    if mcp:
-        print("Using Nuxt MCP for accurate code generation...")
-        asyncio.run(_migrate_with_mcp(source_path, output_dir, session_id))
-    else:
-        # Sync version without MCP
-        team = get_migration_team(base_dir=os.getcwd(), session_id=session_id)
-        if session_id:
-            print(f"Resuming session: {session_id}")
-            team.cli_app(input=None, stream=True)
-        else:
-            prompt = f"""
-            I want to migrate the Next.js application located at '{source_path}' to a Nuxt.js application at '{output_dir}'.
-            
-            Please follow this process:
-            1. Analyzer: List and analyze the files in '{source_path}'.
-            2. Architect: Create a MigrationPlan for converting to Nuxt.js in '{output_dir}'.
-            3. Developer: Execute the plan and write the new files.
-            """
-            team.cli_app(input=prompt, stream=True)
+    analysis_path = os.path.abspath(analysis) if analysis else None
+    if analysis_path and not os.path.isfile(analysis_path):
+        print(f"Error: Analysis report '{analysis_path}' does not exist")
+        return
+
+    if daemon and profile:
+        print("Error: profile is not supported for daemon jobs")
+        return
+
+    if daemon:
+        _submit_to_daemon("migrate", {
+            "repo": source_path,
+            "output": output_dir,
+            "mcp": mcp,
+            "session_id": session_id,
+            "analysis": analysis_path,
+            "concurrency": concurrency,
+            "codemod": codemod,
+        })
+        return
+
+    report = open(analysis_path).read() if analysis_path else None
+    resume_hint = f"pixel-perfect session-resume {{session_id}} {repo} {output}"
+    with profiling.profile(profile, cprofile):
+        asyncio.run(
+            _migrate(source_path, output_dir, session_id, mcp, report, chat, concurrency, codemod, resume_hint)
+        )
 
 
 @cli.cmd
-def analyze(repo: str):
+def analyze(
+    repo: str,
+    report: str = "nextjs-analysis-report.md",
+    concurrency: int = 5,
+    daemon: bool = False,
+    profile: str = None,
+    cprofile: bool = False,
+):
     """
     Analyze a Next.js project structure without migrating.
 
+    The report is saved so `migrate ... analysis=<report>` can skip re-analysis.
+
     :param repo: Path to the Next.js application to analyze
+    :param report: Where to write the analysis report (default: nextjs-analysis-report.md)
+    :param concurrency: Maximum number of area Analyzers running at once (default: 5)
+    :param daemon: Run the job on a running `pixel-perfect serve` daemon
+    :param profile: Write a Chrome trace of the run to this path (view in Perfetto)
+    :param cprofile: With profile, also write a cProfile dump next to the trace
     """
-    from app.agents import create_analyzer_agent
-
     source_path = os.path.abspath(repo)
     if not os.path.exists(source_path):
         print(f"Error: Path '{source_path}' does not exist")
         return
 
     print(f"Analyzing {source_path}...")
-    
-    # Analyzer uses a separate DB or transient? 
-    # Usually single-shot, but we can make it persist if needed.
-    analyzer = create_analyzer_agent(base_dir=source_path)
-    analyzer.print_response(
-        f"Analyze the Next.js project at '{source_path}'. List all files, identify the framework version, dependencies, and key architectural patterns.",
-        stream=True
+
+    if daemon and profile:
+        print("Error: profile is not supported for daemon jobs")
+        return
+
+    if daemon:
+        _submit_to_daemon(
+            "analyze", {"repo": source_path, "report": os.path.abspath(report), "concurrency": concurrency}
+        )
+        return
+
+    with profiling.profile(profile, cprofile):
+        asyncio.run(_analyze(source_path, report, concurrency))
+
+
+async def _analyze(source_path: str, report: str, concurrency: int):
+    """Run the sharded Analyzers, print the merged report and save it."""
+    from app.agents import create_analyzer_agent
+    from app.analysis import AnalysisError, analyze_project
+    from app.prompt_cache import format_usage
+    from app.tool_cache import ToolCallCache
+
+    tool_cache = ToolCallCache()
+    try:
+        content, responses = await analyze_project(
+            source_path, lambda: create_analyzer_agent(base_dir=source_path, tool_cache=tool_cache), concurrency
+        )
+    except AnalysisError as e:
+        print(f"✗ {e}")
+        return
+    print()
+    print(content)
+
+    with open(report, "w") as f:
+        f.write(content)
+    print(f"✓ Analysis report saved to {report}")
+    metrics = [r.metrics for r in responses if getattr(r, "metrics", None) is not None]
+    if metrics:
+        keys = ("input_tokens", "output_tokens", "cache_read_tokens")
+        print(f"  Usage: {format_usage(*(sum(getattr(m, key, 0) or 0 for m in metrics) for key in keys))}")
+
+
+# --- Daemon Commands ---
+
+def _submit_to_daemon(command: str, args: dict):
+    """Send a job to the background daemon and stream its output."""
+    from app import daemon
+
+    try:
+        result = daemon.request({"command": command, "args": args}, on_event=daemon.print_event)
+    except daemon.DaemonError as e:
+        print(f"✗ {e}")
+        print("  Start one with: pixel-perfect serve")
+        return
+    print()
+    if not result.get("ok"):
+        print(f"✗ Job failed: {result.get('error')}")
+
+
+@cli.cmd
+def serve(max_jobs: int = 4, mcp: bool = True):
+    """
+    Run a long-lived daemon that keeps agno, Nuxt MCP and storage warm.
+
+    Jobs are submitted with `migrate ... daemon` or `analyze ... daemon`.
+
+    :param max_jobs: Maximum number of jobs to run concurrently
+    :param mcp: Keep a Nuxt MCP connection open for migrate jobs (default: True)
+    """
+    from app.daemon import SOCKET_PATH, DaemonError, MigrationDaemon
+
+    print(f"Starting pixel-perfect daemon on {SOCKET_PATH} (max {max_jobs} jobs)...")
+    try:
+        asyncio.run(MigrationDaemon(max_jobs=max_jobs, mcp=mcp).serve())
+    except DaemonError as e:
+        print(f"✗ {e}")
+    except KeyboardInterrupt:
+        print("Daemon stopped.")
+
+
+@cli.cmd(name="serve-stop")
+def serve_stop():
+    """Stop a running daemon."""
+    from app import daemon
+
+    try:
+        daemon.request({"command": "shutdown"})
+        print("✓ Daemon stopped")
+    except daemon.DaemonError as e:
+        print(f"✗ {e}")
+
+
+@cli.cmd
+def estimate(repo: str, provider: str = None, concurrency: int = 4, compare: bool = False):
+    """
+    Estimate tokens, cost and wall time of migrating a project, without model calls.
+
+    :param repo: Path to the Next.js application
+    :param provider: Provider to estimate for (default: the configured provider)
+    :param concurrency: Planned `migrate` concurrency (default: 4)
+    :param compare: Show the estimate for every supported provider
+    """
+    from app.estimate import PROVIDER_PROFILES, estimate_migration, format_duration, format_tokens, scan_project
+
+    source_path = os.path.abspath(repo)
+    if not os.path.isdir(source_path):
+        print(f"Error: Path '{source_path}' does not exist")
+        return
+
+    provider = provider or cli_config.get_provider()
+    if provider not in PROVIDER_PROFILES:
+        print(f"Error: No cost profile for provider '{provider}'")
+        print(f"Available: {', '.join(PROVIDER_PROFILES)}")
+        return
+
+    scan = scan_project(source_path)
+    codemod = sum(1 for f in scan.files if f.codemod)
+    print(f"Source: {source_path}")
+    print(
+        f"  Files: {len(scan.files)} ({scan.routes} routes, {scan.count('component')} components "
+        f"[{codemod} via codemod], {scan.count('api')} API, {scan.count('style')} styles, "
+        f"{scan.count('config')} config)"
     )
+    print(f"  Size: {scan.size / 1024:.0f} KB (~{format_tokens(scan.tokens)} tokens)")
+
+    providers = list(PROVIDER_PROFILES) if compare else [provider]
+    for name in providers:
+        result = estimate_migration(scan, name, concurrency)
+        print(f"\n{name} ({cli_config.get_model(name)}):")
+        print(
+            f"  Tokens: ~{format_tokens(result.input_tokens)} input / "
+            f"{format_tokens(result.output_tokens)} output ({result.requests} model requests)"
+        )
+        print(f"  Cost: ~${result.cost:.2f}")
+        print(f"  Wall time: ~{format_duration(result.seconds)} at concurrency {result.concurrency}")
+        if result.calibration_runs:
+            print(f"  Calibrated from {result.calibration_runs} completed sessions")
+        else:
+            print("  Uncalibrated (no completed sessions for this provider yet)")
+
+
+@cli.cmd
+def index(repo: str):
+    """
+    Build or refresh the local code search index for a project.
+
+    :param repo: Path to the project to index
+    """
+    from app.search import CodeIndex
+
+    source_path = os.path.abspath(repo)
+    if not os.path.isdir(source_path):
+        print(f"Error: Path '{source_path}' does not exist")
+        return
+
+    code_index = CodeIndex(source_path)
+    changed = code_index.refresh()
+    print(f"✓ Indexed {len(code_index.files)} files ({changed} updated)")
+    print(f"  Cache: {code_index.cache_path}")
 
 
 @cli.cmd
@@ -0,0 +1,499 @@
+"""Staged, resumable migration pipeline.
+
+Runs the migration as explicit stages instead of one free-form Team chat:
+
+1. **analysis** - one Analyzer per area of the source (routes, components,
+   styles, lib, config) runs concurrently and the reports are merged (or an
+   `analyze` report is imported)
+2. **plan** - the Architect streams a validated `MigrationPlan`; where each
+   file lands is precomputed by `app.routes` and enforced on the plan
+3. **develop** - planned files are migrated concurrently, one Developer run
+   per file; each file is dispatched as soon as its plan entry has streamed in,
+   while the project is scaffolded alongside planning
+4. **validate** - `nuxi typecheck` diagnostics are grouped by file and each
+   broken file is fixed by its own Developer run, concurrently, for up to
+   `MAX_FIX_ROUNDS` rounds
+
+Every stage result is checkpointed with `SessionCheckpoint`, so resuming a
+session skips finished stages and restarts at the first unfinished file.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from agno.run.base import RunStatus
+
+from app.agents import create_analyzer_agent, create_architect_agent
+from app.agents.developer import create_developer_agent, create_developer_agent_with_mcp, create_nuxt_mcp
+from app.analysis import AnalysisError, analyze_project
+from app.checkpoints import FILE_DONE, FILE_FAILED, SessionCheckpoint
+from app.cli_config import get_provider
+from app.codemod import convert_file, is_eligible
+from app.diagnostics import Diagnostic, excerpt, group_by_file, run_typecheck
+from app.estimate import estimate_migration, scan_project
+from app.plan_stream import PlanStreamParser
+from app.profiling import span
+from app.prompt_cache import format_usage
+from app.prompts import (
+    get_config_prompt,
+    get_file_migration_prompt,
+    get_fix_prompt,
+    get_plan_prompt,
+    get_scaffold_prompt,
+    get_validation_prompt,
+)
+from app.routes import build_route_table
+from app.schemas import MigrationPlan
+from app.tool_cache import ToolCallCache
+
+
+MAX_FIX_ROUNDS = 3
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline stage cannot produce a usable result."""
+
+
+def _check_response(response, stage: str):
+    """Raise if an agent run ended in an error state."""
+    if response is None or getattr(response, "status", None) == RunStatus.error:
+        content = getattr(response, "content", None)
+        raise PipelineError(f"{stage} failed: {content or 'no response'}")
+
+
+def _record_usage(checkpoint: SessionCheckpoint, response):
+    """Add a run's token metrics to the session usage."""
+    metrics = getattr(response, "metrics", None)
+    if metrics is not None:
+        checkpoint.add_usage(
+            input_tokens=getattr(metrics, "input_tokens", 0) or 0,
+            output_tokens=getattr(metrics, "output_tokens", 0) or 0,
+            cache_read_tokens=getattr(metrics, "cache_read_tokens", 0) or 0,
+            cache_write_tokens=getattr(metrics, "cache_write_tokens", 0) or 0,
+        )
+
+
+def parse_plan(content) -> MigrationPlan:
+    """Coerce an Architect response into a validated MigrationPlan.
+
+    Raises:
+        PipelineError: If the content is not a valid plan.
+    """
+    try:
+        if isinstance(content, MigrationPlan):
+            return content
+        if isinstance(content, dict):
+            return MigrationPlan.model_validate(content)
+        if isinstance(content, str):
+            return MigrationPlan.model_validate_json(content)
+    except ValueError as e:
+        raise PipelineError(f"Architect returned an invalid MigrationPlan: {e}")
+    raise PipelineError(f"Architect returned an unexpected plan type: {type(content).__name__}")
+
+
+async def run_staged_migration(
+    source_path: str,
+    output_dir: str,
+    session_id: str,
+    use_mcp: bool = True,
+    analysis: Optional[str] = None,
+    nuxt_mcp=None,
+    concurrency: int = 4,
+    codemod: bool = True,
+    log: Callable[[str], None] = print,
+) -> SessionCheckpoint:
+    """Run (or resume) a checkpointed migration.
+
+    Args:
+        source_path: Absolute path to the Next.js source.
+        output_dir: Absolute path of the Nuxt.js output directory.
+        session_id: Session ID used for checkpoints.
+        use_mcp: Give the Developer the Nuxt MCP tools.
+        analysis: Optional pre-computed analysis report (e.g. written by the `analyze` command).
+        nuxt_mcp: Optional already-connected Nuxt MCP client to reuse.
+        concurrency: Maximum number of files migrated in parallel.
+        codemod: Convert simple React components deterministically before falling back to the Developer.
+        log: Progress callback.
+
+    Returns:
+        The session checkpoint after the run.
+    """
+    checkpoint = SessionCheckpoint(session_id)
+    checkpoint.set_paths(source_path, output_dir)
+
+    # Snapshot the pre-flight estimate so completed sessions calibrate `estimate`;
+    # resumed sessions keep theirs, and sizes alone are enough for the snapshot
+    if "estimate" not in checkpoint.manifest:
+        scan = await asyncio.to_thread(scan_project, source_path, inspect=False)
+        estimate = estimate_migration(scan, get_provider(), concurrency, calibrate=False)
+        checkpoint.set_estimate(estimate.to_dict())
+
+    started = time.monotonic()
+    try:
+        return await _run_stages(
+            checkpoint, source_path, output_dir, use_mcp, analysis, nuxt_mcp, concurrency, codemod, log
+        )
+    finally:
+        checkpoint.add_usage(seconds=time.monotonic() - started)
+        usage = checkpoint.usage
+        log(f"✓ Session usage: {format_usage(usage['input_tokens'], usage['output_tokens'], usage['cache_read_tokens'])}")
+
+
+async def _run_stages(
+    checkpoint: SessionCheckpoint,
+    source_path: str,
+    output_dir: str,
+    use_mcp: bool,
+    analysis: Optional[str],
+    nuxt_mcp,
+    concurrency: int,
+    codemod: bool,
+    log: Callable[[str], None],
+) -> SessionCheckpoint:
+    """Run the stages that have not completed yet (see `run_staged_migration`)."""
+    tool_cache = ToolCallCache()
+
+    if analysis is not None and checkpoint.analysis is None:
+        checkpoint.save_analysis(analysis)
+        log("✓ Imported analysis report")
+
+    # Stage 1: analysis
+    if checkpoint.stage == "analysis":
+        log("[1/4] Analyzing source project...")
+        with span("stage analysis", "stage"):
+            try:
+                report, responses = await analyze_project(
+                    source_path,
+                    lambda: create_analyzer_agent(base_dir=source_path, tool_cache=tool_cache),
+                    concurrency,
+                    log,
+                )
+            except AnalysisError as e:
+                raise PipelineError(str(e)) from e
+        for response in responses:
+            _record_usage(checkpoint, response)
+        version = checkpoint.save_analysis(report)
+        log(f"✓ Analysis saved (v{version})")
+    else:
+        log("✓ Analysis: reusing checkpoint")
+
+    if checkpoint.stage not in ("plan", "develop", "validate"):
+        log("✓ Plan: reusing checkpoint")
+        return checkpoint
+
+    # Stages 2-4 need the Developer; workers share one MCP connection
+    owns_mcp = use_mcp and nuxt_mcp is None
+    if owns_mcp:
+        nuxt_mcp = create_nuxt_mcp()
+        await nuxt_mcp.connect()
+
+    try:
+        if checkpoint.stage == "develop":
+            log("✓ Plan: reusing checkpoint")
+            workers = max(1, min(concurrency, len(checkpoint.pending_files()) + 1))
+        else:
+            # The file count is unknown until the plan streams in (or validation reports errors)
+            if checkpoint.stage == "validate":
+                log("✓ Plan: reusing checkpoint")
+            workers = max(1, concurrency)
+        developers = [
+            await _create_developer(output_dir, tool_cache, use_mcp, nuxt_mcp) for _ in range(workers)
+        ]
+
+        # Stages 2-3: planning overlaps scaffolding and per-file development
+        if checkpoint.stage in ("plan", "develop"):
+            await _plan_and_develop(checkpoint, developers, source_path, output_dir, codemod, log)
+
+            failed = checkpoint.pending_files()
+            if failed or not checkpoint.config_applied:
+                unfinished = f"{len(failed)} files" if failed else "Config changes"
+                log(f"✗ {unfinished} did not finish; resume the session to retry.")
+                return checkpoint
+            checkpoint.set_stage("validate")
+
+        # Stage 4: validation
+        if checkpoint.stage == "validate":
+            log("[4/4] Validating output...")
+            with span("stage validate", "stage"):
+                await _validate(checkpoint, developers, output_dir, log)
+            checkpoint.set_stage("complete")
+            log("✓ Migration complete")
+    finally:
+        if owns_mcp:
+            await nuxt_mcp.close()
+
+    return checkpoint
+
+
+async def _create_developer(output_dir: str, tool_cache: ToolCallCache, use_mcp: bool, nuxt_mcp):
+    """Create one Developer worker."""
+    if use_mcp:
+        developer, _ = await create_developer_agent_with_mcp(output_dir, tool_cache=tool_cache, nuxt_mcp=nuxt_mcp)
+        return developer
+    return create_developer_agent(output_dir, tool_cache=tool_cache)
+
+
+async def _stream_plan(
+    checkpoint: SessionCheckpoint, architect, prompt: str, parser: PlanStreamParser, on_entry
+) -> MigrationPlan:
+    """Stream the Architect's plan, handing each completed file entry to `on_entry`.
+
+    Models that do not stream JSON text deltas (e.g. native structured output)
+    only deliver the plan at the end; the caller then dispatches it all at once.
+    """
+    plan = None
+    async for event in architect.arun(prompt, stream=True):
+        name = getattr(event, "event", None)
+        content = getattr(event, "content", None)
+        if name == "RunCompleted":
+            _record_usage(checkpoint, event)
+        if name == "RunError":
+            raise PipelineError(f"Planning failed: {content or 'no response'}")
+        if name == "RunContent" and isinstance(content, str):
+            for entry in parser.feed(content):
+                await on_entry(entry)
+        elif name in ("RunContent", "RunCompleted") and content is not None and not isinstance(content, str):
+            plan = parse_plan(content)
+
+    if plan is None:
+        try:
+            plan = parser.result()
+        except ValueError as e:
+            raise PipelineError(f"Architect returned an invalid MigrationPlan: {e}")
+    return plan
+
+
+def _log_plan_fixes(streamed: MigrationPlan, plan: MigrationPlan, log: Callable[[str], None]):
+    """Report what enforcing the route table changed in the Architect's plan."""
+    planned = {f.source_path for f in streamed.files_to_migrate}
+    kept = {f.source_path for f in plan.files_to_migrate}
+    dropped = sorted(planned - kept)
+    added = sorted(kept - planned)
+    if dropped:
+        log(f"  → Dropped {len(dropped)} planned files that do not exist: {', '.join(dropped)}")
+    if added:
+        log(f"  → Added {len(added)} files the plan missed: {', '.join(added)}")
+
+
+async def _plan_and_develop(
+    checkpoint: SessionCheckpoint,
+    developers: list,
+    source_path: str,
+    output_dir: str,
+    codemod: bool,
+    log: Callable[[str], None],
+):
+    """Plan and migrate files as a pipeline.
+
+    Developer workers pull from a queue that is filled while the Architect's
+    plan is still streaming, so the first files are converted before the
+    plan is finished. Scaffolding runs concurrently with planning; the plan's
+    config changes are queued once the full plan is validated. Eligible
+    files go through the codemod in a process pool first and only reach the
+    Developer queue if they are outside its supported subset.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    queued: set = set()
+    conversions: list = []
+    parser = PlanStreamParser()
+    # Spawn rather than fork: the event loop process already runs worker threads
+    pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) if codemod else None
+
+    async def enqueue(file):
+        if file.target_path in queued or checkpoint.file_status(file) == FILE_DONE:
+            return
+        queued.add(file.target_path)
+        if pool and is_eligible(file):
+            conversions.append(asyncio.ensure_future(convert(file)))
+        else:
+            queue.put_nowait(file)
+
+    async def convert(file):
+        try:
+            await scaffolding
+        except Exception:
+            return
+        with span(f"codemod {file.source_path}", "codemod"):
+            reason = await asyncio.get_running_loop().run_in_executor(
+                pool,
+                convert_file,
+                os.path.join(source_path, file.source_path),
+                os.path.join(output_dir, file.target_path),
+            )
+        if reason is None:
+            checkpoint.mark_file(file, FILE_DONE)
+            log(f"  ✓ {file.source_path} → {file.target_path} (codemod)")
+        else:
+            log(f"  → {file.source_path}: codemod skipped ({reason}), using Developer")
+            queue.put_nowait(file)
+
+    async def scaffold():
+        if checkpoint.scaffolded:
+            return
+        log("[3/4] Scaffolding output project...")
+        with span("stage scaffold", "stage"):
+            response = await developers[0].arun(get_scaffold_prompt(output_dir))
+        _record_usage(checkpoint, response)
+        _check_response(response, "Scaffolding")
+        checkpoint.mark_scaffolded()
+
+    async def produce():
+        try:
+            if checkpoint.stage == "plan":
+                log("[2/4] Planning migration (files are dispatched as they stream in)...")
+                table = await asyncio.to_thread(build_route_table, source_path)
+                architect = create_architect_agent()
+                routes = table.to_prompt() if table.entries else ""
+                prompt = get_plan_prompt(checkpoint.analysis, source_path, output_dir, routes)
+
+                async def enqueue_planned(file):
+                    # Streamed entries get the table's mapping before dispatch
+                    file = table.normalize(file)
+                    if file is not None:
+                        await enqueue(file)
+
+                with span("stage plan", "stage"):
+                    streamed = await _stream_plan(checkpoint, architect, prompt, parser, enqueue_planned)
+                plan = table.apply(streamed)
+                _log_plan_fixes(streamed, plan, log)
+                version = checkpoint.save_plan(plan)
+                log(f"✓ Plan saved (v{version}): {len(plan.files_to_migrate)} files")
+            else:
+                plan = checkpoint.plan
+                log(f"[3/4] Migrating {len(checkpoint.pending_files())} of {len(plan.files_to_migrate)} files...")
+            for file in checkpoint.pending_files():
+                await enqueue(file)
+            if not checkpoint.config_applied:
+                queue.put_nowait(plan.config_changes)
+        finally:
+            await asyncio.gather(*conversions, return_exceptions=True)
+            for _ in developers:
+                queue.put_nowait(None)
+
+    async def worker(developer):
+        try:
+            await scaffolding
+        except Exception:
+            return  # Reported below
+        while True:
+            task = await queue.get()
+            if task is None:
+                return
+            if isinstance(task, list):
+                await _apply_config(checkpoint, developer, task, output_dir, log)
+            else:
+                await _migrate_file(checkpoint, developer, task, parser, source_path, output_dir, log)
+
+    scaffolding = asyncio.ensure_future(scaffold())
+    try:
+        results = await asyncio.gather(
+            produce(), scaffolding, *(worker(d) for d in developers), return_exceptions=True
+        )
+    finally:
+        if pool:
+            pool.shutdown()
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+async def _validate(checkpoint: SessionCheckpoint, developers: list, output_dir: str, log: Callable[[str], None]):
+    """Typecheck the output and fix broken files in parallel until it is clean.
+
+    Falls back to a single Developer validation run when the typecheck cannot
+    be run here or its output has no per-file diagnostics.
+    """
+    for round_number in range(1, MAX_FIX_ROUNDS + 2):
+        with span("typecheck", "stage"):
+            result = await run_typecheck(output_dir)
+        if result is not None and result.ok:
+            log("✓ Typecheck passed")
+            return
+        groups = group_by_file(result.diagnostics) if result is not None else {}
+        if not groups:
+            response = await developers[0].arun(get_validation_prompt(output_dir))
+            _record_usage(checkpoint, response)
+            _check_response(response, "Validation")
+            return
+        errors = sum(len(group) for group in groups.values())
+        if round_number > MAX_FIX_ROUNDS:
+            log(f"✗ {errors} typecheck errors remain in {len(groups)} files after {MAX_FIX_ROUNDS} fix rounds")
+            return
+        log(f"  → fix round {round_number}: {errors} errors in {len(groups)} files")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in groups.items():
+            queue.put_nowait(item)
+
+        async def worker(developer):
+            while not queue.empty():
+                file_path, diagnostics = queue.get_nowait()
+                await _fix_file(checkpoint, developer, file_path, diagnostics, output_dir, log)
+
+        await asyncio.gather(*(worker(d) for d in developers[: len(groups)]))
+
+
+async def _fix_file(
+    checkpoint: SessionCheckpoint,
+    developer,
+    file_path: str,
+    diagnostics: list[Diagnostic],
+    output_dir: str,
+    log: Callable[[str], None],
+):
+    """Fix one file's typecheck errors with a single Developer run."""
+    try:
+        with open(os.path.join(output_dir, file_path), encoding="utf-8") as f:
+            source = excerpt(f.read(), diagnostics)
+    except (OSError, UnicodeDecodeError):
+        source = "(unreadable; open the file yourself)"
+    errors = "\n".join(f"- line {d.line}:{d.column} {d.code}: {d.message}" for d in diagnostics)
+    try:
+        with span(f"fix {file_path}", "file"):
+            response = await developer.arun(get_fix_prompt(output_dir, file_path, errors, source))
+        _record_usage(checkpoint, response)
+        _check_response(response, f"Fixing {file_path}")
+    except Exception as e:
+        log(f"  ✗ {file_path}: {e}")
+
+
+async def _apply_config(checkpoint: SessionCheckpoint, developer, config_changes: list, output_dir: str, log):
+    """Apply the plan's config changes; failures are left for the next resume."""
+    log("  → applying config changes")
+    try:
+        response = await developer.arun(get_config_prompt(output_dir, config_changes))
+        _record_usage(checkpoint, response)
+        _check_response(response, "Config changes")
+    except Exception as e:
+        log(f"  ✗ config changes: {e}")
+        return
+    checkpoint.mark_config_applied()
+
+
+async def _migrate_file(
+    checkpoint: SessionCheckpoint,
+    developer,
+    file,
+    parser: PlanStreamParser,
+    source_path: str,
+    output_dir: str,
+    log: Callable[[str], None],
+):
+    """Migrate one planned file with a single Developer run."""
+    # While the plan is streaming, the summary comes from the partial text
+    summary = parser.field("summary") if parser.buffer else checkpoint.plan.summary
+    log(f"  → {file.source_path} → {file.target_path}")
+    try:
+        with span(f"file {file.target_path}", "file"):
+            response = await developer.arun(get_file_migration_prompt(file, source_path, output_dir, summary))
+        _record_usage(checkpoint, response)
+        _check_response(response, f"Migrating {file.source_path}")
+    except Exception as e:
+        checkpoint.mark_file(file, FILE_FAILED, error=str(e))
+        log(f"  ✗ {file.target_path}: {e}")
+        return
+    checkpoint.mark_file(file, FILE_DONE)
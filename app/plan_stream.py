@@ -0,0 +1,123 @@
+"""Incremental parsing of a streamed MigrationPlan.
+
+The Architect emits its `MigrationPlan` as JSON. Instead of waiting for the
+whole document, `PlanStreamParser` scans the text as it arrives and yields
+each `files_to_migrate` entry as soon as its object is closed and validates
+as a `FileMigration`, so the Developer can start on it while the rest of the
+plan is still being generated.
+"""
+
+import json
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.schemas import FileMigration, MigrationPlan
+
+_FILES_KEY = '"files_to_migrate"'
+
+
+class PlanStreamParser:
+    """Feed JSON text chunks in, get completed FileMigration entries out."""
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self.buffer = ""
+        self.entries: list[FileMigration] = []
+        self._pos = 0  # Next unscanned index into buffer
+        self._in_array = False
+        self._array_done = False
+        self._depth = 0
+        self._object_start: Optional[int] = None
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> list[FileMigration]:
+        """Consume a chunk of streamed text.
+
+        Returns:
+            FileMigration entries completed by this chunk, in order.
+        """
+        self.buffer += chunk
+        if self._array_done:
+            return []
+
+        if not self._in_array:
+            key = self.buffer.find(_FILES_KEY)
+            if key == -1:
+                return []
+            bracket = self.buffer.find("[", key + len(_FILES_KEY))
+            if bracket == -1:
+                return []
+            self._in_array = True
+            self._pos = bracket + 1
+
+        completed = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = i
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    entry = self._parse_entry(buffer[self._object_start:i + 1])
+                    self._object_start = None
+                    if entry is not None:
+                        self.entries.append(entry)
+                        completed.append(entry)
+            elif char == "]" and self._depth == 0:
+                self._array_done = True
+                self._pos = i + 1
+                return completed
+
+        self._pos = len(buffer)
+        return completed
+
+    def field(self, name: str):
+        """Return a top-level scalar field once it has been fully streamed, else None."""
+        key = self.buffer.find(f'"{name}"')
+        if key == -1:
+            return None
+        colon = self.buffer.find(":", key)
+        if colon == -1:
+            return None
+        try:
+            value, _ = json.JSONDecoder().raw_decode(self.buffer[colon + 1:].lstrip())
+        except json.JSONDecodeError:
+            return None
+        return value
+
+    @staticmethod
+    def _parse_entry(text: str) -> Optional[FileMigration]:
+        """Validate one array element; malformed entries are left for final validation."""
+        try:
+            return FileMigration.model_validate(json.loads(text))
+        except (json.JSONDecodeError, ValidationError):
+            return None
+
+    def result(self) -> MigrationPlan:
+        """Validate the complete buffered document as a MigrationPlan.
+
+        Raises:
+            pydantic.ValidationError: If the text is not a valid plan.
+        """
+        text = self.buffer.strip()
+        # Tolerate models that wrap JSON in a markdown fence
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            text = text.rsplit("```", 1)[0]
+        return MigrationPlan.model_validate_json(text)
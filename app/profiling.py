@@ -0,0 +1,230 @@
+"""Timeline profiling of migration runs in Chrome trace event format.
+
+`profile()` installs a `Tracer` that wraps agno's Agent/Team runs, model
+requests and tool calls, plus the pipeline's own stage spans, and writes a
+Chrome trace JSON (open it in https://ui.perfetto.dev). Each asyncio task and
+worker thread gets its own lane, so concurrent file migrations and parallel
+tool calls show up side by side. Optionally a cProfile dump of the Python
+side is written next to the trace.
+"""
+
+import asyncio
+import cProfile
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional
+
+from app.tool_cache import READ_ONLY_TOOLS, SHELL_TOOLS, WRITE_TOOLS
+
+# The tracer of the run being profiled, if any
+_active: Optional["Tracer"] = None
+
+
+def span(name: str, cat: str = "app", **args):
+    """Record a span on the active tracer; a no-op when not profiling."""
+    if _active is None:
+        return nullcontext()
+    return _active.span(name, cat, **args)
+
+
+def _tool_category(name: str) -> str:
+    """Group tool spans by the kind of work they do."""
+    if name in SHELL_TOOLS:
+        return "tool.shell"
+    if name in READ_ONLY_TOOLS or name in WRITE_TOOLS:
+        return "tool.file"
+    return "tool"
+
+
+class Tracer:
+    """Collects complete ("X") trace events with one lane per task/thread."""
+
+    def __init__(self):
+        """Initialize an empty trace."""
+        self.events: list[dict] = []
+        self.pid = os.getpid()
+        self._start = time.perf_counter_ns()
+        self._lanes: dict = {}
+        self._lock = threading.Lock()
+        self._patches: list = []
+
+    def _now(self) -> float:
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter_ns() - self._start) / 1000
+
+    def _lane(self) -> int:
+        """Return the trace tid for the current asyncio task (or thread)."""
+        thread = threading.current_thread()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (thread.ident, id(task) if task else None)
+        with self._lock:
+            if key not in self._lanes:
+                tid = len(self._lanes) + 1
+                self._lanes[key] = tid
+                label = f"task {task.get_name()}" if task else thread.name
+                self.events.append(
+                    {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": label}}
+                )
+            return self._lanes[key]
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app", **args):
+        """Record the enclosed block as one complete event."""
+        tid = self._lane()
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": self._now() - start,
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+    # --- agno instrumentation ---
+
+    def _wrap(self, owner, attr: str, describe):
+        """Replace `owner.attr` with a version that records a span per call.
+
+        Args:
+            owner: Class to patch.
+            attr: Method name.
+            describe: Callable(self, *args, **kwargs) -> (name, cat, args dict).
+        """
+        original = getattr(owner, attr)
+        tracer = self
+
+        if inspect.isasyncgenfunction(original):
+            async def wrapper(obj, *args, **kwargs):
+                name, cat, span_args = describe(obj, *args, **kwargs)
+                with tracer.span(name, cat, **span_args):
+                    async for item in original(obj, *args, **kwargs):
+                        yield item
+        elif inspect.iscoroutinefunction(original):
+            async def wrapper(obj, *args, **kwargs):
+                name, cat, span_args = describe(obj, *args, **kwargs)
+                with tracer.span(name, cat, **span_args):
+                    return await original(obj, *args, **kwargs)
+        elif inspect.isgeneratorfunction(original):
+            def wrapper(obj, *args, **kwargs):
+                name, cat, span_args = describe(obj, *args, **kwargs)
+                with tracer.span(name, cat, **span_args):
+                    yield from original(obj, *args, **kwargs)
+        else:
+            def wrapper(obj, *args, **kwargs):
+                name, cat, span_args = describe(obj, *args, **kwargs)
+                with tracer.span(name, cat, **span_args):
+                    return original(obj, *args, **kwargs)
+
+        wrapper.__wrapped__ = original
+        setattr(owner, attr, wrapper)
+        self._patches.append((owner, attr, original))
+
+    def install(self):
+        """Instrument agno runs, model requests and tool calls."""
+        from agno.agent import Agent
+        from agno.models.base import Model
+        from agno.team import Team
+        from agno.tools.function import FunctionCall
+
+        def run(kind):
+            return lambda obj, *args, **kwargs: (f"{kind} {obj.name or kind}", kind, {})
+
+        for attr in ("_run", "_run_stream", "_arun", "_arun_stream"):
+            self._wrap(Agent, attr, run("agent"))
+            self._wrap(Team, attr, run("team"))
+
+        def model(obj, *args, **kwargs):
+            return f"model {obj.id}", "model", {"provider": obj.provider}
+
+        # Every provider's request goes through these retry wrappers
+        for attr in (
+            "_invoke_with_retry",
+            "_ainvoke_with_retry",
+            "_invoke_stream_with_retry",
+            "_ainvoke_stream_with_retry",
+        ):
+            self._wrap(Model, attr, model)
+
+        def tool(obj, *args, **kwargs):
+            arguments = json.dumps(obj.arguments or {}, default=str)
+            return f"tool {obj.function.name}", _tool_category(obj.function.name), {"arguments": arguments[:500]}
+
+        self._wrap(FunctionCall, "execute", tool)
+        self._wrap(FunctionCall, "aexecute", tool)
+
+    def uninstall(self):
+        """Restore the original agno methods."""
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches.clear()
+
+    # --- Output ---
+
+    def save(self, path: Path):
+        """Write the trace as Chrome trace event JSON."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self) -> dict:
+        """Total span seconds and counts by category."""
+        totals: dict = {}
+        for event in self.events:
+            if event["ph"] != "X":
+                continue
+            seconds, count = totals.get(event["cat"], (0.0, 0))
+            totals[event["cat"]] = (seconds + event["dur"] / 1e6, count + 1)
+        return totals
+
+
+@contextmanager
+def profile(path: Optional[str], cprofile: bool = False):
+    """Profile the enclosed block when `path` is given.
+
+    Args:
+        path: Where to write the Chrome trace JSON; profiling is off if None.
+        cprofile: Also write a cProfile dump (`<path>.prof`) of the main thread.
+    """
+    global _active
+    if not path:
+        yield None
+        return
+
+    trace_path = Path(path).expanduser().resolve()
+    tracer = Tracer()
+    tracer.install()
+    _active = tracer
+    profiler = cProfile.Profile() if cprofile else None
+    if profiler:
+        profiler.enable()
+    try:
+        with tracer.span("pixel-perfect", "app"):
+            yield tracer
+    finally:
+        if profiler:
+            profiler.disable()
+        _active = None
+        tracer.uninstall()
+        tracer.save(trace_path)
+        print(f"✓ Trace written to {trace_path} (open in https://ui.perfetto.dev)")
+        for cat, (seconds, count) in sorted(tracer.summary().items(), key=lambda item: -item[1][0]):
+            print(f"  {cat:<12} {seconds:8.1f}s  {count} spans")
+        if profiler:
+            prof_path = trace_path.with_suffix(trace_path.suffix + ".prof")
+            profiler.dump_stats(prof_path)
+            print(f"✓ cProfile stats written to {prof_path}")
@@ -0,0 +1,64 @@
+"""Provider-side prompt-prefix caching.
+
+Every model request resends the same large prefix: the agent's tool schemas,
+its system prompt/instructions and (in the pipeline) the shared parts of the
+task prompt. Providers can serve that prefix from cache when it is
+byte-identical across requests, which lowers time-to-first-token and input
+cost. This module sets the cache hints each provider needs:
+
+- **Anthropic**: an explicit `cache_control` breakpoint on the system block
+  (tools and system are cached together)
+- **OpenAI**: automatic for prefixes >= 1024 tokens; a `prompt_cache_key` per
+  agent routes requests with the same prefix to the same cache
+- **Gemini**: implicit caching on 2.5+ models, no request hint needed
+- **DeepSeek**: automatic disk caching; its `prompt_cache_hit_tokens` usage
+  field is mapped onto agno's `cache_read_tokens`
+
+Keeping the prefix stable is the caller's side of the contract: prompts put
+shared content first and run-specific details last, and no timestamps or
+session IDs are added to system messages.
+"""
+
+from typing import Optional
+
+from agno.models.deepseek import DeepSeek
+from agno.models.metrics import Metrics
+
+
+class CachedDeepSeek(DeepSeek):
+    """DeepSeek model that reports prefix-cache hits in agno metrics."""
+
+    def _get_metrics(self, response_usage) -> Metrics:
+        metrics = super()._get_metrics(response_usage)
+        hits = getattr(response_usage, "prompt_cache_hit_tokens", None)
+        if hits:
+            metrics.cache_read_tokens = hits
+        return metrics
+
+
+def apply_cache_hints(model, provider: str, cache_key: Optional[str] = None):
+    """Enable provider prompt caching on a model instance.
+
+    Args:
+        model: The agno model.
+        provider: Provider key from `SUPPORTED_PROVIDERS`.
+        cache_key: Stable identifier of the prompt prefix (e.g. the agent role).
+
+    Returns:
+        The same model, configured for caching.
+    """
+    if provider == "anthropic":
+        model.cache_system_prompt = True
+    elif provider == "openai" and cache_key:
+        extra_body = dict(model.extra_body or {})
+        extra_body.setdefault("prompt_cache_key", f"pixel-perfect-{cache_key}")
+        model.extra_body = extra_body
+    return model
+
+
+def format_usage(input_tokens: int, output_tokens: int, cache_read_tokens: int = 0) -> str:
+    """One-line token usage summary including the prompt-cache hit rate."""
+    line = f"{input_tokens:,} input / {output_tokens:,} output tokens"
+    if input_tokens:
+        line += f", {cache_read_tokens:,} input tokens from cache ({cache_read_tokens / input_tokens:.0%})"
+    return line
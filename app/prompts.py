@@ -56,3 +56,135 @@ def get_system_prompt() -> str:
         logging.warning(f"Failed to fetch prompt from LangWatch: {e}. Using default.")
         
     return DEFAULT_MIGRATION_SYSTEM_PROMPT
+
+
+def get_analysis_prompt(source_path: str) -> str:
+    """Build the message that asks the Analyzer to inspect a project."""
+    return (
+        f"Analyze the Next.js project at '{source_path}'. List all files, identify the framework version, "
+        "dependencies, and key architectural patterns."
+    )
+
+
+def get_area_analysis_prompt(source_path: str, area: str, focus: str, files: list[str]) -> str:
+    """Build the message that asks one Analyzer to inspect one area of a project.
+
+    Args:
+        source_path: Path to the Next.js project.
+        area: Name of the area (e.g. "Components" or "Components (2/3)").
+        focus: What to report on for this area.
+        files: Project-relative paths of the files in this area.
+    """
+    listing = "\n".join(f"- {path}" for path in files)
+    return f"""Analyze the {area} area of the Next.js project at '{source_path}'.
+Other areas are analyzed in parallel; read only the files listed here (and files
+they import when needed to understand them).
+
+Report on: {focus}.
+Name files by their paths relative to the project root. Start with a short summary,
+then the details as markdown sections.
+
+Files:
+{listing}
+"""
+
+
+def get_plan_prompt(analysis: str, source_path: str, output_dir: str, routes: str = "") -> str:
+    """Build the message that asks the Architect for a MigrationPlan.
+
+    Args:
+        analysis: The Analyzer's report.
+        source_path: Path to the Next.js source.
+        output_dir: Path of the Nuxt.js output directory.
+        routes: The precomputed file mapping (`RouteTable.to_prompt`), if any.
+    """
+    mapping = ""
+    if routes:
+        mapping = f"""
+File mapping (computed from the source tree; use these source paths, target paths and
+actions exactly and write the conversion notes for each; add only files that are not
+covered, such as new composables or stores):
+{routes}
+"""
+    return f"""Create a MigrationPlan for converting the Next.js application at '{source_path}'
+to a Nuxt.js 4 application at '{output_dir}'.
+
+Use source paths relative to '{source_path}' and target paths relative to '{output_dir}'.
+{mapping}
+Analysis report:
+{analysis}
+"""
+
+
+def get_file_migration_prompt(file, source_path: str, output_dir: str, summary: str) -> str:
+    """Build the Developer task for a single planned file.
+
+    Args:
+        file: The FileMigration entry to execute.
+        source_path: Absolute path to the Next.js source.
+        output_dir: Absolute path of the Nuxt.js output directory.
+        summary: The plan's high-level migration strategy.
+    """
+    # Shared text first and per-file details last, so consecutive file tasks
+    # share the longest possible prefix for provider prompt caching
+    strategy = f"Migration strategy: {summary}\n\n" if summary else ""
+    return f"""Migrate exactly one file as part of the plan below. Do not touch other files.
+The output directory has already been scaffolded; other files are being migrated in parallel.
+
+{strategy}Action: {file.action}
+Source: {source_path}/{file.source_path}
+Target: {output_dir}/{file.target_path}
+Notes: {file.description}
+"""
+
+
+def get_scaffold_prompt(output_dir: str) -> str:
+    """Build the Developer task that scaffolds the Nuxt project before file work starts."""
+    return f"""Prepare the Nuxt.js 4 project at '{output_dir}' before individual files are migrated.
+
+If '{output_dir}' is empty or missing, run: `npx nuxi@latest init {output_dir} --packageManager npm --gitInit false`
+Otherwise just verify that `nuxt.config.ts` and `package.json` exist.
+
+Do not migrate any pages or components yet.
+"""
+
+
+def get_config_prompt(output_dir: str, config_changes: list[str]) -> str:
+    """Build the Developer task that applies the plan's configuration changes."""
+    changes = "\n".join(f"- {change}" for change in config_changes) or "- (none)"
+    return f"""Apply these configuration changes to the Nuxt.js project at '{output_dir}'
+(nuxt.config.ts, package.json, Tailwind/CSS setup). Do not touch pages or components.
+
+{changes}
+"""
+
+
+def get_validation_prompt(output_dir: str) -> str:
+    """Build the Developer task for the final typecheck/fix round."""
+    return f"""All planned files have been migrated to '{output_dir}'.
+Run `npx nuxi typecheck` in '{output_dir}' and fix any errors you find.
+Edit only the lines involved in each error; do not rewrite whole files.
+"""
+
+
+def get_fix_prompt(output_dir: str, file_path: str, errors: str, source_excerpt: str) -> str:
+    """Build the Developer task that fixes one file's typecheck errors.
+
+    Args:
+        output_dir: Absolute path of the Nuxt.js output directory.
+        file_path: The file to fix, relative to `output_dir`.
+        errors: The file's diagnostics, one per line.
+        source_excerpt: Numbered source lines around the errors.
+    """
+    return f"""Fix the typecheck errors in one file of the Nuxt.js project at '{output_dir}'.
+Other files are being fixed in parallel; do not touch them and do not run the typecheck yourself.
+Edit only the lines involved in each error; do not rewrite the whole file.
+
+File: {output_dir}/{file_path}
+
+Errors:
+{errors}
+
+Source around the errors:
+{source_excerpt}
+"""
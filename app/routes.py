@@ -0,0 +1,274 @@
+"""Deterministic Next.js → Nuxt 4 route and file mapping.
+
+Where a Next.js file lands in a Nuxt project follows from conventions, not
+judgement, so the Architect should not have to work it out (or invent files
+that do not exist). `build_route_table` walks the source tree and maps:
+
+- **Pages Router**: `pages/**` → `app/pages/**.vue`, `_app` → `app/app.vue`,
+  `_error`/`404`/`500` → `app/error.vue`, `pages/api/**` → `server/api/**.ts`
+- **App Router**: `app/**/page` → `app/pages/**/index.vue`, `layout` →
+  `app/layouts/*.vue`, `error`/`not-found` → `app/error.vue`, `route` →
+  `server/api/**.ts` (or `server/routes/`); route groups `(name)` are dropped
+- dynamic segments: `[id]` and `[...slug]` keep their names, optional
+  catch-alls `[[...slug]]` become `[...slug]`
+- `middleware` → a global route middleware, `components/` → `app/components/`,
+  `hooks/` and `context/` → `app/composables/`, `lib/`/`utils/` →
+  `app/utils/`, `styles/` and App Router stylesheets (`app/globals.css`) →
+  `app/assets/css/`
+
+`_document`, `next.config` and `public/` need no file of their own and become
+config changes instead. The Architect receives the table and only writes
+conversion notes; `RouteTable.apply` then enforces the table on the plan.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from app.schemas import FileMigration, MigrationPlan
+from app.source_tree import IGNORED_DIRS, SCRIPT_SUFFIXES, STYLE_SUFFIXES
+
+NUXT_SRC_DIR = "app"
+
+_OPTIONAL_CATCH_ALL_RE = re.compile(r"\[\[\.\.\.(\w+)\]\]")
+_TS_SUFFIXES = {".ts", ".tsx", ".mts", ".cts"}
+_COMPOSABLE_DIRS = {"hooks", "context", "contexts", "composables"}
+_UTIL_DIRS = {"lib", "utils", "helpers"}
+_ERROR_NOTES = "Error page → error.vue using the `error` prop."
+_APP_SPECIAL = {"layout", "page", "route", "error", "global-error", "not-found", "loading", "template", "default"}
+
+
+@dataclass
+class RouteEntry:
+    """One source file and its Nuxt counterpart."""
+
+    source_path: str
+    target_path: str
+    kind: str  # page, layout, app, error, api, middleware, component, composable, util, style, config
+    action: str = "convert"
+    notes: str = ""
+
+    def to_file_migration(self) -> FileMigration:
+        return FileMigration(
+            source_path=self.source_path, target_path=self.target_path, action=self.action, description=self.notes
+        )
+
+
+@dataclass
+class RouteTable:
+    """The full source → target mapping of a project."""
+
+    root: str
+    entries: list[RouteEntry] = field(default_factory=list)
+    config_changes: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # Source files with no Nuxt equivalent
+
+    def get(self, source_path: str) -> Optional[RouteEntry]:
+        for entry in self.entries:
+            if entry.source_path == source_path:
+                return entry
+        return None
+
+    def normalize(self, file: FileMigration) -> Optional[FileMigration]:
+        """Enforce the table on one planned file.
+
+        Returns:
+            The file with the table's target and action, unchanged if the table
+            does not cover it, or None if it names a source file that does not exist.
+        """
+        entry = self.get(file.source_path)
+        if entry is not None:
+            description = file.description or entry.notes
+            return file.model_copy(
+                update={"target_path": entry.target_path, "action": entry.action, "description": description}
+            )
+        if file.action != "create" and os.path.isdir(self.root):
+            if not os.path.isfile(os.path.join(self.root, file.source_path)):
+                return None
+        return file
+
+    def apply(self, plan: MigrationPlan) -> MigrationPlan:
+        """Enforce the table on a full plan: fix mappings, drop invented files, add missing ones."""
+        files, seen = [], set()
+        for file in plan.files_to_migrate:
+            file = self.normalize(file)
+            if file is None or (file.source_path, file.target_path) in seen:
+                continue
+            seen.add((file.source_path, file.target_path))
+            files.append(file)
+        for entry in self.entries:
+            if (entry.source_path, entry.target_path) not in seen:
+                files.append(entry.to_file_migration())
+        config_changes = list(plan.config_changes)
+        config_changes += [change for change in self.config_changes if change not in config_changes]
+        return plan.model_copy(update={"files_to_migrate": files, "config_changes": config_changes})
+
+    def to_prompt(self) -> str:
+        """One line per mapping, for the Architect prompt."""
+        lines = [f"{e.source_path} -> {e.target_path} ({e.action}, {e.kind})" for e in self.entries]
+        return "\n".join(lines) or "(no files recognized)"
+
+
+def _route_segments(parts: list[str]) -> list[str]:
+    """Nuxt path segments for Next.js route segments."""
+    segments = []
+    for part in parts:
+        if part.startswith("(") and part.endswith(")"):
+            continue  # Route groups do not affect the URL
+        segments.append(_OPTIONAL_CATCH_ALL_RE.sub(r"[...\1]", part))
+    return segments
+
+
+def _script_suffix(source: str) -> str:
+    return ".ts" if Path(source).suffix in _TS_SUFFIXES else ".js"
+
+
+def _dynamic_notes(segments: list[str]) -> str:
+    params = [s.strip("[].") for s in segments if s.startswith("[")]
+    if not params:
+        return ""
+    return f"Read {', '.join(params)} from useRoute().params."
+
+
+def _pages_router(rel: str, parts: list[str], source_files: set[str], prefix: str) -> Optional[RouteEntry]:
+    """Map a file under `pages/`."""
+    stem = Path(parts[-1]).stem
+    dirs = parts[1:-1]
+    if dirs[:1] == ["api"]:
+        segments = _route_segments(dirs[1:] + [stem])
+        target = "server/api/" + "/".join(segments) + _script_suffix(rel)
+        return RouteEntry(rel, target, "api", notes="Next.js API route → Nitro defineEventHandler.")
+    if not dirs and stem == "_app":
+        notes = "Global providers/layout → app.vue with <NuxtLayout><NuxtPage/>."
+        return RouteEntry(rel, f"{NUXT_SRC_DIR}/app.vue", "app", notes=notes)
+    if not dirs and stem in ("_error", "404", "500"):
+        return RouteEntry(rel, f"{NUXT_SRC_DIR}/error.vue", "error", notes=_ERROR_NOTES)
+    if stem.startswith("_"):
+        return None
+    segments = _route_segments(dirs + [stem])
+    # `pages/blog.js` next to `pages/blog/` would become a parent route in Nuxt
+    sibling_dir = f"{prefix}pages/" + "/".join(dirs + [stem]) + "/"
+    if stem != "index" and any(path.startswith(sibling_dir) for path in source_files):
+        segments.append("index")
+    target = f"{NUXT_SRC_DIR}/pages/" + "/".join(segments) + ".vue"
+    notes = " ".join(filter(None, ["Page component.", _dynamic_notes(segments)]))
+    return RouteEntry(rel, target, "page", notes=notes)
+
+
+def _app_router(rel: str, parts: list[str], table: RouteTable) -> Optional[RouteEntry]:
+    """Map a file under the App Router `app/` directory."""
+    stem = Path(parts[-1]).stem
+    dirs = parts[1:-1]
+    if any(d.startswith("@") or d.startswith("(.") for d in dirs):
+        table.skipped.append(rel)  # Parallel and intercepting routes have no Nuxt equivalent
+        return None
+    if any(d.startswith("_") for d in dirs) or stem not in _APP_SPECIAL:
+        target = f"{NUXT_SRC_DIR}/components/" + "/".join(dirs + [stem]) + ".vue"
+        return RouteEntry(rel, target, "component", notes="Colocated component.")
+    segments = _route_segments(dirs)
+    if stem == "page":
+        target = f"{NUXT_SRC_DIR}/pages/" + "/".join(segments + ["index"]) + ".vue"
+        notes = " ".join(filter(None, ["Page component.", _dynamic_notes(segments)]))
+        return RouteEntry(rel, target, "page", notes=notes)
+    if stem == "layout":
+        name = "-".join(s.strip("[].") for s in segments) or "default"
+        notes = "Root layout → default layout with <slot/>; move <html>/<head> to app.head in nuxt.config.ts."
+        if segments:
+            notes = f"Nested layout; pages under /{'/'.join(segments)} use definePageMeta({{ layout: '{name}' }})."
+        return RouteEntry(rel, f"{NUXT_SRC_DIR}/layouts/{name}.vue", "layout", notes=notes)
+    if stem in ("error", "global-error", "not-found") and not segments:
+        return RouteEntry(rel, f"{NUXT_SRC_DIR}/error.vue", "error", notes=_ERROR_NOTES)
+    if stem == "route":
+        base, rest = ("server/api", segments[1:]) if segments[:1] == ["api"] else ("server/routes", segments)
+        target = f"{base}/{'/'.join(rest) or 'index'}{_script_suffix(rel)}"
+        return RouteEntry(rel, target, "api", notes="Route handler → defineEventHandler; dispatch on event.method.")
+    table.skipped.append(rel)  # loading/template/default and nested error files
+    return None
+
+
+def _classify_other(rel: str, parts: list[str]) -> Optional[RouteEntry]:
+    """Map components, hooks, utilities and styles."""
+    top, suffix = parts[0], Path(rel).suffix
+    rest = "/".join(parts[1:])
+    if suffix in STYLE_SUFFIXES and top in ("styles", "style", "css"):
+        return RouteEntry(rel, f"{NUXT_SRC_DIR}/assets/css/{rest}", "style", action="copy", notes="Stylesheet.")
+    if suffix not in SCRIPT_SUFFIXES:
+        return None
+    stem_path = os.path.splitext(rest)[0]
+    if top == "components":
+        target = f"{NUXT_SRC_DIR}/components/{stem_path}.vue"
+        return RouteEntry(rel, target, "component", notes="React component → SFC.")
+    if top in _COMPOSABLE_DIRS:
+        target = f"{NUXT_SRC_DIR}/composables/{stem_path}{_script_suffix(rel)}"
+        notes = "React context/hook → composable (useState/provide-inject)."
+        return RouteEntry(rel, target, "composable", notes=notes)
+    if top in _UTIL_DIRS:
+        target = f"{NUXT_SRC_DIR}/utils/{stem_path}{_script_suffix(rel)}"
+        return RouteEntry(rel, target, "util", notes="Plain module; keep logic.")
+    return None
+
+
+def build_route_table(root: str) -> RouteTable:
+    """Map every recognized Next.js source file to its Nuxt 4 path.
+
+    Args:
+        root: Path to the Next.js project.
+
+    Returns:
+        The RouteTable; empty if `root` does not exist.
+    """
+    table = RouteTable(root=str(root))
+    root_path = Path(root)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            files.append((Path(dirpath) / name).relative_to(root_path).as_posix())
+    source_files = set(files)
+    # Next.js allows the routes and modules under src/
+    prefix = "src/" if any(f.startswith(("src/pages/", "src/app/")) for f in files) else ""
+
+    targets: dict[str, RouteEntry] = {}
+    for rel in files:
+        parts = (rel[len(prefix):] if prefix and rel.startswith(prefix) else rel).split("/")
+        name, suffix = parts[-1], Path(rel).suffix
+        stem = name.split(".")[0]
+        entry = None
+        if len(parts) == 1:
+            if stem == "next" and ".config." in name:
+                table.config_changes.append(f"Port settings from {rel} (images, redirects, env) to nuxt.config.ts.")
+            elif stem == "middleware" and suffix in SCRIPT_SUFFIXES:
+                notes = "Next.js middleware → global route middleware (defineNuxtRouteMiddleware)."
+                entry = RouteEntry(rel, f"{NUXT_SRC_DIR}/middleware/main.global.ts", "middleware", notes=notes)
+            elif stem == "tailwind" and ".config." in name:
+                entry = RouteEntry(rel, name, "config", notes="Keep the theme; point content at app/**/*.vue.")
+        elif parts[0] == "pages" and suffix in SCRIPT_SUFFIXES:
+            if stem == "_document":
+                table.config_changes.append(f"Move <Html>/<Head> markup from {rel} to app.head in nuxt.config.ts.")
+            else:
+                entry = _pages_router(rel, parts, source_files, prefix)
+        elif parts[0] == "app" and suffix in SCRIPT_SUFFIXES:
+            entry = _app_router(rel, parts, table)
+        elif parts[0] == "app" and suffix in STYLE_SUFFIXES:
+            target = f"{NUXT_SRC_DIR}/assets/css/" + "/".join(parts[1:])
+            entry = RouteEntry(rel, target, "style", action="copy", notes="App Router stylesheet.")
+        else:
+            entry = _classify_other(rel, parts)
+        if entry is None:
+            continue
+        if entry.target_path in targets:
+            # e.g. `404` and `_error` both become error.vue: one Developer run covers both
+            targets[entry.target_path].notes += f" Also fold in {rel}."
+            continue
+        targets[entry.target_path] = entry
+        table.entries.append(entry)
+
+    if (root_path / "public").is_dir():  # Not walked: IGNORED_DIRS skips it
+        table.config_changes.append("Copy public/ to the Nuxt project unchanged.")
+    for entry in table.entries:
+        if entry.kind == "style" and Path(entry.source_path).stem in ("globals", "global"):
+            css_path = entry.target_path.removeprefix(NUXT_SRC_DIR + "/")
+            table.config_changes.append(f"Register ~/{css_path} in the nuxt.config.ts css array.")
+    return table
@@ -0,0 +1,429 @@
+"""Local code search index for the migration agents.
+
+Builds a BM25 inverted index plus a symbol table over a source tree so the
+Analyzer and Developer can locate code with a single tool call instead of
+repeated `ls`/`grep`/read round trips. Indexes are cached on disk under
+`~/.pixel-perfect/index/` and refreshed incrementally: unchanged trees (same
+git tree hash, clean worktree) are reused as-is, otherwise only files whose
+size or mtime changed are re-tokenized. Within a process an index is only
+re-validated after a write seen by the tool cache, or once
+`REFRESH_INTERVAL` has passed, so repeated lookups skip the git/stat scan.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from agno.tools import Toolkit
+
+from app import tool_cache
+from app.cli_config import CONFIG_DIR
+from app.source_tree import BUILD_DIRS
+
+INDEX_DIR = CONFIG_DIR / "index"
+INDEX_VERSION = 1
+
+INDEXED_EXTENSIONS = {
+    ".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue",
+    ".css", ".scss", ".sass", ".less", ".json", ".md", ".mdx", ".html",
+}
+MAX_FILE_BYTES = 512 * 1024
+# Seconds a refreshed index is trusted without re-checking the tree
+REFRESH_INTERVAL = 30.0
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+SYMBOL_BOOST = 3.0
+
+_WORD_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_SYMBOL_PATTERNS = [
+    ("function", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)")),
+    ("class", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)")),
+    ("interface", re.compile(r"^\s*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)")),
+    ("type", re.compile(r"^\s*(?:export\s+)?type\s+([A-Za-z_$][\w$]*)\s*(?:<[^=]*>)?\s*=")),
+    ("const", re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=")),
+]
+
+
+def tokenize(text: str) -> list[str]:
+    """Split source text into lowercase search terms.
+
+    Identifiers are indexed whole and split on camelCase/snake_case
+    boundaries, so `useAuthSession` matches `auth`, `session` and
+    `useauthsession`.
+    """
+    terms = []
+    for word in _WORD_RE.findall(text):
+        lowered = word.lower()
+        terms.append(lowered)
+        parts = [p.lower() for chunk in word.split("_") for p in _CAMEL_RE.findall(chunk)]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+def extract_symbols(text: str) -> list[tuple[str, str, int]]:
+    """Extract top-level declarations as (name, kind, line) tuples."""
+    symbols = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        for kind, pattern in _SYMBOL_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                symbols.append((match.group(1), kind, lineno))
+                break
+    return symbols
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    path: str
+    score: float
+    line: int
+    snippet: str
+
+
+class CodeIndex:
+    """Persistent BM25 + symbol index over a single source tree."""
+
+    def __init__(self, root: str):
+        """
+        Initialize the index for a directory.
+
+        Args:
+            root: Root directory of the source tree to index.
+        """
+        self.root = Path(root).resolve()
+        self.tree_hash: Optional[str] = None
+        self.files: dict[str, dict] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._symbols: dict[str, list[tuple[str, str, int]]] = {}
+        self._avg_length = 0.0
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._stale = True
+        _live_indexes.add(self)
+
+    @property
+    def cache_path(self) -> Path:
+        """Location of the on-disk cache for this root."""
+        digest = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+        return INDEX_DIR / f"{digest}.json"
+
+    def _git_tree_hash(self) -> Optional[str]:
+        """Return the HEAD tree hash if the worktree is clean, else None."""
+        try:
+            tree = subprocess.run(
+                ["git", "rev-parse", "HEAD^{tree}"],
+                cwd=self.root, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            dirty = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=normal", "."],
+                cwd=self.root, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return None if dirty else tree
+
+    def _iter_files(self):
+        """Yield (relative path, stat) for every indexable file."""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in BUILD_DIRS]
+            for filename in filenames:
+                if Path(filename).suffix.lower() not in INDEXED_EXTENSIONS:
+                    continue
+                full = Path(dirpath) / filename
+                try:
+                    stat = full.stat()
+                except OSError:
+                    continue
+                if stat.st_size > MAX_FILE_BYTES:
+                    continue
+                yield full.relative_to(self.root).as_posix(), stat
+
+    def _load(self):
+        """Load the cached index from disk if it is compatible."""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        self.tree_hash = data.get("tree_hash")
+        self.files = data.get("files", {})
+
+    def _save(self):
+        """Persist the index to disk."""
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per write, so other processes saving the same root never share one
+        with tempfile.NamedTemporaryFile("w", dir=INDEX_DIR, suffix=".tmp", delete=False) as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "root": str(self.root),
+                    "tree_hash": self.tree_hash,
+                    "files": self.files,
+                },
+                f,
+            )
+        try:
+            os.replace(f.name, self.cache_path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    def _index_file(self, rel_path: str, stat: os.stat_result) -> dict:
+        """Tokenize a single file into an index entry."""
+        text = (self.root / rel_path).read_text(errors="ignore")
+        # Path components are searchable too (e.g. "button" finds Button.js)
+        terms = tokenize(text) + tokenize(rel_path)
+        return {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "length": len(terms),
+            "terms": dict(Counter(terms)),
+            "symbols": extract_symbols(text),
+        }
+
+    def _rebuild_postings(self):
+        """Rebuild the in-memory inverted index from per-file entries."""
+        postings: dict[str, dict[str, int]] = {}
+        symbols: dict[str, list[tuple[str, str, int]]] = {}
+        total_length = 0
+        for rel_path, entry in self.files.items():
+            total_length += entry["length"]
+            for term, tf in entry["terms"].items():
+                postings.setdefault(term, {})[rel_path] = tf
+            for name, kind, line in entry["symbols"]:
+                symbols.setdefault(name.lower(), []).append((rel_path, kind, line))
+        self._postings = postings
+        self._symbols = symbols
+        self._avg_length = total_length / len(self.files) if self.files else 0.0
+
+    def mark_stale(self):
+        """Re-validate the tree on the next `refresh_if_stale`."""
+        self._stale = True
+
+    def refresh_if_stale(self, max_age: Optional[float] = None) -> int:
+        """Refresh if the index was marked stale or last checked over `max_age` seconds ago.
+
+        Args:
+            max_age: Seconds to trust the last check; defaults to `REFRESH_INTERVAL`.
+
+        Returns:
+            Number of files that were (re)indexed.
+        """
+        max_age = REFRESH_INTERVAL if max_age is None else max_age
+        checked_at = self._checked_at
+        if not self._stale and checked_at is not None and time.monotonic() - checked_at < max_age:
+            return 0
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the working tree.
+
+        Returns:
+            Number of files that were (re)indexed.
+        """
+        with self._lock:
+            # Cleared before scanning, so a write during the scan triggers another one
+            self._stale = False
+            self._checked_at = time.monotonic()
+            if not self.files:
+                self._load()
+
+            tree_hash = self._git_tree_hash()
+            if tree_hash and tree_hash == self.tree_hash and self.files:
+                if not self._postings:
+                    self._rebuild_postings()
+                return 0
+
+            changed = 0
+            seen = set()
+            for rel_path, stat in self._iter_files():
+                seen.add(rel_path)
+                entry = self.files.get(rel_path)
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    continue
+                try:
+                    self.files[rel_path] = self._index_file(rel_path, stat)
+                except OSError:
+                    continue
+                changed += 1
+
+            removed = [p for p in self.files if p not in seen]
+            for rel_path in removed:
+                del self.files[rel_path]
+
+            if changed or removed or tree_hash != self.tree_hash or not self._postings:
+                self.tree_hash = tree_hash
+                self._rebuild_postings()
+                self._save()
+            return changed
+
+    def _snippet(self, rel_path: str, terms: set[str], context: int = 2) -> tuple[int, str]:
+        """Find the best-matching line in a file and return it with context."""
+        try:
+            lines = (self.root / rel_path).read_text(errors="ignore").splitlines()
+        except OSError:
+            return 0, ""
+        best_line, best_score = 0, 0
+        for i, line in enumerate(lines):
+            score = len(terms.intersection(tokenize(line)))
+            if score > best_score:
+                best_line, best_score = i, score
+        start = max(0, best_line - context)
+        end = min(len(lines), best_line + context + 1)
+        snippet = "\n".join(f"{n + 1:>5}: {lines[n]}" for n in range(start, end))
+        return best_line + 1, snippet
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """Rank files against a free-text query using BM25.
+
+        Args:
+            query: Words, identifiers or paths to look for.
+            limit: Maximum number of hits to return.
+
+        Returns:
+            Hits ordered by descending score.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            return self._search(terms, limit)
+
+    def _search(self, terms: set[str], limit: int) -> list[SearchHit]:
+        if not terms or not self.files:
+            return []
+
+        n_docs = len(self.files)
+        scores: dict[str, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for rel_path, tf in postings.items():
+                length = self.files[rel_path]["length"]
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / (self._avg_length or 1)))
+                scores[rel_path] = scores.get(rel_path, 0.0) + idf * norm
+            for rel_path, _kind, _line in self._symbols.get(term, []):
+                scores[rel_path] = scores.get(rel_path, 0.0) + SYMBOL_BOOST
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for rel_path, score in ranked:
+            line, snippet = self._snippet(rel_path, terms)
+            hits.append(SearchHit(path=rel_path, score=round(score, 3), line=line, snippet=snippet))
+        return hits
+
+    def find_symbol(self, name: str) -> list[tuple[str, str, int]]:
+        """Look up declarations by exact (case-insensitive) name.
+
+        Returns:
+            List of (path, kind, line) tuples.
+        """
+        with self._lock:
+            return sorted(self._symbols.get(name.lower(), []))
+
+
+_live_indexes: "weakref.WeakSet[CodeIndex]" = weakref.WeakSet()
+_shared_indexes: dict[Path, CodeIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_index(root: str) -> CodeIndex:
+    """Return the process-wide index of a source tree, shared by every agent's toolkit."""
+    path = Path(root).resolve()
+    with _shared_lock:
+        index = _shared_indexes.get(path)
+        if index is None:
+            index = _shared_indexes[path] = CodeIndex(str(path))
+        return index
+
+
+def mark_stale(paths: Optional[list[str]] = None):
+    """Mark the indexes containing any of `paths` (all if None) for re-validation."""
+    for index in list(_live_indexes):
+        root = str(index.root)
+        if paths is None or any(p == root or p.startswith(root + os.sep) or root.startswith(p + os.sep) for p in paths):
+            index.mark_stale()
+
+
+tool_cache.on_invalidate(mark_stale)
+
+
+class CodeSearchTools(Toolkit):
+    """Agent toolkit exposing ranked code search over local source trees."""
+
+    def __init__(self, base_dir: str = ".", **kwargs):
+        """
+        Initialize the toolkit.
+
+        Args:
+            base_dir: Default directory to search when no path is given.
+        """
+        self.base_dir = base_dir
+        super().__init__(name="code_search", tools=[self.search_code, self.find_symbol], **kwargs)
+
+    def _get_index(self, path: Optional[str]) -> CodeIndex:
+        """Return the shared index for the given root, refreshed if stale."""
+        index = get_index(path or self.base_dir)
+        index.refresh_if_stale()
+        return index
+
+    def search_code(self, query: str, path: Optional[str] = None, limit: int = 10) -> str:
+        """Search the source tree and return ranked code snippets.
+
+        Prefer this over listing directories or grepping file by file.
+
+        Args:
+            query: Keywords, identifiers, component names or file names to search for.
+            path: Root directory of the project to search. Defaults to the working directory.
+            limit: Maximum number of results (default 10).
+
+        Returns:
+            Ranked matches with file path, line number and a short snippet.
+        """
+        root = Path(path or self.base_dir)
+        if not root.is_dir():
+            return f"Error: '{root}' is not a directory"
+        hits = self._get_index(str(root)).search(query, limit=limit)
+        if not hits:
+            return f"No matches for '{query}'."
+        blocks = [f"{hit.path}:{hit.line} (score {hit.score})\n{hit.snippet}" for hit in hits]
+        return "\n\n".join(blocks)
+
+    def find_symbol(self, name: str, path: Optional[str] = None) -> str:
+        """Find where a function, component, class, type or constant is declared.
+
+        Args:
+            name: Exact symbol name (e.g. `Button`, `useAuth`).
+            path: Root directory of the project to search. Defaults to the working directory.
+
+        Returns:
+            One `path:line (kind)` entry per declaration.
+        """
+        root = Path(path or self.base_dir)
+        if not root.is_dir():
+            return f"Error: '{root}' is not a directory"
+        matches = self._get_index(str(root)).find_symbol(name)
+        if not matches:
+            return f"No declaration found for '{name}'."
+        return "\n".join(f"{p}:{line} ({kind})" for p, kind, line in matches)
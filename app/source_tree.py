@@ -0,0 +1,19 @@
+"""What counts as source in a Next.js project tree.
+
+Shared by the walkers that classify, route, estimate and index source files
+(`analysis`, `routes`, `estimate`, `search`) so they all skip the same
+directories and agree on file kinds.
+"""
+
+import re
+
+# Dependency, VCS and build output directories, never source
+BUILD_DIRS = {
+    "node_modules", ".git", ".next", ".nuxt", ".output", ".turbo",
+    ".vercel", "dist", "build", "out", "coverage",
+}
+# Directories the migration walkers skip; `public` assets are copied as-is
+IGNORED_DIRS = BUILD_DIRS | {"public"}
+SCRIPT_SUFFIXES = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
+STYLE_SUFFIXES = {".css", ".scss", ".sass", ".less"}
+CONFIG_NAMES = re.compile(r"^(next|tailwind|postcss|babel|jest|vitest)\.config\.|^package\.json$|^tsconfig\.json$")
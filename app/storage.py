@@ -0,0 +1,327 @@
+"""Compressed, content-addressed storage of session histories.
+
+Agno stores every session's full run history (messages, tool calls and tool
+results) as one JSON document per session, rewritten after every run. Tool
+results carry whole file contents and shell logs, so the same large strings
+are repeated across turns and sessions and `storage.db` grows quickly.
+
+`BlobSqliteDb` is a drop-in `SqliteDb` that moves every string of at least
+`BLOB_MIN_BYTES` out of the run history into a blob table keyed by its
+SHA-256, compressed with zstd (if `zstandard` is installed) or zlib, and
+leaves a short reference in its place. Identical payloads are stored once;
+references are resolved with one query per session load.
+
+`vacuum` applies a retention window, moves payloads of sessions written
+before this store existed into blobs, drops unreferenced blobs and compacts
+the database file.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from typing import Any, Optional
+
+from agno.db.base import SessionType
+from agno.db.sqlite import SqliteDb
+from agno.session import AgentSession, TeamSession, WorkflowSession
+from sqlalchemy import text
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is always available
+    zstandard = None
+
+BLOB_TABLE = "pixel_perfect_blobs"
+BLOB_MIN_BYTES = 1024
+BLOB_PREFIX = "pixel-perfect-blob:sha256:"
+# `vacuum` keeps unreferenced blobs written this recently: they may belong to
+# a session another process is storing right now
+ORPHAN_GRACE_SECONDS = 600
+_REF_RE = re.compile(re.escape(BLOB_PREFIX) + r"([0-9a-f]{64})")
+
+_SESSION_TYPES = {
+    SessionType.AGENT: AgentSession,
+    SessionType.TEAM: TeamSession,
+    SessionType.WORKFLOW: WorkflowSession,
+}
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This database has zstd-compressed blobs; install `zstandard` to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+
+def _walk(value, visit):
+    """Rebuild a JSON-like value, passing every string through `visit`."""
+    if isinstance(value, str):
+        return visit(value)
+    if isinstance(value, dict):
+        return {k: _walk(v, visit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_walk(v, visit) for v in value]
+    return value
+
+
+def _references(value) -> set[str]:
+    """Hashes of all blob references in a JSON-like value."""
+    found: set[str] = set()
+
+    def visit(string):
+        match = _REF_RE.fullmatch(string)
+        if match:
+            found.add(match.group(1))
+        return string
+
+    _walk(value, visit)
+    return found
+
+
+def _hash_chunks(hashes: list[str]):
+    """Yield `(params, placeholders)` for `IN (...)` queries, staying under SQLite's bound-parameter limit."""
+    for i in range(0, len(hashes), 500):
+        params = {f"h{n}": h for n, h in enumerate(hashes[i:i + 500])}
+        yield params, ", ".join(f":{name}" for name in params)
+
+
+def _load_runs(runs) -> Any:
+    """Session `runs` column value as Python data."""
+    return json.loads(runs) if isinstance(runs, str) else runs
+
+
+class BlobStore:
+    """Compressed, deduplicated payloads in a table of the session database."""
+
+    def __init__(self, engine):
+        """
+        Initialize the store.
+
+        Args:
+            engine: SQLAlchemy engine of the session database.
+        """
+        self.engine = engine
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {BLOB_TABLE} ("
+                    "hash TEXT PRIMARY KEY, codec TEXT NOT NULL, size INTEGER NOT NULL, "
+                    "data BLOB NOT NULL, created_at INTEGER NOT NULL)"
+                )
+            )
+
+    def externalize(self, value):
+        """Replace large strings in `value` with blob references, storing new payloads.
+
+        Every referenced blob is written or touched in the same transaction, so
+        a `vacuum` in another process cannot drop it before the referencing
+        session is stored (see `ORPHAN_GRACE_SECONDS`).
+
+        Returns:
+            A copy of `value` with references in place of large strings.
+        """
+        pending: dict[str, bytes] = {}
+
+        def visit(string):
+            if len(string) < BLOB_MIN_BYTES or _REF_RE.fullmatch(string):
+                return string
+            data = string.encode("utf-8")
+            if len(data) < BLOB_MIN_BYTES:
+                return string
+            digest = hashlib.sha256(data).hexdigest()
+            pending[digest] = data
+            return BLOB_PREFIX + digest
+
+        result = _walk(value, visit)
+        if pending:
+            now = int(time.time())
+            with self.engine.begin() as conn:
+                # The UPDATE takes the write lock first, so the existence check below cannot go stale
+                existing = set()
+                for params, placeholders in _hash_chunks(sorted(pending)):
+                    conn.execute(
+                        text(f"UPDATE {BLOB_TABLE} SET created_at = :now WHERE hash IN ({placeholders})"),
+                        {**params, "now": now},
+                    )
+                    rows = conn.execute(text(f"SELECT hash FROM {BLOB_TABLE} WHERE hash IN ({placeholders})"), params)
+                    existing.update(row[0] for row in rows)
+                rows = []
+                for digest, data in pending.items():
+                    if digest in existing:
+                        continue
+                    codec, compressed = _compress(data)
+                    rows.append({"hash": digest, "codec": codec, "size": len(data), "data": compressed, "now": now})
+                if rows:
+                    conn.execute(
+                        text(
+                            f"INSERT OR IGNORE INTO {BLOB_TABLE} (hash, codec, size, data, created_at) "
+                            "VALUES (:hash, :codec, :size, :data, :now)"
+                        ),
+                        rows,
+                    )
+        return result
+
+    def resolve(self, value):
+        """Replace blob references in `value` with their payloads (one query)."""
+        hashes = _references(value)
+        if not hashes:
+            return value
+        payloads = {}
+        with self.engine.connect() as conn:
+            for params, placeholders in _hash_chunks(sorted(hashes)):
+                rows = conn.execute(
+                    text(f"SELECT hash, codec, data FROM {BLOB_TABLE} WHERE hash IN ({placeholders})"), params
+                )
+                for digest, codec, data in rows:
+                    payloads[digest] = _decompress(codec, data).decode("utf-8")
+
+        def visit(string):
+            match = _REF_RE.fullmatch(string)
+            if not match:
+                return string
+            return payloads.get(match.group(1), f"[missing stored content {match.group(1)[:12]}]")
+
+        return _walk(value, visit)
+
+
+class BlobSqliteDb(SqliteDb):
+    """`SqliteDb` that keeps large run payloads in a compressed blob table."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the database (same arguments as `SqliteDb`)."""
+        super().__init__(*args, **kwargs)
+        self.blobs = BlobStore(self.db_engine)
+
+    def _hydrate(self, raw: Optional[dict]) -> Optional[dict]:
+        if raw and raw.get("runs"):
+            raw["runs"] = self.blobs.resolve(_load_runs(raw["runs"]))
+        return raw
+
+    @staticmethod
+    def _build(raw: dict, session_type: SessionType):
+        if session_type not in _SESSION_TYPES:
+            raise ValueError(f"Invalid session type: {session_type}")
+        return _SESSION_TYPES[session_type].from_dict(raw)
+
+    def upsert_session(self, session, deserialize: Optional[bool] = True):
+        """Store a session with its large run payloads moved to the blob table."""
+        data = session.to_dict()
+        if data.get("runs"):
+            data["runs"] = self.blobs.externalize(data["runs"])
+        # Hand the parent a copy that serializes to the externalized form
+        stored = copy.copy(session)
+        stored.to_dict = lambda: data
+        raw = super().upsert_session(stored, deserialize=False)
+        if raw is None or not deserialize:
+            return self._hydrate(raw)
+        return session
+
+    def upsert_sessions(self, sessions: list, deserialize: Optional[bool] = True, **kwargs) -> list:
+        """Store several sessions (see `upsert_session`)."""
+        results = [self.upsert_session(session, deserialize=deserialize) for session in sessions]
+        return [result for result in results if result is not None]
+
+    def get_session(
+        self,
+        session_id: str,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ):
+        """Read a session, resolving blob references."""
+        raw = self._hydrate(super().get_session(session_id, session_type, user_id=user_id, deserialize=False))
+        if raw is None or not deserialize:
+            return raw
+        return self._build(raw, session_type)
+
+    def get_sessions(
+        self, session_type: Optional[SessionType] = None, *args, deserialize: Optional[bool] = True, **kwargs
+    ):
+        """Read sessions, resolving blob references."""
+        raws, total = super().get_sessions(session_type, *args, deserialize=False, **kwargs)
+        raws = [self._hydrate(raw) for raw in raws]
+        if not deserialize:
+            return raws, total
+        return [self._build(raw, session_type) for raw in raws]
+
+
+def vacuum(db: BlobSqliteDb, older_than_days: Optional[float] = None) -> dict:
+    """Apply retention, move inline payloads to blobs, drop orphans and compact.
+
+    Unreferenced blobs written less than `ORPHAN_GRACE_SECONDS` before the
+    vacuum started are kept, as another process may be storing their session.
+
+    Args:
+        db: The session database.
+        older_than_days: Delete sessions not updated for this many days; keep all if None.
+
+    Returns:
+        Counts of deleted sessions, compacted sessions and deleted blobs, plus
+        the database size in bytes before and after.
+    """
+    stats = {"sessions_deleted": 0, "sessions_compacted": 0, "blobs_deleted": 0}
+    size_before = os.path.getsize(db.db_file) if db.db_file and os.path.exists(db.db_file) else 0
+    table = db._get_table(table_type="sessions")
+    started = int(time.time())
+
+    if table is not None:
+        if older_than_days is not None:
+            cutoff = int(time.time() - older_than_days * 86400)
+            with db.Session() as sess, sess.begin():
+                result = sess.execute(table.delete().where(table.c.updated_at < cutoff))
+                stats["sessions_deleted"] = result.rowcount
+
+        with db.Session() as sess:
+            rows = sess.execute(table.select().with_only_columns(table.c.session_id, table.c.runs)).fetchall()
+        for session_id, runs in rows:
+            runs = _load_runs(runs)
+            if not runs:
+                continue
+            compacted = db.blobs.externalize(runs)
+            if compacted != runs:
+                with db.Session() as sess, sess.begin():
+                    sess.execute(
+                        table.update().where(table.c.session_id == session_id).values(runs=json.dumps(compacted))
+                    )
+                stats["sessions_compacted"] += 1
+
+    # Scan references and delete orphans in one write transaction, so no session can be stored in between
+    with db.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("BEGIN IMMEDIATE"))
+        try:
+            referenced: set[str] = set()
+            if table is not None:
+                for (runs,) in conn.execute(table.select().with_only_columns(table.c.runs)):
+                    referenced |= _references(_load_runs(runs) or [])
+            rows = conn.execute(
+                text(f"SELECT hash FROM {BLOB_TABLE} WHERE created_at < :cutoff"),
+                {"cutoff": started - ORPHAN_GRACE_SECONDS},
+            )
+            orphans = [row[0] for row in rows if row[0] not in referenced]
+            for params, placeholders in _hash_chunks(orphans):
+                conn.execute(text(f"DELETE FROM {BLOB_TABLE} WHERE hash IN ({placeholders})"), params)
+            conn.execute(text("COMMIT"))
+        except BaseException:
+            conn.execute(text("ROLLBACK"))
+            raise
+    stats["blobs_deleted"] = len(orphans)
+
+    with db.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+
+    stats["bytes_before"] = size_before
+    stats["bytes_after"] = os.path.getsize(db.db_file) if db.db_file and os.path.exists(db.db_file) else 0
+    return stats
@@ -14,6 +14,7 @@ from app.agents.developer import create_developer_agent_with_mcp
 
 
 from app.prompts import get_system_prompt
+from app.tool_cache import ToolCallCache
 
 
 def get_migration_team(base_dir: str = ".", session_id: str = None) -> Team:
@@ -28,13 +29,16 @@ def get_migration_team(base_dir: str = ".", session_id: str = None) -> Team:
     """
     system_prompt = get_system_prompt()
 
+    # Read-only tool results are shared across members for this session
+    tool_cache = ToolCallCache()
+
     # Create agents
-    analyzer = create_analyzer_agent(base_dir)
+    analyzer = create_analyzer_agent(base_dir, tool_cache=tool_cache)
     architect = create_architect_agent()
-    developer = create_developer_agent(base_dir)
+    developer = create_developer_agent(base_dir, tool_cache=tool_cache)
 
     # Get model for team orchestration
-    model = get_model()
+    model = get_model(cache_key="team")
 
     # Storage for sessions
     db = get_database()
@@ -52,25 +56,34 @@ def get_migration_team(base_dir: str = ".", session_id: str = None) -> Team:
     )
 
 
-async def get_migration_team_with_mcp(base_dir: str = ".", session_id: str = None) -> tuple[Team, MCPTools]:
+async def get_migration_team_with_mcp(
+    base_dir: str = ".", session_id: str = None, nuxt_mcp: MCPTools = None
+) -> tuple[Team, MCPTools]:
     """Create migration team with Nuxt MCP for accurate code generation.
     
     Args:
         base_dir: Base directory for file system operations.
         session_id: Optional session ID to resume.
+        nuxt_mcp: Optional already-connected Nuxt MCP client to reuse.
         
     Returns:
-        Tuple of (Team, MCPTools) - MCPTools must be closed when done.
+        Tuple of (Team, MCPTools) - MCPTools must be closed when done
+        (unless it was passed in, in which case the caller owns it).
     """
     system_prompt = get_system_prompt()
 
+    # Read-only tool results are shared across members for this session
+    tool_cache = ToolCallCache()
+
     # Create agents (developer with MCP)
-    analyzer = create_analyzer_agent(base_dir)
+    analyzer = create_analyzer_agent(base_dir, tool_cache=tool_cache)
     architect = create_architect_agent()
-    developer, nuxt_mcp = await create_developer_agent_with_mcp(base_dir)
+    developer, nuxt_mcp = await create_developer_agent_with_mcp(
+        base_dir, tool_cache=tool_cache, nuxt_mcp=nuxt_mcp
+    )
 
     # Get model for team orchestration
-    model = get_model()
+    model = get_model(cache_key="team-mcp")
 
     # Storage for sessions
     db = get_database()
@@ -0,0 +1,279 @@
+"""Session-scoped memoization of idempotent tool calls.
+
+Agents in a migration session routinely list the same directories and read
+the same `package.json`/config/layout files several times. `ToolCallCache`
+is installed as an agno tool hook on every member agent: read-only calls are
+served from memory, and a repeat of the same call within the same agent run
+returns a short marker instead of re-sending the full content into context.
+Writes (and any shell command that is not known to be read-only) invalidate
+the affected entries.
+"""
+
+import asyncio
+import json
+import os
+import re
+import shlex
+import threading
+from dataclasses import dataclass, field
+from functools import partial
+from inspect import iscoroutine
+from typing import Any, Callable, Optional
+
+# Tools whose result only depends on their arguments and the file system
+READ_ONLY_TOOLS = {
+    "read_file", "read_bytes", "file_summary", "file_outline", "list_files", "search_code", "find_symbol"
+}
+# Tools that modify files given in their arguments
+WRITE_TOOLS = {"write_file", "edit_file", "replace_in_file", "apply_patch"}
+SHELL_TOOLS = {"run_shell_command"}
+
+# Shell programs that never modify the file system (with the flags below rejected)
+READ_ONLY_COMMANDS = {
+    "cat", "ls", "find", "head", "tail", "grep", "rg", "wc", "tree",
+    "pwd", "stat", "file", "du", "sort", "uniq", "echo",
+}
+_UNSAFE_SHELL_RE = re.compile(r">|`|\$\(|-exec\b|-delete\b|-ok\b|\bsed\s+-i")
+# Options of whitelisted programs that write their output to a file
+_OUTPUT_FILE_OPTIONS = {
+    "sort": re.compile(r"^(--o|-[^-]*o)"),  # GNU accepts abbreviated long options
+    "tree": re.compile(r"^-[^-]*o"),
+    "find": re.compile(r"^-(fprint|fprint0|fprintf|fls)$"),
+}
+_SEGMENT_SPLIT_RE = re.compile(r"\|\||&&|[|;]")
+
+_invalidation_listeners: list[Callable[[Optional[list[str]]], None]] = []
+
+UNCHANGED_MARKER = "[unchanged since earlier {name} call with the same arguments; see that result above]"
+
+
+@dataclass
+class CacheEntry:
+    """A memoized tool result."""
+
+    result: str
+    paths: list[str]
+    runs: set = field(default_factory=set)
+
+
+def _normalize_path(path: str) -> str:
+    """Resolve a path argument to an absolute, normalized path."""
+    return os.path.normpath(os.path.abspath(os.path.expanduser(path)))
+
+
+def _shell_command_text(arguments: dict) -> Optional[str]:
+    """Extract the command string from either shell tool signature."""
+    if "command" in arguments:
+        return str(arguments["command"])
+    if "args" in arguments:
+        args = arguments["args"]
+        return " ".join(args) if isinstance(args, list) else str(args)
+    return None
+
+
+def is_read_only_command(command: str) -> bool:
+    """Return True if every segment of a shell command is a whitelisted read."""
+    if _UNSAFE_SHELL_RE.search(command):
+        return False
+    for segment in _SEGMENT_SPLIT_RE.split(command):
+        try:
+            words = shlex.split(segment)
+        except ValueError:
+            return False
+        if not words:
+            continue
+        program = os.path.basename(words[0])
+        if program not in READ_ONLY_COMMANDS:
+            return False
+        writes_file = _OUTPUT_FILE_OPTIONS.get(program)
+        if writes_file and any(writes_file.match(word) for word in words[1:]):
+            return False
+        # `uniq INPUT OUTPUT` writes its second operand
+        if program == "uniq" and len([word for word in words[1:] if not word.startswith("-")]) > 1:
+            return False
+    return True
+
+
+def _shell_paths(command: str) -> list[str]:
+    """Best-effort list of path operands in a read-only shell command."""
+    paths = []
+    for segment in _SEGMENT_SPLIT_RE.split(command):
+        try:
+            words = shlex.split(segment)
+        except ValueError:
+            continue
+        operands = [w for w in words[1:] if not w.startswith("-")]
+        paths.extend(_normalize_path(w) for w in operands if os.path.exists(w))
+    # A bare `ls`/`find` reads the current directory
+    return paths or [_normalize_path(".")]
+
+
+def _argument_paths(arguments: dict, base_dir: Optional[str] = None) -> list[str]:
+    """Collect the file system paths a read/write tool call touches.
+
+    Args:
+        arguments: The tool call arguments.
+        base_dir: Directory the toolkit resolves relative paths against, if known.
+    """
+    directory = arguments.get("directory") or arguments.get("path")
+    filename = arguments.get("filename") or arguments.get("target_file") or arguments.get("file_path")
+    if base_dir is not None:
+        directory = os.path.join(base_dir, directory) if directory else base_dir
+    if filename and directory and not os.path.isabs(filename):
+        return [_normalize_path(os.path.join(directory, filename))]
+    return [_normalize_path(p) for p in (filename, directory) if p]
+
+
+def on_invalidate(callback: Callable[[Optional[list[str]]], None]):
+    """Call `callback(paths)` whenever a cache sees files change (`None`: anything may have changed)."""
+    _invalidation_listeners.append(callback)
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """True if one path is the other or contains it."""
+    return a == b or a.startswith(b.rstrip(os.sep) + os.sep) or b.startswith(a.rstrip(os.sep) + os.sep)
+
+
+class ToolCallCache:
+    """Memoizes read-only tool calls for the lifetime of one migration session."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(function_name: str, arguments: dict, base_dir: Optional[str] = None) -> str:
+        """Build a stable key for a tool call.
+
+        The same relative arguments name different files for toolkits rooted
+        in different directories (source project vs. output project).
+        """
+        payload = json.dumps(arguments, sort_keys=True, default=str)
+        root = _normalize_path(base_dir) if base_dir is not None else ""
+        return f"{function_name}:{root}:{payload}"
+
+    def for_directory(self, base_dir: str, asynchronous: bool = False) -> Callable:
+        """Tool hook for an agent whose toolkits resolve relative paths against `base_dir`.
+
+        Args:
+            base_dir: The agent's file tool base directory.
+            asynchronous: Return the async hook (agents with MCP tools).
+        """
+        return partial(self.ahook if asynchronous else self.hook, base_dir=base_dir)
+
+    def _classify(self, function_name: str, arguments: dict, base_dir: Optional[str] = None) -> tuple[str, list[str]]:
+        """Return ('read' | 'write' | 'opaque' | 'other', affected paths) for a call."""
+        if function_name in READ_ONLY_TOOLS:
+            return "read", _argument_paths(arguments, base_dir)
+        if function_name in WRITE_TOOLS:
+            # Relative filenames without a directory land in the toolkit's
+            # target directory, which we cannot see: invalidate everything.
+            filename = arguments.get("filename") or arguments.get("target_file") or arguments.get("file_path") or ""
+            if not arguments.get("directory") and not os.path.isabs(filename):
+                return "write", []
+            return "write", _argument_paths(arguments)
+        if function_name in SHELL_TOOLS:
+            command = _shell_command_text(arguments)
+            if command and is_read_only_command(command):
+                return "read", _shell_paths(command)
+            return "opaque", []
+        return "other", []
+
+    def invalidate(self, paths: Optional[list[str]] = None):
+        """Drop cached entries touching any of `paths` (or everything if None)."""
+        with self._lock:
+            if paths is None:
+                self._entries.clear()
+            else:
+                stale = [
+                    key
+                    for key, entry in self._entries.items()
+                    if not entry.paths or any(_overlaps(p, q) for p in paths for q in entry.paths)
+                ]
+                for key in stale:
+                    del self._entries[key]
+        for callback in _invalidation_listeners:
+            callback(paths)
+
+    def _lookup(self, key: str, run_id: Optional[str]) -> Optional[str]:
+        """Return the cached result or an unchanged-marker, recording the run."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if run_id is not None and run_id in entry.runs:
+                name = key.split(":", 1)[0]
+                return UNCHANGED_MARKER.format(name=name)
+            entry.runs.add(run_id)
+            return entry.result
+
+    def _store(self, key: str, result: Any, paths: list[str], run_id: Optional[str]):
+        """Remember a fresh read-only result."""
+        if not isinstance(result, str) or result.startswith(("Error", "File not found")):
+            return
+        with self._lock:
+            self._entries[key] = CacheEntry(result=result, paths=paths, runs={run_id})
+
+    def hook(
+        self, function_name: str, function_call: Callable, arguments: dict, run_context=None, base_dir=None
+    ) -> Any:
+        """Agno tool hook for agents whose tools are all synchronous."""
+        kind, paths = self._classify(function_name, arguments, base_dir)
+        run_id = getattr(run_context, "run_id", None)
+
+        if kind == "read":
+            key = self._key(function_name, arguments, base_dir)
+            cached = self._lookup(key, run_id)
+            if cached is not None:
+                return cached
+            result = function_call(**arguments)
+            self._store(key, result, paths, run_id)
+            return result
+
+        result = function_call(**arguments)
+        if kind == "write":
+            self.invalidate(paths or None)
+        elif kind == "opaque":
+            self.invalidate()
+        return result
+
+    async def ahook(
+        self, function_name: str, function_call: Callable, arguments: dict, run_context=None, base_dir=None
+    ) -> Any:
+        """Agno tool hook for agents that also carry async tools (e.g. MCP)."""
+        kind, paths = self._classify(function_name, arguments, base_dir)
+        run_id = getattr(run_context, "run_id", None)
+
+        if kind == "read":
+            key = self._key(function_name, arguments, base_dir)
+            cached = self._lookup(key, run_id)
+            if cached is not None:
+                return cached
+
+        result = function_call(**arguments)
+        if iscoroutine(result):
+            if kind == "other":
+                result = await result
+            else:
+                # The file/shell/search tools we track are synchronous; with an
+                # async hook agno would run them on the event loop, so push
+                # them to a worker thread to keep concurrent calls concurrent.
+                result = await asyncio.to_thread(asyncio.run, result)
+
+        if kind == "read":
+            self._store(key, result, paths, run_id)
+        elif kind == "write":
+            self.invalidate(paths or None)
+        elif kind == "opaque":
+            self.invalidate()
+        return result
+
+    def stats(self) -> dict:
+        """Hit/miss counters for reporting."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -0,0 +1,37 @@
+"""Record/replay fixtures for the scenario suite.
+
+Every scenario test runs inside a cassette stored in `tests/cassettes/` and,
+by default, replays it strictly: no network, no API spend, no shell commands
+and identical model output on every run. A test without a cassette is skipped.
+Set `PIXEL_PERFECT_CASSETTES` to `record` (refresh with live calls and real
+tool runs) or `auto` (record only new requests).
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.cassettes import REPLAY, use_cassette
+
+CASSETTE_DIR = Path(__file__).parent.parent / "cassettes"
+
+# litellm (used by Scenario) otherwise downloads its model price map on import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+@pytest.fixture(autouse=True)
+def cassette(request, monkeypatch):
+    """Run the test against its cassette."""
+    path = CASSETTE_DIR / f"{request.node.name}.json"
+    mode = os.environ.get("PIXEL_PERFECT_CASSETTES") or REPLAY
+    if mode == REPLAY:
+        if not path.exists():
+            pytest.skip(f"No cassette {path.name}; record it with PIXEL_PERFECT_CASSETTES=record")
+        # SDKs refuse to build clients without a key, even though nothing is sent
+        monkeypatch.setenv("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY") or "sk-replay")
+        monkeypatch.delenv("LANGWATCH_API_KEY", raising=False)
+
+    with use_cassette(path, mode) as active:
+        yield active
+    assert not active.misses, f"Requests missing from {path.name}: {active.misses}"
@@ -0,0 +1,114 @@
+"""Unit tests for sharded project analysis."""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from agno.run.base import RunStatus
+
+from app.analysis import AnalysisError, Shard, analyze_project, classify, merge_reports, shard_project
+
+
+def make_tree(root: Path, paths: list[str]):
+    for path in paths:
+        file = root / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text("export {}\n")
+
+
+def test_classify_by_first_area_directory():
+    assert classify("package.json") == "config"
+    assert classify("apps/web/next.config.mjs") == "config"
+    assert classify("apps/web/pages/index.tsx") == "routes"
+    assert classify("src/app/dashboard/page.tsx") == "routes"
+    assert classify("packages/ui/src/Button.tsx") == "components"
+    assert classify("src/components/nav/Nav.tsx") == "components"
+    assert classify("src/styles/globals.css") == "styles"
+    assert classify("src/hooks/useCart.ts") == "lib"
+    assert classify("src/middleware.ts") == "routes"
+    assert classify("src/data/posts.md") is None
+
+
+def test_shard_project_splits_large_areas(tmp_path):
+    make_tree(tmp_path, ["package.json", "pages/index.js", "styles/a.css"] + [f"components/C{i}.js" for i in range(5)])
+    (tmp_path / "node_modules" / "react").mkdir(parents=True)
+    (tmp_path / "node_modules" / "react" / "index.js").write_text("")
+    shards = shard_project(str(tmp_path), max_files=2)
+    assert [(s.title, len(s.files)) for s in shards] == [
+        ("Routes", 1),
+        ("Components (1/3)", 2),
+        ("Components (2/3)", 2),
+        ("Components (3/3)", 1),
+        ("Styles", 1),
+        ("Config", 1),
+    ]
+    assert shard_project(str(tmp_path / "missing")) == []
+
+
+def test_merge_is_ordered_and_nests_headings():
+    config = Shard("config", ["package.json"])
+    routes = Shard("routes", ["pages/index.js"])
+    merged = merge_reports([(config, "# Deps\nnext 14"), (routes, "# Pages\n```sh\n# not a heading\n```")])
+    assert merged == merge_reports([(routes, "# Pages\n```sh\n# not a heading\n```"), (config, "# Deps\nnext 14")])
+    assert merged.index("## Routes") < merged.index("## Config")
+    assert "### Pages" in merged and "### Deps" in merged
+    assert "\n# not a heading" in merged
+
+
+def test_analyze_project_runs_shards_concurrently(tmp_path):
+    make_tree(tmp_path, ["package.json", "pages/index.js", "components/Button.js", "lib/api.js"])
+    state = SimpleNamespace(in_flight=0, max_in_flight=0, prompts=[])
+
+    class FakeAnalyzer:
+        async def arun(self, prompt):
+            state.prompts.append(prompt)
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            await asyncio.sleep(0.01)
+            state.in_flight -= 1
+            area = prompt.split(" area")[0].rsplit(" ", 1)[-1]
+            return SimpleNamespace(content=f"# Findings\n{area} report", status="COMPLETED")
+
+    report, responses = asyncio.run(analyze_project(str(tmp_path), FakeAnalyzer, log=lambda text: None))
+    assert len(responses) == 4
+    assert state.max_in_flight == 4
+    assert any("- components/Button.js" in p and "pages/index.js" not in p for p in state.prompts)
+    assert [line for line in report.splitlines() if line.startswith("## ")] == [
+        "## Routes", "## Components", "## Lib", "## Config",
+    ]
+    assert "Components report" in report
+
+
+def test_analyze_project_leaves_out_failed_shards(tmp_path):
+    make_tree(tmp_path, ["package.json", "pages/index.js", "components/Button.js"])
+    logs = []
+
+    class FakeAnalyzer:
+        async def arun(self, prompt):
+            if "components" in prompt.split(" area")[0].lower():
+                return SimpleNamespace(content="rate limit exceeded", status=RunStatus.error)
+            if "config" in prompt.split(" area")[0].lower():
+                raise ConnectionError("connection reset")
+            return SimpleNamespace(content="# Findings\nroutes report", status=RunStatus.completed)
+
+    report, responses = asyncio.run(analyze_project(str(tmp_path), FakeAnalyzer, log=logs.append))
+    assert len(responses) == 2
+    assert "routes report" in report
+    assert "rate limit" not in report
+    assert "Not analyzed (the Analyzer run failed): Components, Config." in report
+    assert [line for line in report.splitlines() if line.startswith("## ")] == ["## Routes"]
+    assert "  ✓ Routes: 1 files" in logs
+    assert "  ✗ Components: rate limit exceeded" in logs
+    assert "  ✗ Config: connection reset" in logs
+
+
+def test_analyze_project_raises_when_every_shard_fails(tmp_path):
+    make_tree(tmp_path, ["package.json", "pages/index.js"])
+
+    class FakeAnalyzer:
+        async def arun(self, prompt):
+            return SimpleNamespace(content="invalid api key", status=RunStatus.error)
+
+    with pytest.raises(AnalysisError, match="all 2 shards"):
+        asyncio.run(analyze_project(str(tmp_path), FakeAnalyzer, log=lambda text: None))
@@ -0,0 +1,92 @@
+"""Unit tests for the deterministic JSX -> Vue codemod."""
+
+from pathlib import Path
+
+import pytest
+
+from app.codemod import UnsupportedComponent, convert_component, convert_file, is_eligible
+from app.schemas import FileMigration
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "next_app"
+
+
+def test_converts_fixture_button():
+    vue = convert_component((FIXTURES / "components" / "Button.js").read_text())
+    assert "defineProps({\n  label: null,\n})" in vue
+    assert '<button class="btn-primary">{{ label }}</button>' in vue
+
+
+def test_converts_conditionals_lists_links_and_state():
+    vue = convert_component(
+        """
+import { useState } from 'react';
+import Link from 'next/link';
+
+const Menu = ({ items = [], open = false, children }) => {
+  const [expanded, setExpanded] = useState(open);
+  return (
+    <nav>
+      <button onClick={() => setExpanded(!expanded)}>Menu</button>
+      {expanded && (
+        <ul>
+          {items.map((item) => (
+            <li key={item.href}>
+              <Link href={item.href}>{item.label}</Link>
+            </li>
+          ))}
+        </ul>
+      )}
+      {items.length ? <p>{items.length} items</p> : <p>Don't panic</p>}
+      {children}
+    </nav>
+  );
+};
+
+export default Menu;
+"""
+    )
+    assert "items: { default: () => ([]) }," in vue
+    assert "const expanded = ref(props.open)" in vue
+    assert '<button @click="expanded = !expanded">Menu</button>' in vue
+    assert '<ul v-if="expanded">' in vue
+    assert '<li v-for="item in items" :key="item.href">' in vue
+    assert '<NuxtLink :to="item.href">{{ item.label }}</NuxtLink>' in vue
+    assert '<p v-else>Don\'t panic</p>' in vue
+    assert "<slot />" in vue
+
+
+def test_nested_component_imports_are_kept_explicit():
+    vue = convert_component(
+        "import Header from '../components/layout/Header';\n"
+        "import Button from '../components/Button';\n"
+        "export default function Page() { return <main><Header /><Button /></main>; }"
+    )
+    # Nuxt registers components/layout/Header.vue as LayoutHeader, so `<Header />` needs the import
+    assert "<script setup>\nimport Header from '~/components/layout/Header.vue'\n</script>" in vue
+    assert "Button from" not in vue
+    assert "<Header />" in vue and "<Button />" in vue
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "import { useEffect } from 'react';\nexport default function A() { return <div />; }",
+        "import Header from './Header';\nexport default function A() { return <Header />; }",
+        "import axios from 'axios';\nexport default function A() { return <div />; }",
+        "export default function A(props) { return <div>{props.x}</div>; }",
+        "export default function A({ x }) { return <div {...x} />; }",
+        "export default function A({ x }) { return <div>{x.map(y => { return <i>{y}</i>; })}</div>; }",
+        "export async function getServerSideProps() {}\nexport default function A() { return <div />; }",
+    ],
+)
+def test_unsupported_components_are_rejected(source):
+    with pytest.raises(UnsupportedComponent):
+        convert_component(source)
+
+
+def test_convert_file_reports_reason(tmp_path):
+    assert convert_file(str(FIXTURES / "pages" / "index.js"), str(tmp_path / "pages" / "index.vue")) is None
+    assert "<Button label=\"Click me\" />" in (tmp_path / "pages" / "index.vue").read_text()
+    assert convert_file(str(tmp_path / "missing.js"), str(tmp_path / "out.vue")) is not None
+    assert is_eligible(FileMigration(source_path="a.jsx", target_path="a.vue", action="convert", description=""))
+    assert not is_eligible(FileMigration(source_path="a.tsx", target_path="a.vue", action="convert", description=""))
@@ -0,0 +1,74 @@
+"""Unit tests for the daemon socket protocol."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app import daemon
+from app.daemon import MigrationDaemon
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    """Serve a daemon with a fake analyze job on a temporary socket."""
+    socket_path = tmp_path / "d.sock"
+    server = MigrationDaemon(socket_path=socket_path, mcp=False)
+
+    async def warm_up():
+        pass
+
+    async def fake_analyze(args, writer):
+        async with server._progress(writer) as log:
+            log("  ✓ Routes: 3 files")
+            await asyncio.sleep(0)
+            log("  ✓ Config: 1 files")
+        await server._send(writer, {"type": "output", "text": f"analyzed {args['repo']}"})
+
+    monkeypatch.setattr(server, "warm_up", warm_up)
+    monkeypatch.setattr(server, "_run_analyze", fake_analyze)
+
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon.is_running(socket_path):
+            break
+        thread.join(0.02)
+    yield socket_path
+    if daemon.is_running(socket_path):
+        daemon.request({"command": "shutdown"}, socket_path=socket_path)
+    thread.join(5)
+
+
+def test_not_running(tmp_path):
+    assert not daemon.is_running(tmp_path / "missing.sock")
+    with pytest.raises(daemon.DaemonError):
+        daemon.request({"command": "ping"}, socket_path=tmp_path / "missing.sock")
+
+
+def test_job_streams_events(running_daemon):
+    events = []
+    result = daemon.request(
+        {"command": "analyze", "args": {"repo": "/src"}}, on_event=events.append, socket_path=running_daemon
+    )
+    assert result["ok"]
+    assert events == [
+        {"type": "progress", "text": "  ✓ Routes: 3 files"},
+        {"type": "progress", "text": "  ✓ Config: 1 files"},
+        {"type": "output", "text": "analyzed /src"},
+    ]
+
+
+def test_unknown_command(running_daemon):
+    result = daemon.request({"command": "bogus"}, socket_path=running_daemon)
+    assert not result["ok"]
+    assert "Unknown command" in result["error"]
+
+
+def test_shutdown_removes_socket(running_daemon):
+    daemon.request({"command": "shutdown"}, socket_path=running_daemon)
+    for _ in range(100):
+        if not running_daemon.exists():
+            break
+        threading.Event().wait(0.02)
+    assert not running_daemon.exists()
@@ -0,0 +1,53 @@
+"""Unit tests for typecheck diagnostic parsing."""
+
+from app.diagnostics import excerpt, group_by_file, parse_diagnostics
+
+PRETTY = (
+    "\x1b[96mapp/pages/index.vue\x1b[0m:\x1b[93m12\x1b[0m:\x1b[93m5\x1b[0m - \x1b[91merror\x1b[0m"
+    "\x1b[90m TS2322: \x1b[0mType 'string' is not assignable to type 'number'.\n"
+    "\n"
+    "\x1b[7m12\x1b[0m     count.value = 'a'\n"
+    "\x1b[7m  \x1b[0m     ~~~~~~~~~~~\n"
+    "\n"
+    "app/components/Card.vue:3:1 - error TS2345: Argument of type 'A' is not assignable to parameter of type 'B'.\n"
+    "  Property 'id' is missing in type 'A' but required in type 'B'.\n"
+    "\n"
+    "Found 2 errors in 2 files.\n"
+)
+
+PLAIN = (
+    "app/components/Card.vue(3,1): error TS2345: Argument of type 'A' is not assignable.\n"
+    "  Property 'id' is missing.\n"
+    "app/components/Card.vue(9,14): error TS2304: Cannot find name 'useFoo'.\n"
+    "/root/out/app/components/Card.vue(9,14): error TS2304: Cannot find name 'useFoo'.\n"
+    "node_modules/x/index.d.ts(1,1): error TS1005: ';' expected.\n"
+    "app/app.vue(1,1): warning TS6133: 'x' is declared but never used.\n"
+)
+
+
+def test_parse_pretty_output():
+    diagnostics = parse_diagnostics(PRETTY, "/root/out")
+    assert [(d.file, d.line, d.column, d.code) for d in diagnostics] == [
+        ("app/pages/index.vue", 12, 5, "TS2322"),
+        ("app/components/Card.vue", 3, 1, "TS2345"),
+    ]
+    # The message chain is joined; the code frame is not part of it
+    assert diagnostics[1].message.endswith("Property 'id' is missing in type 'A' but required in type 'B'.")
+    assert "~~~" not in diagnostics[0].message
+
+
+def test_plain_output_is_grouped_by_file():
+    diagnostics = parse_diagnostics(PLAIN, "/root/out")
+    assert len(diagnostics) == 4  # The absolute-path duplicate is dropped
+    groups = group_by_file(diagnostics)
+    assert list(groups) == ["app/components/Card.vue"]
+    assert [d.code for d in groups["app/components/Card.vue"]] == ["TS2345", "TS2304"]
+    assert groups["app/components/Card.vue"][0].message == "Argument of type 'A' is not assignable. Property 'id' is missing."
+
+
+def test_excerpt_merges_nearby_errors():
+    text = "\n".join(f"line {n}" for n in range(1, 31))
+    diagnostics = parse_diagnostics("a.ts(5,1): error TS1: x\na.ts(8,1): error TS2: y\na.ts(25,1): error TS3: z\n")
+    lines = excerpt(text, diagnostics, context=2).splitlines()
+    assert lines[0] == "    3: line 3" and "   10: line 10" in lines
+    assert "  ..." in lines and lines[-1] == "   27: line 27"
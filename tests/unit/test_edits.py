@@ -0,0 +1,113 @@
+"""Unit tests for the local search/replace and unified-diff edit tools."""
+
+import pytest
+
+from app.edits import EditError, FileEditTools, Hunk, apply_hunks, parse_unified_diff
+
+SFC = """<script setup lang="ts">
+const props = defineProps<{ title: string }>()
+const count = ref(0)
+</script>
+
+<template>
+  <div class="card">
+    <h1>{{ props.title }}</h1>
+    <button @click="count++">{{ count }}</button>
+  </div>
+</template>
+"""
+
+
+@pytest.fixture
+def tools(tmp_path):
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "Card.vue").write_text(SFC)
+    return FileEditTools(base_dir=str(tmp_path))
+
+
+def test_replace_exact_and_reindented(tools, tmp_path):
+    result = tools.replace_in_file("components/Card.vue", "const count = ref(0)", "const count = ref<number>(0)")
+    assert result.startswith("Edited")
+
+    # The model dropped the template indentation; the replacement is re-indented to fit
+    tools.replace_in_file("components/Card.vue", "<h1>{{ props.title }}</h1>", "<h2>{{ props.title }}</h2>")
+    text = (tmp_path / "components" / "Card.vue").read_text()
+    assert "ref<number>(0)" in text
+    assert "    <h2>{{ props.title }}</h2>\n" in text
+
+
+def test_fuzzy_anchor_and_rejections():
+    # A small typo in the quoted line still anchors
+    fuzzy = apply_hunks(SFC, [Hunk(['<button @click="count ++">{{ count }}</button>'], ["<button />"])])
+    assert "    <button />" in fuzzy.split("\n")
+
+    with pytest.raises(EditError, match="Closest match"):
+        apply_hunks(SFC, [Hunk(["const total = computed(() => 1)"], [""])])
+    with pytest.raises(EditError, match="matches 2 places"):
+        apply_hunks("a\nb\na\n", [Hunk(["a"], ["c"])])
+    # A diff line hint picks the nearer of two identical blocks
+    assert apply_hunks("a\nb\na\n", [Hunk(["a"], ["c"], line=3)]) == "a\nb\nc\n"
+
+
+def test_apply_unified_diff(tools, tmp_path):
+    patch = """--- a/components/Card.vue
++++ b/components/Card.vue
+@@ -2,2 +2,2 @@
+ const props = defineProps<{ title: string }>()
+-const count = ref(0)
++const count = ref(1)
+@@ -9,1 +9,2 @@
+     <button @click="count++">{{ count }}</button>
++    <slot />
+--- /dev/null
++++ b/components/Empty.vue
+@@ -0,0 +1,1 @@
++<template><div /></template>
+"""
+    assert tools.apply_patch(patch).startswith("Patched")
+    text = (tmp_path / "components" / "Card.vue").read_text()
+    assert "ref(1)" in text and "    <slot />\n  </div>" in text
+    assert (tmp_path / "components" / "Empty.vue").read_text() == "<template><div /></template>\n"
+
+
+def test_failed_hunk_writes_nothing(tools, tmp_path):
+    patch = """--- a/components/Card.vue
++++ b/components/Card.vue
+@@ -2,1 +2,1 @@
+-const count = ref(0)
++const count = ref(1)
+@@ -20,1 +20,1 @@
+-const missing = useMissing()
++const missing = null
+"""
+    result = tools.apply_patch(patch)
+    assert result.startswith("Rejected: components/Card.vue: Hunk 2")
+    assert (tmp_path / "components" / "Card.vue").read_text() == SFC
+    with pytest.raises(EditError, match="No unified diff"):
+        parse_unified_diff("just some text")
+
+
+def test_deletion_patch_must_match_current_content(tools, tmp_path):
+    (tmp_path / "components" / "Old.vue").write_text("<template>\n  <div />\n</template>\n")
+    stale = "--- a/components/Old.vue\n+++ /dev/null\n@@ -1,2 +0,0 @@\n-<template>\n-  <span />\n"
+    assert tools.apply_patch(stale).startswith("Rejected: components/Old.vue: The deletion patch")
+    assert (tmp_path / "components" / "Old.vue").exists()
+
+    current = "--- a/components/Old.vue\n+++ /dev/null\n@@ -1,3 +0,0 @@\n-<template>\n-  <div />\n-</template>\n"
+    assert tools.apply_patch(current).startswith("Patched")
+    assert not (tmp_path / "components" / "Old.vue").exists()
+
+
+def test_dev_null_on_both_sides_is_an_error(tools):
+    patch = "--- /dev/null\n+++ /dev/null\n@@ -0,0 +1,1 @@\n+orphan\n"
+    assert tools.apply_patch(patch).startswith("Error: a file header has /dev/null as both")
+
+
+def test_paths_outside_the_project_are_refused(tools, tmp_path):
+    outside = tmp_path.parent / f"{tmp_path.name}-outside.txt"
+    outside.write_text("keep\n")
+    assert "outside the project directory" in tools.replace_in_file(f"../{outside.name}", "keep", "gone")
+    patch = f"--- a/{outside}\n+++ /dev/null\n@@ -1,1 +0,0 @@\n-keep\n"
+    assert "outside the project directory" in tools.apply_patch(patch)
+    assert outside.read_text() == "keep\n"
+    outside.unlink()
@@ -0,0 +1,65 @@
+"""Unit tests for the pre-flight migration estimator."""
+
+from pathlib import Path
+
+import pytest
+
+from app import checkpoints
+from app.checkpoints import SessionCheckpoint
+from app.estimate import calibration, estimate_migration, scan_project
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "next_app"
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "SESSIONS_DIR", tmp_path / "sessions")
+
+
+def test_scan_classifies_fixture():
+    scan = scan_project(str(FIXTURES))
+    kinds = {f.path: f.kind for f in scan.files}
+    assert kinds == {"components/Button.js": "component", "pages/index.js": "page"}
+    assert scan.routes == 1
+    assert all(f.codemod for f in scan.files)
+
+
+def test_scan_without_inspect_collects_sizes_only():
+    full, light = scan_project(str(FIXTURES)), scan_project(str(FIXTURES), inspect=False)
+    assert [(f.path, f.kind, f.size) for f in light.files] == [(f.path, f.kind, f.size) for f in full.files]
+    assert not any(f.codemod or f.complexity for f in light.files)
+
+
+def test_codemod_files_and_cheaper_providers_cost_less(tmp_path):
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "index.js").write_text(
+        "import { useEffect } from 'react';\n"
+        "export default function Home() { useEffect(() => {}, []); return <div />; }\n" * 20
+    )
+    scan = scan_project(str(tmp_path))
+    assert not scan.files[0].codemod
+
+    simple = estimate_migration(scan_project(str(FIXTURES)), "openai")
+    complex_ = estimate_migration(scan, "openai")
+    assert complex_.tokens > simple.tokens
+    assert estimate_migration(scan, "google").cost < complex_.cost
+    assert estimate_migration(scan, "openai", concurrency=1).seconds >= complex_.seconds
+
+
+def test_calibration_uses_completed_sessions():
+    scan = scan_project(str(FIXTURES))
+    raw = estimate_migration(scan, "openai", calibrate=False)
+    for session_id, stage in (("done", "complete"), ("partial", "develop")):
+        checkpoint = SessionCheckpoint(session_id)
+        checkpoint.set_estimate(raw.to_dict())
+        checkpoint.add_usage(input_tokens=raw.input_tokens * 2, output_tokens=raw.output_tokens * 2, seconds=raw.seconds / 2)
+        checkpoint.set_stage(stage)
+
+    token_factor, time_factor, runs = calibration("openai")
+    assert runs == 1
+    assert token_factor == pytest.approx(2, rel=0.01)
+    assert time_factor == pytest.approx(0.5, rel=0.01)
+
+    calibrated = estimate_migration(scan, "openai")
+    assert calibrated.tokens == pytest.approx(raw.tokens * 2, rel=0.01)
+    assert calibration("anthropic") == (1.0, 1.0, 0)
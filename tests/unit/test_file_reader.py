@@ -0,0 +1,97 @@
+"""Unit tests for bounded, memory-mapped file reads."""
+
+import json
+
+import pytest
+
+from app import file_reader
+from app.file_reader import FileReadTools, MappedFile
+
+
+@pytest.fixture
+def tools(tmp_path):
+    return FileReadTools(base_dir=str(tmp_path), page_threshold=4096)
+
+
+def test_read_file_windows_and_continuation(tmp_path, tools, monkeypatch):
+    monkeypatch.setattr(file_reader, "LINE_INDEX_STEP", 16)
+    (tmp_path / "small.ts").write_text("".join(f"const v{i} = {i}\n" for i in range(1, 101)))
+
+    first = tools.read_file("small.ts", num_lines=10)
+    assert "lines 1-10 of 100" in first
+    assert "    10: const v10 = 10" in first
+    assert "continue with start_line=11" in first
+
+    window = tools.read_file("small.ts", start_line=95, num_lines=10)
+    assert "lines 95-100 of 100" in window
+    assert "continue" not in window
+    # Offsets found on the way are reused by later calls
+    assert len(tools._line_indexes) == 1
+
+    assert "past the end" in tools.read_file("small.ts", start_line=500)
+    assert "cannot read" in tools.read_file("missing.ts")
+
+
+def test_large_file_opens_with_summary(tmp_path, tools):
+    (tmp_path / "types.ts").write_text("".join(f"export type T{i} = string\n" for i in range(1, 2001)))
+
+    summary = tools.read_file("types.ts")
+    assert "2000 lines" in summary
+    assert "     1: export type T1 = string" in summary
+    assert "  2000: export type T2000 = string" in summary
+    assert "T500 " not in summary
+    assert "page through it with start_line" in summary
+
+    assert "lines 500-501" in tools.read_file("types.ts", start_line=500, num_lines=2)
+
+
+def test_long_lines_are_clipped_and_readable_by_bytes(tmp_path, tools):
+    bundle = "var a=1;" * 5000
+    (tmp_path / "bundle.min.js").write_text(bundle + "\n")
+
+    window = tools.read_file("bundle.min.js", start_line=1)
+    assert len(window) < file_reader.MAX_LINE_CHARS + 200
+    assert "line is 40000 bytes; use read_bytes offset=0" in window
+
+    chunk = tools.read_bytes("bundle.min.js", offset=8, length=16)
+    assert chunk.endswith("var a=1;var a=1;\n… continue with offset=24")
+
+
+def test_json_outline_reports_structure(tmp_path, tools):
+    data = {"name": "app", "pages": [{"id": i, "tags": ["a", "b"]} for i in range(50)], "empty": {}, "ids": [1]}
+    (tmp_path / "data.json").write_text(json.dumps(data, indent=2))
+
+    outline = tools.file_outline("data.json").splitlines()
+    entries = [line.split(": ", 1)[1] for line in outline[1:]]
+    assert entries == [
+        "(root): object (4 keys)",
+        "  pages: array (50 items)",
+        "    [item]: object (2 keys)",
+        "  empty: object (0 keys)",
+        "  ids: array (1 items)",
+    ]
+    assert outline[2].startswith("3: ")
+
+
+def test_script_outline_lists_top_level_declarations(tmp_path, tools):
+    (tmp_path / "api.ts").write_text(
+        "import x from 'x'\n\nexport interface User {\n  id: string\n}\n\n"
+        "export async function getUser() {\n  const inner = 1\n}\n"
+    )
+    outline = tools.file_outline("api.ts")
+    assert "3: interface User" in outline
+    assert "7: function getUser" in outline
+    assert "inner" not in outline
+
+
+def test_mapped_file_tail_and_empty(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("one\ntwo\nthree")
+    mapped = MappedFile(path)
+    assert mapped.count_lines() == 3
+    assert mapped.tail(2) == (2, ["two", "three"])
+    assert mapped.tail(10) == (1, ["one", "two", "three"])
+    mapped.close()
+
+    (tmp_path / "empty.txt").write_text("")
+    assert MappedFile(tmp_path / "empty.txt").line_offset(1) is None
@@ -0,0 +1,136 @@
+"""Unit tests for the local OpenAI-compatible provider, against stub servers."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from agno.agent import Agent
+
+from app import cli_config
+from app.local_provider import LocalOpenAI, get_pool
+
+
+class StubServer:
+    """Minimal OpenAI chat completions server that tracks concurrent requests."""
+
+    def __init__(self, name: str, delay: float = 0.05):
+        self.name = name
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, payload: dict):
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._send({"object": "list", "data": [{"id": "stub", "object": "model"}]})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                with stub.lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+                self._send({
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "stub",
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": f"hello from {stub.name}"},
+                    }],
+                    "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+                })
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def servers():
+    stubs = [StubServer("a"), StubServer("b")]
+    yield stubs
+    for stub in stubs:
+        stub.close()
+
+
+def dead_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+
+
+def test_agent_runs_against_local_endpoint(servers):
+    model = LocalOpenAI(id="stub", endpoints=[{"url": servers[0].url}])
+    response = asyncio.run(Agent(model=model).arun("hi"))
+    assert response.content == "hello from a"
+    assert response.metrics.input_tokens == 5
+
+
+def test_requests_are_balanced_within_concurrency_limits(servers):
+    endpoints = [{"url": s.url, "max_concurrency": 2} for s in servers]
+    client = LocalOpenAI(id="stub", endpoints=endpoints).get_async_client()
+
+    async def main():
+        calls = [client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "hi"}])
+                 for _ in range(8)]
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(main())
+    assert len(results) == 8
+    assert sum(s.requests for s in servers) == 8 and min(s.requests for s in servers) >= 2
+    assert all(s.max_in_flight <= 2 for s in servers)
+    assert all(e.in_flight == 0 for e in get_pool(endpoints).endpoints)
+
+
+def test_unreachable_endpoint_fails_over_and_is_marked_down(servers):
+    endpoints = [{"url": dead_url()}, {"url": servers[0].url}]
+    client = LocalOpenAI(id="stub", endpoints=endpoints).get_client()
+    for _ in range(3):
+        client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "hi"}])
+    assert servers[0].requests == 3
+    dead, live = get_pool(endpoints).endpoints
+    assert not dead.healthy and dead.failures == 1
+    assert get_pool(endpoints).check_health(timeout=1) == {dead.url: False, live.url: True}
+
+
+def test_endpoints_from_config_and_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli_config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(cli_config, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.delenv(cli_config.LOCAL_ENDPOINTS_ENV, raising=False)
+    assert cli_config.get_endpoints() == [{"url": cli_config.DEFAULT_LOCAL_URL, "max_concurrency": 8}]
+
+    monkeypatch.setenv(cli_config.LOCAL_ENDPOINTS_ENV, "http://a/v1, http://b/v1")
+    assert [e["url"] for e in cli_config.get_endpoints()] == ["http://a/v1", "http://b/v1"]
+
+    cli_config.add_endpoint("http://gpu-1:8000/v1", 16)
+    cli_config.add_endpoint("http://gpu-1:8000/v1", 4)
+    assert cli_config.get_endpoints() == [{"url": "http://gpu-1:8000/v1", "max_concurrency": 4}]
+    cli_config.clear_endpoints()
+    assert len(cli_config.get_endpoints()) == 2
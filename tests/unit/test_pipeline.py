@@ -0,0 +1,243 @@
+"""Unit tests for session checkpoints and the staged migration pipeline."""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app import checkpoints, pipeline
+from app.checkpoints import FILE_DONE, FILE_FAILED, SessionCheckpoint
+from app.diagnostics import TypecheckResult, parse_diagnostics
+from app.schemas import FileMigration, MigrationPlan
+
+PLAN = MigrationPlan(
+    project_name="next_app",
+    summary="Pages to pages, components to components",
+    files_to_migrate=[
+        FileMigration(source_path="pages/index.js", target_path="pages/index.vue", action="convert", description="Home"),
+        FileMigration(
+            source_path="components/Button.js", target_path="components/Button.vue", action="convert", description="UI"
+        ),
+    ],
+    config_changes=[],
+)
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "SESSIONS_DIR", tmp_path / "sessions")
+    return tmp_path / "sessions"
+
+
+class FakeAgent:
+    """Records prompts and returns canned content."""
+
+    def __init__(self, content=None, fail_on=None):
+        self.content = content
+        self.fail_on = fail_on
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def arun(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("model error")
+        return SimpleNamespace(content=self.content or "ok", status="COMPLETED")
+
+
+class FakeArchitect(FakeAgent):
+    """Streams the plan JSON in small chunks, recording when it finished."""
+
+    def __init__(self, plan=PLAN, chunk_size=40):
+        super().__init__()
+        self.plan = plan
+        self.chunk_size = chunk_size
+        self.finished = False
+
+    def arun(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        return self._events()
+
+    async def _events(self):
+        text = self.plan.model_dump_json()
+        for i in range(0, len(text), self.chunk_size):
+            await asyncio.sleep(0.005)
+            yield SimpleNamespace(event="RunContent", content=text[i:i + self.chunk_size])
+        self.finished = True
+        yield SimpleNamespace(event="RunCompleted", content=None)
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    fakes = SimpleNamespace(
+        analyzer=FakeAgent("analysis report"),
+        architect=FakeArchitect(),
+        developer=FakeAgent(),
+    )
+    monkeypatch.setattr(pipeline, "create_analyzer_agent", lambda **kwargs: fakes.analyzer)
+    monkeypatch.setattr(pipeline, "create_architect_agent", lambda: fakes.architect)
+    monkeypatch.setattr(pipeline, "create_developer_agent", lambda *args, **kwargs: fakes.developer)
+
+    async def no_typecheck(root):
+        return None  # Validation falls back to a single Developer run
+
+    monkeypatch.setattr(pipeline, "run_typecheck", no_typecheck)
+    return fakes
+
+
+def run(session_id, **kwargs):
+    kwargs.setdefault("codemod", False)
+    return asyncio.run(
+        pipeline.run_staged_migration("/src", "/out", session_id, use_mcp=False, log=lambda text: None, **kwargs)
+    )
+
+
+def test_checkpoint_versions_and_progress():
+    checkpoint = SessionCheckpoint("s1")
+    assert checkpoint.stage == "analysis"
+    assert checkpoint.save_analysis("first") == 1
+    assert checkpoint.save_analysis("second") == 2
+    checkpoint.save_plan(PLAN)
+    checkpoint.mark_file(PLAN.files_to_migrate[0], FILE_DONE)
+
+    reopened = SessionCheckpoint("s1")
+    assert SessionCheckpoint.exists("s1")
+    assert reopened.analysis == "second"
+    assert reopened.plan == PLAN
+    assert reopened.stage == "develop"
+    assert [f.target_path for f in reopened.pending_files()] == ["components/Button.vue"]
+
+    # Re-planning keeps files that are already done under the same mapping
+    checkpoint.save_plan(PLAN)
+    assert checkpoint.file_status(PLAN.files_to_migrate[0]) == FILE_DONE
+    assert not checkpoint.config_applied
+
+
+def test_full_run_completes(agents):
+    checkpoint = run("s2")
+    assert checkpoint.stage == "complete"
+    assert checkpoint.summary()[FILE_DONE] == 2
+    # Scaffolding, one run per file, config changes and the validation round
+    assert len(agents.developer.prompts) == 5
+    assert "nuxi@latest init" in agents.developer.prompts[0]
+    assert "configuration changes" in agents.developer.prompts[3]
+
+
+def test_files_are_dispatched_while_plan_streams(agents, monkeypatch):
+    dispatched = []
+    original = agents.developer.arun
+
+    async def arun(prompt, stream=False):
+        if "pages/index.js" in prompt:
+            dispatched.append(agents.architect.finished)
+        return await original(prompt)
+
+    monkeypatch.setattr(agents.developer, "arun", arun)
+    run("s7")
+    assert dispatched == [False]
+    # The strategy summary streamed before the files list and reached the prompt
+    assert any(PLAN.summary in p for p in agents.developer.prompts if "pages/index.js" in p)
+
+
+def test_non_streaming_plan_is_dispatched_at_the_end(agents):
+    class StructuredArchitect(FakeArchitect):
+        async def _events(self):
+            yield SimpleNamespace(event="RunCompleted", content=self.plan)
+
+    agents.architect = StructuredArchitect()
+    checkpoint = run("s8")
+    assert checkpoint.stage == "complete"
+    assert checkpoint.summary()[FILE_DONE] == 2
+
+
+def test_files_are_migrated_concurrently(agents):
+    run("s5", concurrency=2)
+    assert agents.developer.max_in_flight == 2
+
+
+def test_concurrency_one_is_sequential(agents):
+    run("s6", concurrency=1)
+    assert agents.developer.max_in_flight == 1
+
+
+def test_resume_restarts_at_first_unfinished_file(agents):
+    agents.developer.fail_on = "components/Button.js"
+    checkpoint = run("s3")
+    assert checkpoint.stage == "develop"
+    assert checkpoint.file_status(PLAN.files_to_migrate[1]) == FILE_FAILED
+
+    agents.developer.fail_on = None
+    agents.developer.prompts.clear()
+    checkpoint = run("s3")
+    assert checkpoint.stage == "complete"
+    # Analysis and planning ran only once across both invocations
+    assert len(agents.analyzer.prompts) == 1
+    assert len(agents.architect.prompts) == 1
+    # Scaffolding and config are not repeated; only the failed file and validation run
+    assert "components/Button.js" in agents.developer.prompts[0]
+    assert len(agents.developer.prompts) == 2
+
+
+def test_codemod_converts_simple_components_without_the_developer(agents, tmp_path):
+    fixtures = Path(__file__).parent.parent / "fixtures" / "next_app"
+    output = tmp_path / "out"
+    checkpoint = asyncio.run(
+        pipeline.run_staged_migration(
+            str(fixtures), str(output), "s9", use_mcp=False, log=lambda text: None, codemod=True
+        )
+    )
+    assert checkpoint.stage == "complete"
+    # The route table moves the planned target into the Nuxt 4 app/ directory
+    assert (output / "app" / "components" / "Button.vue").exists()
+    assert not any("Button.js" in p or "index.js" in p for p in agents.developer.prompts)
+
+
+def test_typecheck_errors_are_fixed_per_file_in_parallel(agents, monkeypatch, tmp_path):
+    output = tmp_path / "out"
+    (output / "pages").mkdir(parents=True)
+    (output / "pages" / "index.vue").write_text("<script setup lang=\"ts\">\nconst n: number = 'a'\n</script>\n")
+    log = "\n".join(
+        [
+            "pages/index.vue(2,7): error TS2322: Type 'string' is not assignable to type 'number'.",
+            "components/Button.vue(5,3): error TS2304: Cannot find name 'foo'.",
+            ".nuxt/types.d.ts(1,1): error TS2300: Duplicate identifier 'x'.",
+            "Found 3 errors.",
+        ]
+    )
+    results = [
+        TypecheckResult(2, log, parse_diagnostics(log, str(output))),
+        TypecheckResult(0, "", []),
+    ]
+
+    async def typecheck(root):
+        return results.pop(0)
+
+    monkeypatch.setattr(pipeline, "run_typecheck", typecheck)
+    checkpoint = asyncio.run(
+        pipeline.run_staged_migration("/src", str(output), "s10", use_mcp=False, log=lambda text: None, codemod=False)
+    )
+    assert checkpoint.stage == "complete"
+    fixes = [p for p in agents.developer.prompts if "Fix the typecheck errors" in p]
+    assert len(fixes) == 2
+    index_fix = next(p for p in fixes if "pages/index.vue" in p)
+    assert "line 2:7 TS2322" in index_fix and "components/Button.vue" not in index_fix
+    assert "    2: const n: number = 'a'" in index_fix
+    assert agents.developer.max_in_flight == 2
+
+
+def test_imported_analysis_skips_analyzer(agents):
+    run("s4", analysis="precomputed report")
+    assert agents.analyzer.prompts == []
+    assert "precomputed report" in agents.architect.prompts[0]
+
+
+def test_parse_plan_rejects_invalid_content():
+    assert pipeline.parse_plan(PLAN.model_dump_json()) == PLAN
+    with pytest.raises(pipeline.PipelineError):
+        pipeline.parse_plan('{"project_name": "x"}')
@@ -0,0 +1,53 @@
+"""Unit tests for incremental MigrationPlan parsing."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.plan_stream import PlanStreamParser
+from app.schemas import FileMigration, MigrationPlan
+
+PLAN = MigrationPlan(
+    project_name="next_app",
+    summary='Keep "pages" {as-is}',
+    files_to_migrate=[
+        FileMigration(source_path="pages/index.js", target_path="pages/index.vue", action="convert", description="}{["),
+        FileMigration(source_path="lib/api.js", target_path="utils/api.ts", action="convert", description='say \\"hi\\"'),
+    ],
+    config_changes=["Add @nuxtjs/tailwindcss"],
+)
+
+
+def test_entries_are_emitted_as_each_object_closes():
+    text = PLAN.model_dump_json(indent=2)
+    parser = PlanStreamParser()
+    emitted = []
+    for i, char in enumerate(text):
+        for entry in parser.feed(char):
+            emitted.append((i, entry))
+
+    assert [entry for _, entry in emitted] == PLAN.files_to_migrate
+    # The first entry is available before the second one has started streaming
+    assert emitted[0][0] < text.index('"lib/api.js"')
+    assert parser.result() == PLAN
+
+
+def test_field_is_available_once_streamed():
+    text = PLAN.model_dump_json()
+    parser = PlanStreamParser()
+    parser.feed(text[: text.index('"summary"') + 12])
+    assert parser.field("summary") is None
+    parser.feed(text[text.index('"summary"') + 12 : text.index("files_to_migrate")])
+    assert parser.field("summary") == PLAN.summary
+
+
+def test_invalid_entries_are_skipped_and_fenced_result_is_accepted():
+    parser = PlanStreamParser()
+    assert parser.feed('```json\n{"files_to_migrate": [{"source_path": "x"}, ') == []
+    assert parser.feed(PLAN.files_to_migrate[0].model_dump_json()) == [PLAN.files_to_migrate[0]]
+    parser.feed("]}\n```")
+    with pytest.raises(ValidationError):
+        parser.result()
+
+    fenced = PlanStreamParser()
+    fenced.feed("```json\n" + PLAN.model_dump_json() + "\n```")
+    assert fenced.result() == PLAN
@@ -0,0 +1,47 @@
+"""Unit tests for Chrome-trace profiling."""
+
+import asyncio
+import json
+
+from agno.tools.function import Function, FunctionCall
+
+from app import profiling
+
+
+def test_spans_get_a_lane_per_task_and_nest(tmp_path):
+    trace = tmp_path / "trace.json"
+
+    async def work(name):
+        with profiling.span(name, "file"):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(work("a"), work("b"))
+
+    with profiling.profile(str(trace)):
+        asyncio.run(main())
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert spans["a"]["tid"] != spans["b"]["tid"]
+    assert spans["a"]["dur"] >= 10_000
+    assert spans["pixel-perfect"]["dur"] >= spans["a"]["dur"]
+    assert any(e["ph"] == "M" for e in events)
+
+
+def test_tool_calls_are_traced_and_patches_removed(tmp_path):
+    def run_shell_command(command: str) -> str:
+        """Fake shell tool."""
+        return "ok"
+
+    original = FunctionCall.execute
+    trace = tmp_path / "trace.json"
+    with profiling.profile(str(trace), cprofile=True):
+        FunctionCall(function=Function.from_callable(run_shell_command), arguments={"command": "ls"}).execute()
+
+    assert FunctionCall.execute is original
+    assert profiling.span("idle") is not None  # No-op outside a profile
+    events = json.loads(trace.read_text())["traceEvents"]
+    tool = next(e for e in events if e["name"] == "tool run_shell_command")
+    assert tool["cat"] == "tool.shell"
+    assert (tmp_path / "trace.json.prof").exists()
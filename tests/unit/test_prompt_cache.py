@@ -0,0 +1,58 @@
+"""Unit tests for provider prompt-cache hints and usage reporting."""
+
+import pytest
+from agno.models.anthropic import Claude
+from agno.models.openai import OpenAIResponses
+from openai.types.completion_usage import CompletionUsage
+
+from app import checkpoints, cli_config
+from app.checkpoints import SessionCheckpoint
+from app.config import get_model
+from app.prompt_cache import CachedDeepSeek, apply_cache_hints, format_usage
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    def use(name):
+        monkeypatch.setattr(cli_config, "_load_config", lambda: {"provider": name, "api_keys": {name: ["test"]}})
+
+    return use
+
+
+def test_cache_hints_per_provider():
+    claude = apply_cache_hints(Claude(id="claude-sonnet-4-5", api_key="test"), "anthropic", "developer")
+    assert claude.cache_system_prompt
+
+    openai = OpenAIResponses(id="gpt-4o", api_key="test", extra_body={"store": False})
+    apply_cache_hints(openai, "openai", "developer")
+    assert openai.extra_body == {"store": False, "prompt_cache_key": "pixel-perfect-developer"}
+
+
+def test_get_model_applies_hints(provider):
+    provider("openai")
+    assert get_model(cache_key="analyzer").extra_body == {"prompt_cache_key": "pixel-perfect-analyzer"}
+    assert get_model().extra_body is None
+
+    provider("deepseek")
+    assert isinstance(get_model(cache_key="analyzer"), CachedDeepSeek)
+
+
+def test_deepseek_cache_hits_are_reported():
+    usage = CompletionUsage(
+        prompt_tokens=1200, completion_tokens=50, total_tokens=1250, prompt_cache_hit_tokens=1024
+    )
+    metrics = CachedDeepSeek(api_key="test")._get_metrics(usage)
+    assert (metrics.input_tokens, metrics.cache_read_tokens) == (1200, 1024)
+
+
+def test_usage_accumulates_cache_tokens(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "SESSIONS_DIR", tmp_path)
+    checkpoint = SessionCheckpoint("cache")
+    # Manifests written before cache tracking lack the cache keys
+    checkpoint._save_manifest(usage={"input_tokens": 10, "output_tokens": 2, "seconds": 1.0})
+    checkpoint.add_usage(input_tokens=1000, output_tokens=10, cache_read_tokens=800)
+
+    usage = SessionCheckpoint("cache").usage
+    assert (usage["input_tokens"], usage["cache_read_tokens"], usage["cache_write_tokens"]) == (1010, 800, 0)
+    assert format_usage(1000, 10, 800) == "1,000 input / 10 output tokens, 800 input tokens from cache (80%)"
+    assert "cache" not in format_usage(0, 0)
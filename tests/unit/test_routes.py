@@ -0,0 +1,118 @@
+"""Unit tests for the Next.js → Nuxt route table."""
+
+from pathlib import Path
+
+from app.routes import build_route_table
+from app.schemas import FileMigration, MigrationPlan
+
+
+def make_tree(root: Path, paths: list[str]):
+    for path in paths:
+        file = root / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text("export default function X() {}\n")
+
+
+def targets(table) -> dict[str, str]:
+    return {e.source_path: e.target_path for e in table.entries}
+
+
+def test_pages_router_mapping(tmp_path):
+    make_tree(tmp_path, [
+        "pages/index.tsx",
+        "pages/blog.tsx",
+        "pages/blog/[slug].tsx",
+        "pages/docs/[[...path]].tsx",
+        "pages/_app.tsx",
+        "pages/_document.tsx",
+        "pages/404.tsx",
+        "pages/_error.tsx",
+        "pages/api/users/[id].ts",
+        "components/Nav.tsx",
+        "hooks/useCart.ts",
+        "styles/globals.css",
+        "public/logo.svg",
+        "next.config.js",
+    ])
+    table = build_route_table(str(tmp_path))
+    assert targets(table) == {
+        "components/Nav.tsx": "app/components/Nav.vue",
+        "hooks/useCart.ts": "app/composables/useCart.ts",
+        "pages/404.tsx": "app/error.vue",
+        "pages/_app.tsx": "app/app.vue",
+        "pages/api/users/[id].ts": "server/api/users/[id].ts",
+        "pages/blog.tsx": "app/pages/blog/index.vue",
+        "pages/blog/[slug].tsx": "app/pages/blog/[slug].vue",
+        "pages/docs/[[...path]].tsx": "app/pages/docs/[...path].vue",
+        "pages/index.tsx": "app/pages/index.vue",
+        "styles/globals.css": "app/assets/css/globals.css",
+    }
+    assert "Also fold in pages/_error.tsx" in table.get("pages/404.tsx").notes
+    assert "slug" in table.get("pages/blog/[slug].tsx").notes
+    changes = " ".join(table.config_changes)
+    assert "_document.tsx" in changes and "next.config.js" in changes and "public/" in changes
+    assert "~/assets/css/globals.css" in changes
+
+
+def test_app_router_mapping(tmp_path):
+    make_tree(tmp_path, [
+        "src/app/layout.tsx",
+        "src/app/page.tsx",
+        "src/app/(marketing)/about/page.tsx",
+        "src/app/dashboard/layout.tsx",
+        "src/app/dashboard/[team]/page.tsx",
+        "src/app/dashboard/_parts/Card.tsx",
+        "src/app/dashboard/loading.tsx",
+        "src/app/@modal/login/page.tsx",
+        "src/app/api/health/route.ts",
+        "src/app/not-found.tsx",
+        "src/middleware.ts",
+    ])
+    table = build_route_table(str(tmp_path))
+    assert targets(table) == {
+        "src/app/(marketing)/about/page.tsx": "app/pages/about/index.vue",
+        "src/app/api/health/route.ts": "server/api/health.ts",
+        "src/app/dashboard/[team]/page.tsx": "app/pages/dashboard/[team]/index.vue",
+        "src/app/dashboard/_parts/Card.tsx": "app/components/dashboard/_parts/Card.vue",
+        "src/app/dashboard/layout.tsx": "app/layouts/dashboard.vue",
+        "src/app/layout.tsx": "app/layouts/default.vue",
+        "src/app/not-found.tsx": "app/error.vue",
+        "src/app/page.tsx": "app/pages/index.vue",
+        "src/middleware.ts": "app/middleware/main.global.ts",
+    }
+    assert set(table.skipped) == {"src/app/@modal/login/page.tsx", "src/app/dashboard/loading.tsx"}
+
+
+def test_app_router_global_stylesheet_is_copied_and_registered(tmp_path):
+    make_tree(tmp_path, ["app/globals.css", "app/layout.tsx", "app/page.tsx", "app/blog/page.module.css"])
+    table = build_route_table(str(tmp_path))
+    assert targets(table)["app/globals.css"] == "app/assets/css/globals.css"
+    assert targets(table)["app/blog/page.module.css"] == "app/assets/css/blog/page.module.css"
+    assert "Register ~/assets/css/globals.css in the nuxt.config.ts css array." in table.config_changes
+    assert not any("page.module" in change for change in table.config_changes)
+
+
+def test_apply_enforces_the_table_on_a_plan(tmp_path):
+    make_tree(tmp_path, ["pages/index.js", "pages/about.js", "components/Button.js"])
+    table = build_route_table(str(tmp_path))
+    plan = MigrationPlan(
+        project_name="site",
+        summary="",
+        files_to_migrate=[
+            FileMigration(source_path="pages/index.js", target_path="pages/index.vue", action="convert", description="Home"),
+            FileMigration(source_path="src/pages/Home.jsx", target_path="pages/home.vue", action="convert", description=""),
+            FileMigration(source_path="", target_path="app/composables/useTheme.ts", action="create", description="Theme"),
+        ],
+        config_changes=["Add @nuxt/image"],
+    )
+    fixed = table.apply(plan)
+    assert [(f.source_path, f.target_path) for f in fixed.files_to_migrate] == [
+        ("pages/index.js", "app/pages/index.vue"),
+        ("", "app/composables/useTheme.ts"),
+        ("components/Button.js", "app/components/Button.vue"),
+        ("pages/about.js", "app/pages/about.vue"),
+    ]
+    # The Architect's notes are kept; entries it missed get the table's notes
+    assert fixed.files_to_migrate[0].description == "Home"
+    assert fixed.files_to_migrate[2].description
+    assert fixed.config_changes == ["Add @nuxt/image"]
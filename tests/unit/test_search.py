@@ -0,0 +1,113 @@
+"""Unit tests for the local code search index."""
+
+import shutil
+
+import pytest
+
+from app import search
+from app.search import CodeIndex, CodeSearchTools, extract_symbols, tokenize
+
+FIXTURE_APP = "tests/fixtures/next_app"
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """Keep index caches out of the user's config directory."""
+    cache_dir = tmp_path / "index"
+    monkeypatch.setattr(search, "INDEX_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """A writable copy of the Next.js fixture app."""
+    root = tmp_path / "next_app"
+    shutil.copytree(FIXTURE_APP, root)
+    return root
+
+
+def test_tokenize_splits_identifiers():
+    terms = tokenize("const useAuthSession = user_name")
+    assert "useauthsession" in terms
+    assert {"use", "auth", "session", "user", "name"} <= set(terms)
+
+
+def test_extract_symbols():
+    text = "export default function Button({ label }) {}\nexport const theme = {}\n"
+    assert extract_symbols(text) == [("Button", "function", 1), ("theme", "const", 2)]
+
+
+def test_search_ranks_matching_file_first(index_dir, source_tree):
+    index = CodeIndex(str(source_tree))
+    assert index.refresh() == 2
+
+    hits = index.search("button label")
+    assert hits[0].path == "components/Button.js"
+    assert "label" in hits[0].snippet
+
+
+def test_find_symbol(index_dir, source_tree):
+    index = CodeIndex(str(source_tree))
+    index.refresh()
+    assert index.find_symbol("button") == [("components/Button.js", "function", 1)]
+
+
+def test_refresh_is_incremental_and_persistent(index_dir, source_tree):
+    index = CodeIndex(str(source_tree))
+    index.refresh()
+    assert index.cache_path.exists()
+
+    (source_tree / "components" / "Card.js").write_text("export function Card() {}\n")
+    reloaded = CodeIndex(str(source_tree))
+    assert reloaded.refresh() == 1
+    assert reloaded.find_symbol("Card")
+
+    (source_tree / "components" / "Card.js").unlink()
+    assert reloaded.refresh() == 0
+    assert not reloaded.find_symbol("Card")
+
+
+def test_search_code_tool(index_dir, source_tree):
+    tools = CodeSearchTools(base_dir=str(source_tree))
+    result = tools.search_code("Welcome")
+    assert result.startswith("pages/index.js:")
+    assert "No matches" in tools.search_code("nonexistentterm")
+    assert "Error" in tools.search_code("x", path=str(source_tree / "missing"))
+
+
+def test_lookups_revalidate_only_after_writes_or_interval(index_dir, source_tree, monkeypatch):
+    from app.tool_cache import ToolCallCache
+
+    tools = CodeSearchTools(base_dir=str(source_tree))
+    scans = []
+    original = CodeIndex._iter_files
+    monkeypatch.setattr(CodeIndex, "_iter_files", lambda self: scans.append(1) or original(self))
+
+    tools.find_symbol("Button")
+    tools.find_symbol("Button")
+    assert len(scans) == 1
+
+    # A write seen by the tool cache marks the index for re-validation
+    (source_tree / "components" / "Card.js").write_text("export function Card() {}\n")
+    ToolCallCache().invalidate([str((source_tree / "components" / "Card.js").resolve())])
+    assert "Card" in tools.find_symbol("Card")
+    assert len(scans) == 2
+
+    monkeypatch.setattr(search, "REFRESH_INTERVAL", 0.0)
+    tools.find_symbol("Card")
+    assert len(scans) == 3
+
+
+def test_toolkits_share_one_index_and_saves_do_not_collide(index_dir, source_tree):
+    from concurrent.futures import ThreadPoolExecutor
+
+    first, second = CodeSearchTools(base_dir=str(source_tree)), CodeSearchTools(base_dir=str(source_tree))
+    assert first._get_index(None) is second._get_index(None)
+
+    # Separate processes used to interleave writes to one `<digest>.tmp`
+    indexes = [CodeIndex(str(source_tree)) for _ in range(8)]
+    for index in indexes:
+        index.refresh()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda index: index._save(), indexes))
+    assert [p.suffix for p in index_dir.iterdir()] == [".json"]
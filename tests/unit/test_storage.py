@@ -0,0 +1,105 @@
+"""Unit tests for the compressed blob store behind the session database."""
+
+import sqlite3
+import time
+
+import pytest
+from agno.db.base import SessionType
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.session import AgentSession
+
+from app.storage import BLOB_PREFIX, BLOB_TABLE, BlobSqliteDb, vacuum
+
+FILE_CONTENT = "<template>\n  <div class=\"card\">{{ title }}</div>\n</template>\n" * 100
+
+
+def make_session(session_id: str, runs: int = 2) -> AgentSession:
+    return AgentSession(
+        session_id=session_id,
+        agent_id="developer",
+        runs=[
+            RunOutput(
+                run_id=f"{session_id}-{n}",
+                agent_id="developer",
+                session_id=session_id,
+                content="done",
+                messages=[Message(role="tool", content=FILE_CONTENT), Message(role="assistant", content="ok")],
+            )
+            for n in range(runs)
+        ],
+        created_at=int(time.time()),
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return BlobSqliteDb(db_file=str(tmp_path / "storage.db"))
+
+
+def raw_runs(db, session_id):
+    with sqlite3.connect(db.db_file) as conn:
+        return conn.execute(f"SELECT runs FROM {db.session_table_name} WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+
+def test_payloads_are_deduplicated_and_restored(db):
+    db.upsert_session(make_session("a"))
+    db.upsert_session(make_session("b"))
+
+    # The repeated file content is stored once and only referenced from the runs
+    with sqlite3.connect(db.db_file) as conn:
+        (blobs,) = conn.execute(f"SELECT COUNT(*) FROM {BLOB_TABLE}").fetchone()
+    assert blobs == 1
+    assert BLOB_PREFIX in raw_runs(db, "a") and "class=" not in raw_runs(db, "a")
+
+    loaded = db.get_session("a", SessionType.AGENT)
+    assert [m.content for m in loaded.runs[1].messages] == [FILE_CONTENT, "ok"]
+    raws, total = db.get_sessions(SessionType.AGENT, deserialize=False)
+    assert total == 2 and raws[0]["runs"][0]["messages"][0]["content"] == FILE_CONTENT
+
+
+def test_vacuum_applies_retention_and_drops_orphans(db):
+    db.upsert_session(make_session("old"))
+    with sqlite3.connect(db.db_file) as conn:
+        conn.execute(f"UPDATE {db.session_table_name} SET updated_at = 0 WHERE session_id = 'old'")
+        conn.execute(f"UPDATE {BLOB_TABLE} SET created_at = 0")
+
+    stats = vacuum(db, older_than_days=30)
+    assert stats["sessions_deleted"] == 1
+    assert stats["blobs_deleted"] == 1
+    assert db.get_session("old", SessionType.AGENT) is None
+
+
+def test_vacuum_externalizes_sessions_stored_inline(db):
+    from agno.db.sqlite import SqliteDb
+
+    SqliteDb(db_file=db.db_file).upsert_session(make_session("legacy"))
+    assert "class=" in raw_runs(db, "legacy")
+
+    stats = vacuum(db)
+    assert stats["sessions_compacted"] == 1
+    assert "class=" not in raw_runs(db, "legacy")
+    assert db.get_session("legacy", SessionType.AGENT).runs[0].messages[0].content == FILE_CONTENT
+
+
+def test_vacuum_in_another_process_keeps_blobs_a_writer_reuses(db):
+    db.upsert_session(make_session("a"))
+    with sqlite3.connect(db.db_file) as conn:
+        conn.execute(f"UPDATE {db.session_table_name} SET updated_at = 0 WHERE session_id = 'a'")
+        conn.execute(f"UPDATE {BLOB_TABLE} SET created_at = 0")
+
+    # A second store (e.g. `session-vacuum` while `serve` runs) deletes the session and its blob
+    assert vacuum(BlobSqliteDb(db_file=db.db_file), older_than_days=1)["blobs_deleted"] == 1
+
+    # The long-lived instance stores the same content again and must rewrite the blob
+    db.upsert_session(make_session("b"))
+    assert db.get_session("b", SessionType.AGENT).runs[0].messages[0].content == FILE_CONTENT
+
+
+def test_vacuum_keeps_recent_orphans(db):
+    db.upsert_session(make_session("a"))
+    with sqlite3.connect(db.db_file) as conn:
+        conn.execute(f"DELETE FROM {db.session_table_name}")
+
+    # The blob may belong to a session another process has not stored yet
+    assert vacuum(db)["blobs_deleted"] == 0
@@ -0,0 +1,168 @@
+"""Unit tests for session-scoped tool call memoization."""
+
+from types import SimpleNamespace
+
+from app.tool_cache import ToolCallCache, is_read_only_command
+
+
+class CountingTool:
+    """Fake tool entrypoint that records how often it really ran."""
+
+    def __init__(self, result="content"):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return self.result
+
+
+def run(cache, name, tool, arguments, run_id="run-1"):
+    return cache.hook(name, tool, arguments, run_context=SimpleNamespace(run_id=run_id))
+
+
+def test_read_only_command_whitelist():
+    assert is_read_only_command("cat package.json")
+    assert is_read_only_command("ls -la src | grep tsx")
+    assert not is_read_only_command("cat a > b")
+    assert not is_read_only_command("npx nuxi typecheck")
+    assert not is_read_only_command("find . -name '*.tmp' -delete")
+    assert not is_read_only_command("ls && rm -rf out")
+    assert not is_read_only_command("sort -o out.txt in.txt")
+    assert not is_read_only_command("sort -uo out.txt in.txt")
+    assert not is_read_only_command("sort --output=x a")
+    assert not is_read_only_command("sort --out=x a")
+    assert not is_read_only_command("tree -o x.txt")
+    assert not is_read_only_command("find . -fprint x")
+    assert not is_read_only_command("find . -fls x")
+    assert not is_read_only_command("uniq in.txt out.txt")
+    assert is_read_only_command("sort -u -n names.txt | uniq -c")
+    assert is_read_only_command("find . -name '*.tsx' -print")
+
+
+def test_repeat_in_same_run_returns_marker(tmp_path):
+    cache = ToolCallCache()
+    tool = CountingTool("{}")
+    args = {"command": f"cat {tmp_path}"}
+
+    assert run(cache, "run_shell_command", tool, args) == "{}"
+    assert "unchanged since earlier" in run(cache, "run_shell_command", tool, args)
+    assert tool.calls == 1
+
+
+def test_new_run_gets_full_cached_content(tmp_path):
+    cache = ToolCallCache()
+    tool = CountingTool("{}")
+    args = {"command": f"cat {tmp_path}"}
+
+    run(cache, "run_shell_command", tool, args, run_id="a")
+    assert run(cache, "run_shell_command", tool, args, run_id="b") == "{}"
+    assert tool.calls == 1
+
+
+def test_write_invalidates_overlapping_paths(tmp_path):
+    cache = ToolCallCache()
+    reader = CountingTool()
+    other = CountingTool()
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "lib").mkdir()
+
+    run(cache, "run_shell_command", reader, {"command": f"ls {tmp_path / 'pages'}"})
+    run(cache, "run_shell_command", other, {"command": f"ls {tmp_path / 'lib'}"})
+    run(cache, "write_file", CountingTool("ok"), {"content": "x", "filename": "index.vue", "directory": str(tmp_path / "pages")})
+
+    run(cache, "run_shell_command", reader, {"command": f"ls {tmp_path / 'pages'}"})
+    run(cache, "run_shell_command", other, {"command": f"ls {tmp_path / 'lib'}"})
+    assert reader.calls == 2
+    assert other.calls == 1
+
+
+def test_mutating_shell_command_clears_cache(tmp_path):
+    cache = ToolCallCache()
+    reader = CountingTool()
+    args = {"args": ["ls", str(tmp_path)]}
+
+    run(cache, "run_shell_command", reader, args)
+    run(cache, "run_shell_command", CountingTool(""), {"args": ["npm", "install"]})
+    run(cache, "run_shell_command", reader, args)
+    assert reader.calls == 2
+
+
+def test_errors_are_not_cached(tmp_path):
+    cache = ToolCallCache()
+    tool = CountingTool("Error running command: boom")
+    args = {"command": f"cat {tmp_path}"}
+
+    run(cache, "run_shell_command", tool, args)
+    run(cache, "run_shell_command", tool, args)
+    assert tool.calls == 2
+
+
+def test_hook_through_agno_function_call(tmp_path):
+    from agno.tools.function import Function, FunctionCall
+
+    calls = []
+
+    def run_shell_command(command: str) -> str:
+        """Fake shell tool."""
+        calls.append(command)
+        return "listing"
+
+    cache = ToolCallCache()
+    function = Function.from_callable(run_shell_command)
+    function.tool_hooks = [cache.hook]
+    for _ in range(2):
+        result = FunctionCall(function=function, arguments={"command": f"ls {tmp_path}"}).execute()
+        assert result.status == "success"
+    assert len(calls) == 1
+
+
+def test_async_hook_runs_sync_tools_off_the_event_loop(tmp_path):
+    import asyncio
+    import threading
+
+    cache = ToolCallCache()
+    threads = []
+
+    async def next_func(**kwargs):
+        threads.append(threading.current_thread())
+        return "listing"
+
+    async def main():
+        ctx = SimpleNamespace(run_id="r")
+        first = await cache.ahook("run_shell_command", next_func, {"command": f"ls {tmp_path}"}, run_context=ctx)
+        second = await cache.ahook("run_shell_command", next_func, {"command": f"ls {tmp_path}"}, run_context=ctx)
+        other = await cache.ahook("mcp_search", next_func, {"q": "x"}, run_context=ctx)
+        return first, second, other
+
+    first, second, other = asyncio.run(main())
+    assert first == "listing" and other == "listing"
+    assert "unchanged since earlier" in second
+    assert threads[0] is not threading.main_thread()
+    assert threads[1] is threading.main_thread()
+
+
+def test_reads_are_keyed_by_toolkit_directory(tmp_path):
+    import inspect
+
+    from agno.tools.function import Function, FunctionCall
+
+    from app.file_reader import FileReadTools
+
+    cache = ToolCallCache()
+    results = {}
+    for name in ("next_app", "nuxt_app"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "package.json").write_text(f'{{"name": "{name}"}}\n')
+        function = Function.from_callable(FileReadTools(base_dir=str(tmp_path / name)).read_file)
+        function.tool_hooks = [cache.for_directory(str(tmp_path / name))]
+        results[name] = FunctionCall(function=function, arguments={"file_path": "package.json"})
+
+    # The Developer's relative read must not be served the source project's file
+    assert "next_app" in results["next_app"].execute().result
+    assert "nuxt_app" in results["nuxt_app"].execute().result
+
+    # Writes to the output project invalidate only its own entries
+    cache.invalidate([str(tmp_path / "nuxt_app" / "package.json")])
+    assert cache.stats()["entries"] == 1
+    assert inspect.iscoroutinefunction(cache.for_directory(str(tmp_path), asynchronous=True))